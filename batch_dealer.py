@@ -0,0 +1,240 @@
+from typing import NamedTuple
+
+import numpy as np
+
+import bot_functions
+import batch_evaluator
+import simulation
+
+################################# Batch Dealer #################################
+#Deck, deal_hands and modify_hand handle one round at a time with Python ints.
+#  The batch dealer shuffles many decks at once into a small integer array and
+#  deals from it the same way a table does: one card to each hand in turn,
+#  then the draws from the cards that follow. The arrays feed batch_evaluator
+#  directly, so no Python object is built for any card
+
+#Deals made in one batch, about 50 MB of arrays for the bot_test matchup
+BATCH_DEALS = 1 << 18
+
+def shuffled_decks(count:int, rng:np.random.Generator, cards:int = 52) -> np.ndarray:
+    '''
+    Shuffle count decks at once
+
+    Parameters:
+        count: number of decks
+
+        rng: numpy random generator to shuffle with
+
+        cards: how many cards from the top of each deck are needed. Only those
+            are shuffled into place, one vector step per card, which beats
+            shuffling all 52 when a round needs a few cards
+
+    Returns:
+        decks: (count, cards) array of card integers, the top cards of each deck
+
+    Examples/Doctests:
+    >>> decks = shuffled_decks(1000, np.random.default_rng(1))
+    >>> decks.shape, bool((np.sort(decks, axis=1) == np.arange(52)).all())
+    ((1000, 52), True)
+    >>> tops = shuffled_decks(1000, np.random.default_rng(1), cards=15)
+    >>> tops.shape, bool((np.sort(tops, axis=1)[:, 1:] != np.sort(tops, axis=1)[:, :-1]).all())
+    ((1000, 15), True)
+    '''
+    decks = np.tile(np.arange(52, dtype=np.int8), (count, 1))
+
+    if cards == 52:
+        return rng.permuted(decks, axis=1)
+
+    #Fisher-Yates stopped after the cards needed: position i swaps with a random position from i to 51
+    rows = np.arange(count)
+    for position in range(cards):
+        picks                 = rng.integers(position, 52, count)
+        swapped               = decks[rows, position].copy()
+        decks[rows, position] = decks[rows, picks]
+        decks[rows, picks]    = swapped
+
+    return decks[:, :cards]
+
+class BatchDeal(NamedTuple):
+    '''
+    Many deals at once
+
+    hands: (K, N, 5) array of the cards dealt to each of N hands in K deals
+    draws: (K, M) array of the undealt cards of each deal, next card first
+    '''
+    hands: np.ndarray
+    draws: np.ndarray
+
+def deal_batch(count:int, rng:np.random.Generator, number_of_hands:int = 2, draw_cards:int = None) -> BatchDeal:
+    '''
+    Deal count rounds at once, one card to each hand in turn like
+        poker_functions.deal_hands
+
+    Parameters:
+        count: number of deals
+
+        rng: numpy random generator to shuffle with
+
+        number_of_hands: number of seats at the table, 2-10
+
+        draw_cards: undealt cards to keep for the draws, every undealt card
+            when not given. That lets every seat draw five up to 5 seats, a
+            bigger table runs short once its draws need more than 52 - 5 * seats
+            cards and draw_cards raises ValueError
+
+    Returns:
+        deal: BatchDeal
+
+    Examples/Doctests:
+    >>> deal = deal_batch(4, np.random.default_rng(2), number_of_hands=3)
+    >>> deal.hands.shape, deal.draws.shape
+    ((4, 3, 5), (4, 37))
+    >>> deal_batch(4, np.random.default_rng(2), number_of_hands=10, draw_cards=5)
+    Traceback (most recent call last):
+    ...
+    ValueError: 10 hands and 5 draw cards need 55 cards, a deck holds 52
+    '''
+    dealt      = 5 * number_of_hands
+    draw_cards = 52 - dealt if draw_cards is None else draw_cards
+    if dealt + draw_cards > 52:
+        raise ValueError('{} hands and {} draw cards need {} cards, a deck holds 52'.format(number_of_hands, draw_cards, dealt + draw_cards))
+
+    decks      = shuffled_decks(count, rng, dealt + draw_cards)
+
+    hands = decks[:, :dealt].reshape(count, 5, number_of_hands).transpose(0, 2, 1)
+
+    return BatchDeal(np.ascontiguousarray(hands), decks[:, dealt:])
+
+def hand_masks(cards:np.ndarray) -> np.ndarray:
+    '''
+    Turn arrays of five cards into hand integers
+
+    Parameters:
+        cards: (..., 5) array of card integers
+
+    Returns:
+        hands: (...) array of uint64 hand integers
+
+    Examples/Doctests:
+    >>> hand_masks(np.array([[0, 1, 2, 3, 51]])).tolist()
+    [2251799813685263]
+    '''
+    return np.bitwise_or.reduce(np.left_shift(np.uint64(1), cards.astype(np.uint64)), axis=-1)
+
+def keep_masks(cards:np.ndarray, keep_function = None) -> np.ndarray:
+    '''
+    Ask a discard strategy which cards to keep from every hand
+
+    Parameters:
+        cards: (K, 5) array of card integers
+
+        keep_function: bot strategy, bot_functions.calculate_keep when not given.
+            The strategy works on one hand integer at a time, so this is the
+            one step of a batch that runs a Python call per hand
+
+    Returns:
+        keep_bits: (K,) array, bit i set when column i of the hand is kept
+
+    Examples/Doctests:
+    >>> #Pair of kings kept, everything else thrown
+    >>> keep_masks(np.array([[1, 4, 25, 38, 44]])).tolist()
+    [12]
+    '''
+    keep_function = bot_functions.calculate_keep if keep_function is None else keep_function
+
+    keep_bits = np.zeros(len(cards), dtype=np.uint8)
+    for row, hand in enumerate(hand_masks(cards).tolist()):
+        kept = 0
+        for card in keep_function(hand):
+            kept |= 1 << card
+        keep_bits[row] = sum(1 << column for column, card in enumerate(cards[row].tolist()) if kept >> card & 1)
+
+    return keep_bits
+
+def draw_cards(cards:np.ndarray, keep_bits:np.ndarray, draws:np.ndarray, offsets:np.ndarray = None) -> tuple:
+    '''
+    Replace the cards not kept with the next undealt cards, the batch
+        version of poker_game.modify_hand
+
+    Parameters:
+        cards: (K, 5) array of card integers
+
+        keep_bits: (K,) array, bit i set when column i is kept
+
+        draws: (K, M) array of undealt cards, next card first
+
+        offsets: (K,) array of draws already taken by earlier seats, none when not given
+
+    Returns:
+        final_cards: (K, 5) array of card integers, kept cards first
+
+        offsets: (K,) array of draws taken once this hand has drawn
+
+    Raises:
+        ValueError: a deal has fewer undealt cards left than the hand draws
+
+    Examples/Doctests:
+    >>> final, offsets = draw_cards(np.array([[1, 4, 25, 38, 44]]), np.array([12]), np.array([[7, 8, 9, 10, 11]]))
+    >>> final.tolist(), offsets.tolist()
+    ([[25, 38, 7, 8, 9]], [3])
+    >>> draw_cards(np.array([[1, 4, 25, 38, 44]]), np.array([12]), np.array([[7, 8, 9, 10, 11]]), offsets)
+    Traceback (most recent call last):
+    ...
+    ValueError: 1 deals run out of undealt cards to draw from
+    '''
+    offsets = np.zeros(len(cards), dtype=np.int64) if offsets is None else offsets
+
+    columns = np.arange(5)
+    kept    = (keep_bits[:, None].astype(np.int64) >> columns & 1).astype(bool)
+    counts  = kept.sum(axis=1)
+
+    short = int((offsets + 5 - counts > draws.shape[1]).sum())
+    if short:
+        raise ValueError('{} deals run out of undealt cards to draw from'.format(short))
+
+    #Kept cards first in their dealt order, then the draws in deck order
+    ordered = np.take_along_axis(cards, np.argsort(~kept, axis=1, kind='stable'), axis=1)
+    picks   = np.clip(offsets[:, None] + columns - counts[:, None], 0, draws.shape[1] - 1)  #Clipped only where a kept card is used
+    drawn   = np.take_along_axis(draws, picks, axis=1)
+
+    return np.where(columns < counts[:, None], ordered, drawn), offsets + 5 - counts
+
+def run_batch_simulation(rounds:int, seed:int, keep_function = None, batch_deals:int = BATCH_DEALS) -> dict:
+    '''
+    Play bot_test rounds a batch at a time: hand one keeps every card, hand
+        two draws with keep_function and every showdown is settled in one
+        vector pass. The decks come from numpy's generator, so the rounds are
+        not the ones simulation.run_simulation plays for the same seed
+
+    Parameters:
+        rounds: total number of rounds
+
+        seed: seed of the whole simulation, the same seed always gives the same tally
+
+        keep_function: bot strategy used by hand two, bot_functions.calculate_keep when not given
+
+        batch_deals: most deals in one batch
+
+    Returns:
+        tally: dictionary of outcome_indicator -> number of rounds
+
+    Examples/Doctests:
+    >>> tally = run_batch_simulation(4000, seed=1, batch_deals=1500)
+    >>> sum(tally.values()), 0.6 < tally['TWO'] / 4000 < 0.7
+    (4000, True)
+    >>> run_batch_simulation(4000, seed=1, batch_deals=1500) == tally
+    True
+    '''
+    rng   = np.random.default_rng(seed)
+    tally = simulation.new_tally()
+
+    for deals in simulation.split_rounds(rounds, batch_deals):
+        deal  = deal_batch(deals, rng, draw_cards=5)
+        final = draw_cards(deal.hands[:, 1], keep_masks(deal.hands[:, 1], keep_function), deal.draws)[0]
+
+        winners = np.bincount(batch_evaluator.batch_showdown(deal.hands[:, 0], final), minlength=3)
+        tally['ONE']   += int(winners[batch_evaluator.ONE])
+        tally['TWO']   += int(winners[batch_evaluator.TWO])
+        tally['SPLIT'] += int(winners[batch_evaluator.SPLIT])
+
+    return tally
@@ -0,0 +1,214 @@
+import numpy as np
+
+import poker_functions
+
+#Outcome codes used by batch_showdown
+SPLIT = 0
+ONE   = 1
+TWO   = 2
+
+############################### Batch Conversion ###############################
+def batch_cards(hands:list) -> np.ndarray:
+    '''
+    Turn a list of hand integers into an (N, 5) array of card integers
+
+    Parameters:
+        hands: list of integers holding one bit for each card in the hand
+
+    Returns:
+        cards: (N, 5) array of card integers, each row from the lowest to the highest card
+
+    Examples/Doctests:
+    >>> batch_cards([0b11111, 1 | 1 << 13 | 1 << 26 | 1 << 39 | 1 << 1]).tolist()
+    [[0, 1, 2, 3, 4], [0, 1, 13, 26, 39]]
+    '''
+    bits  = np.array(hands, dtype=np.uint64)[:, None] >> np.arange(52, dtype=np.uint64)
+    held  = (bits & np.uint64(1)).astype(bool)
+
+    return np.nonzero(held)[1].reshape(len(hands), 5)
+
+################################ Batch Ranking #################################
+def batch_hand_ranks(cards:np.ndarray) -> np.ndarray:
+    '''
+    Create an (N, 13) array that holds how many of each rank is in each hand,
+        the array version of poker_functions.hand_ranks
+
+    Parameters:
+        cards: (N, 5) array of card integers
+
+    Returns:
+        rank_lists: (N, 13) array
+
+    Examples/Doctests:
+    >>> batch_hand_ranks(np.array([[0, 13, 26, 39, 1]])).tolist()
+    [[4, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]]
+    '''
+    #Give every rank its own row of one counter per hand and count all cards in
+    #  one pass, the (N, 13) result is a view over those rows so reductions
+    #  along a hand run over contiguous memory
+    hand_count    = len(cards)
+    counter_index = (cards % 13 * hand_count + np.arange(hand_count)[:, None]).ravel()
+    rank_rows     = np.bincount(counter_index, minlength=13 * hand_count).astype(np.int8)
+
+    return rank_rows.reshape(13, hand_count).T
+
+def batch_flush(cards:np.ndarray) -> np.ndarray:
+    '''
+    Find which hands have all cards of the same suit
+
+    Parameters:
+        cards: (N, 5) array of card integers
+
+    Returns:
+        is_flush: (N,) array of bool
+
+    Examples/Doctests:
+    >>> batch_flush(np.array([[0, 1, 2, 3, 4], [0, 1, 2, 3, 17]])).tolist()
+    [True, False]
+    '''
+    suits = cards // 13
+
+    return (suits == suits[:, :1]).all(axis=1)
+
+def batch_straight(cards:np.ndarray, rank_lists:np.ndarray = None) -> np.ndarray:
+    '''
+    Find which hands hold 5 ranks incrementing by 1
+
+    Parameters:
+        cards: (N, 5) array of card integers
+
+        rank_lists: (N, 13) array from batch_hand_ranks when already known
+
+    Returns:
+        is_straight: (N,) array of bool
+
+    Examples/Doctests:
+    >>> batch_straight(np.array([[0, 14, 2, 16, 4], [0, 1, 2, 11, 12], [0, 13, 2, 3, 4]])).tolist()
+    [True, False, False]
+    '''
+    rank_lists = batch_hand_ranks(cards) if rank_lists is None else rank_lists
+    ranks      = cards % 13
+
+    #5 different ranks are a straight when they span exactly 5 ranks
+    return (rank_lists.max(axis=1) == 1) & (ranks.max(axis=1) - ranks.min(axis=1) == 4)
+
+################################ Batch Scoring #################################
+def batch_score_hands(cards:np.ndarray, rank_lists:np.ndarray = None) -> np.ndarray:
+    '''
+    Score every hand, the array version of poker_functions.score_hand
+
+    Parameters:
+        cards: (N, 5) array of card integers
+
+        rank_lists: (N, 13) array from batch_hand_ranks when already known
+
+    Returns:
+        scores: (N,) array of scores 0-8
+
+    Examples/Doctests:
+    >>> batch_score_hands(np.array([[0, 1, 2, 3, 4], [0, 13, 26, 39, 1], [0, 13, 26, 1, 14],
+    ...                             [0, 2, 4, 6, 8], [0, 14, 2, 3, 4], [0, 13, 26, 1, 4],
+    ...                             [0, 13, 1, 14, 10], [0, 13, 1, 3, 12], [0, 14, 3, 5, 12]])).tolist()
+    [8, 7, 6, 5, 4, 3, 2, 1, 0]
+    '''
+    rank_lists = batch_hand_ranks(cards) if rank_lists is None else rank_lists
+
+    pair_count      = (rank_lists == 2).sum(axis=1)
+    is_three        = (rank_lists == 3).any(axis=1)
+    is_four         = (rank_lists == 4).any(axis=1)
+    is_straight     = batch_straight(cards, rank_lists)
+    is_flush        = batch_flush(cards)
+
+    #Same order as score_hand, each later check overrides the earlier ones
+    scores = np.zeros(len(cards), dtype=np.int64)
+    scores[pair_count >= 1]            = 1
+    scores[pair_count >= 2]            = 2
+    scores[is_three]                   = 3
+    scores[is_straight]                = 4
+    scores[is_flush]                   = 5
+    scores[is_three & (pair_count > 0)] = 6
+    scores[is_four]                    = 7
+    scores[is_straight & is_flush]     = 8
+
+    return scores
+
+def batch_evaluate(cards:np.ndarray) -> tuple:
+    '''
+    Score every hand and find its strength, the array version of
+        poker_functions.score_hand and poker_functions.hand_strength
+
+    Parameters:
+        cards: (N, 5) array of card integers
+
+    Returns:
+        scores: (N,) array of scores 0-8
+
+        strengths: (N,) array of strengths
+
+    Examples/Doctests:
+    >>> scores, strengths = batch_evaluate(np.array([[12, 4, 25, 14, 44], [12, 3, 25, 14, 44]]))
+    >>> scores.tolist(), [hex(strength) for strength in strengths.tolist()]
+    ([1, 1], ['0x1dd652', '0x1dd642'])
+    '''
+    cards      = np.asfortranarray(cards, dtype=np.int64)
+    rank_lists = batch_hand_ranks(cards)
+    scores     = batch_score_hands(cards, rank_lists)
+
+    #Order every card by how many times its rank is held, then by its rank,
+    #  which is the tiebreak order used by poker_functions.tiebreak_ranks
+    ranks       = (cards % 13 + 1).astype(np.int32)
+    rank_counts = np.take_along_axis(rank_lists, ranks - 1, axis=1)
+    order_keys  = np.sort(rank_counts * 16 + ranks, axis=1)[:, ::-1]
+
+    tiebreak_shifts = np.array([16, 12, 8, 4, 0], dtype=np.int32)
+    tiebreaks       = ((order_keys & 0xF) << tiebreak_shifts).sum(axis=1, dtype=np.int64)
+
+    return scores, scores << poker_functions.strength_shift | tiebreaks
+
+def batch_showdown(cards_one:np.ndarray, cards_two:np.ndarray) -> np.ndarray:
+    '''
+    Decide the winner of every pair of hands
+
+    Parameters:
+        cards_one: (N, 5) array of card integers for hand one
+
+        cards_two: (N, 5) array of card integers for hand two
+
+    Returns:
+        winners: (N,) array of ONE, TWO or SPLIT
+
+    Examples/Doctests:
+    >>> batch_showdown(np.array([[12, 4, 25, 14, 44], [0, 1, 2, 3, 4]]),
+    ...                np.array([[12, 3, 25, 14, 44], [13, 14, 15, 16, 17]])).tolist()
+    [1, 0]
+    '''
+    strengths_one = batch_evaluate(cards_one)[1]
+    strengths_two = batch_evaluate(cards_two)[1]
+
+    winners = np.full(len(cards_one), SPLIT, dtype=np.int8)
+    winners[strengths_one > strengths_two] = ONE
+    winners[strengths_one < strengths_two] = TWO
+
+    return winners
+
+def batch_table_showdown(table_cards:np.ndarray) -> np.ndarray:
+    '''
+    Decide the winning seats of many tables at once, each table settled by
+        one maximum over its seats instead of comparing every pair of seats
+
+    Parameters:
+        table_cards: (T, N, 5) array of card integers, N seats at each of T tables
+
+    Returns:
+        winners: (T, N) array of bool, True for every seat sharing the pot
+
+    Examples/Doctests:
+    >>> batch_table_showdown(np.array([[[12, 4, 25, 14, 44], [0, 1, 2, 3, 4], [13, 14, 15, 16, 17]],
+    ...                                [[12, 4, 25, 14, 44], [11, 3, 24, 13, 43], [5, 7, 22, 36, 50]]])).tolist()
+    [[False, True, True], [True, False, False]]
+    '''
+    table_count, seat_count = table_cards.shape[:2]
+
+    strengths = batch_evaluate(table_cards.reshape(table_count * seat_count, 5))[1].reshape(table_count, seat_count)
+
+    return strengths == strengths.max(axis=1, keepdims=True)
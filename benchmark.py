@@ -0,0 +1,232 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import sys
+import time
+
+import poker_functions
+import hand_organization
+import hand_isomorphism
+import bot_functions
+import simulation
+
+#Hands in every hand pool, shortest timed pass and the regression threshold used by --compare
+POOL_SIZE         = 2000
+MIN_PASS_SECONDS  = 0.05
+DEFAULT_THRESHOLD = 0.10
+
+################################## Hand Pools ##################################
+def random_pool(rng:random.Random, size:int = POOL_SIZE) -> list:
+    '''
+    Deal a pool of hands the way a game does, so the hand categories show up
+        as often as they do in play
+
+    Parameters:
+        rng: Random used to seed the deck
+
+        size: number of hands in the pool
+
+    Returns:
+        hands: list of hand integers
+    '''
+    deck  = poker_functions.Deck(rng.random())
+    hands = list()
+    while len(hands) < size:
+        deck.reset()
+        deck.shuffle()
+        hands.extend(poker_functions.deal_hands(10, deck))
+
+    return hands[:size]
+
+def category_pools(rng:random.Random, size:int = POOL_SIZE) -> list:
+    '''
+    Build one pool of hands for every score, taking random isomorphism classes
+        of that score and dealing each one out in random suits
+
+    Parameters:
+        rng: Random used to pick the hands
+
+        size: number of hands in each pool
+
+    Returns:
+        pools: list of 9 hand lists indexed by score
+    '''
+    classes = [list() for score in range(9)]
+    for canonical_hand in hand_isomorphism.canonical_hands(5):
+        classes[poker_functions.score_hand(canonical_hand)].append(canonical_hand)
+
+    pools = list()
+    for score_classes in classes:
+        pool = list()
+        for count in range(size):
+            real_suits = list(poker_functions.suits.keys())
+            rng.shuffle(real_suits)
+
+            hand = 0
+            for card in hand_organization.create_card_list(rng.choice(score_classes)):
+                hand |= 1 << (real_suits[poker_functions.card_suit(card)] * 13 + poker_functions.card_rank(card) - 1)
+            pool.append(hand)
+        pools.append(pool)
+
+    return pools
+
+################################ Measurements ##################################
+def time_calls(function, arguments:list, repeat:int) -> float:
+    '''
+    Time one call of function for each argument tuple, keeping the fastest
+        of repeat passes. Short pools are looped until a pass takes at least
+        MIN_PASS_SECONDS so timer noise stays small
+
+    Parameters:
+        function: function to time
+
+        arguments: list of argument tuples
+
+        repeat: number of passes over arguments
+
+    Returns:
+        seconds: fastest time of one call, in seconds
+    '''
+    def timed_pass(loops:int) -> float:
+        start = time.perf_counter()
+        for loop in range(loops):
+            for argument in arguments:
+                function(*argument)
+        return time.perf_counter() - start
+
+    loops = 1
+    while timed_pass(loops) < MIN_PASS_SECONDS:
+        loops *= 2
+
+    best = min(timed_pass(loops) for count in range(repeat))
+
+    return best / (loops * len(arguments))
+
+def silent(function):
+    '''
+    Wrap a function that prints so its output is thrown away
+    '''
+    def silent_function(*arguments):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return function(*arguments)
+
+    return silent_function
+
+def run_benchmarks(repeat:int = 5, rounds:int = 2000, seed:int = 0) -> dict:
+    '''
+    Run every benchmark
+
+    Parameters:
+        repeat: passes over each pool, the fastest pass is kept
+
+        rounds: bot_test rounds timed end to end
+
+        seed: seed of the hand pools and the bot_test rounds
+
+    Returns:
+        results: dictionary of benchmark name -> seconds for one call
+    '''
+    rng     = random.Random(seed)
+    hands   = random_pool(rng)
+    pools   = category_pools(rng)
+    results = dict()
+
+    deck = poker_functions.Deck(seed)
+    results['shuffle']    = time_calls(deck.shuffle, [()] * POOL_SIZE, repeat)
+    results['deal_hands'] = time_calls(lambda: (deck.reset(), poker_functions.deal_hands(2, deck)), [()] * POOL_SIZE, repeat)
+
+    single_hand = [(hand,) for hand in hands]
+    hand_pairs  = list(zip(single_hand[::2], single_hand[1::2]))
+    results['hand_ranks']     = time_calls(poker_functions.hand_ranks, single_hand, repeat)
+    results['score_hand']     = time_calls(poker_functions.score_hand, single_hand, repeat)
+    results['organize_hand']  = time_calls(hand_organization.organize_hand, single_hand, repeat)
+    results['calculate_keep'] = time_calls(bot_functions.calculate_keep, single_hand, repeat)
+    results['compare_hands']  = time_calls(silent(poker_functions.compare_hands),
+                                           [hand_one + hand_two for hand_one, hand_two in hand_pairs], repeat)
+
+    #Every hand category on its own, rare categories get the same weight as common ones
+    for score, pool in enumerate(pools):
+        name = poker_functions.get_hand_type(score) if score else 'High Card'
+        category_hands = [(hand,) for hand in pool]
+        results['score_hand[{}]'.format(name)]     = time_calls(poker_functions.score_hand, category_hands, repeat)
+        results['organize_hand[{}]'.format(name)]  = time_calls(hand_organization.organize_hand, category_hands, repeat)
+        results['calculate_keep[{}]'.format(name)] = time_calls(bot_functions.calculate_keep, category_hands, repeat)
+
+    #The bot_test loop end to end, in one process so the pool start up is not timed
+    results['bot_test_round'] = time_calls(simulation.run_simulation, [(rounds, seed, 1)], repeat) / rounds
+
+    return results
+
+############################## Baseline Compare ################################
+def compare_results(baseline:dict, results:dict, threshold:float = DEFAULT_THRESHOLD) -> list:
+    '''
+    Find the benchmarks that got slower than the baseline by more than threshold
+
+    Parameters:
+        baseline: dictionary of benchmark name -> seconds, from an earlier run
+
+        results: dictionary of benchmark name -> seconds, from this run
+
+        threshold: allowed slowdown, 0.10 lets a benchmark take 10% longer
+
+    Returns:
+        regressions: list of (name, baseline seconds, seconds, ratio) for every regression
+
+    Examples/Doctests:
+    >>> compare_results({'score_hand': 1.0, 'deal_hands': 2.0}, {'score_hand': 1.05, 'deal_hands': 2.5, 'new': 1.0})
+    [('deal_hands', 2.0, 2.5, 1.25)]
+    '''
+    regressions = list()
+    for name, seconds in results.items():
+        if name not in baseline:
+            continue
+
+        ratio = seconds / baseline[name]
+        if ratio > 1 + threshold:
+            regressions.append((name, baseline[name], seconds, ratio))
+
+    return regressions
+
+def print_results(results:dict, baseline:dict = None) -> None:
+    '''
+    Display every benchmark in microseconds, next to the baseline when given
+    '''
+    for name, seconds in results.items():
+        line = '{:<32}{:>12.3f} us'.format(name, seconds * 1e6)
+        if baseline is not None and name in baseline:
+            line += '{:>12.3f} us{:>8.2f}x'.format(baseline[name] * 1e6, seconds / baseline[name])
+        print(line)
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Time the poker engine and check it against a stored baseline')
+    parser.add_argument('--output',    type=str,   default=None,              help='write the results to this JSON file')
+    parser.add_argument('--compare',   type=str,   default=None,              help='JSON baseline to check the results against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='allowed slowdown before a benchmark fails')
+    parser.add_argument('--repeat',    type=int,   default=5,                 help='passes over each hand pool')
+    parser.add_argument('--rounds',    type=int,   default=2000,              help='bot_test rounds timed end to end')
+    parser.add_argument('--seed',      type=int,   default=0,                 help='seed of the hand pools and rounds')
+    arguments = parser.parse_args()
+
+    results = run_benchmarks(arguments.repeat, arguments.rounds, arguments.seed)
+
+    baseline = None
+    if arguments.compare is not None:
+        with open(arguments.compare) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+
+    print_results(results, baseline)
+    print('Rounds per second: {:.0f}'.format(1 / results['bot_test_round']))
+
+    if arguments.output is not None:
+        with open(arguments.output, 'w') as output_file:
+            json.dump({'python': platform.python_version(), 'seed': arguments.seed, 'results': results}, output_file, indent=2)
+
+    if baseline is not None:
+        regressions = compare_results(baseline, results, arguments.threshold)
+        for name, baseline_seconds, seconds, ratio in regressions:
+            print('REGRESSION: {} is {:.2f}x the baseline'.format(name, ratio))
+        sys.exit(1 if regressions else 0)
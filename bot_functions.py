@@ -1,72 +1,96 @@
 import poker_functions
 import hand_organization
+import discard_table
 
 ############################### Bot Discard Strategy ###############################
-def get_junk_index(hand:dict) -> int:
+def get_junk_index(hand:int) -> int:
     '''
     Get the index of the first card after any points have been determined for hand
 
     Parameters:
-        hand: a dictionary of cards sorted by suit
+        hand: integer holding one bit for each card in the hand
 
     Returns:
         index: integer value of where the first card not associated with points lies
     '''
     score = poker_functions.score_hand(hand)
 
-    #score(int) : index(int)                     Round 1
-    junk_index = {#                               01234
-#############################################################
-        0  :  1,  #Highest Card    : Junk Index:  K0000
-        1  :  2,  #One Pair        : Junk Index:  KK000
-        2  :  4,  #Two Pair        : Junk Index:  KKQQ0
-        3  :  3,  #Three of a Kind : Junk Index:  KKK00
-        4  :  5,  #Straight        : Junk Index:  5
-        5  :  5,  #Flush           : Junk Index:  5
-        6  :  5,  #Full House      : Junk Index:  5
-        7  :  4,  #Four of a Kind  : Junk Index:  QQQQK
-        8  :  5   #Straight Flush  : Junk Index:  5
-    }
+    return hand_organization.junk_index_table[score]
 
-    return junk_index[score]
-
-def calculate_keep(bot_hand:dict) -> list:
+def calculate_keep(bot_hand:int, analysis:hand_organization.HandAnalysis = None) -> list:
     '''
     Create a string of integers describing what cards to replace
 
     Parameters:
-        bot_hand: a dictionary of cards sorted by suit
+        bot_hand: integer holding one bit for each card in the hand
+
+        analysis: HandAnalysis of bot_hand, worked out here when not given
 
     Returns:
         keep_list: the string of card numbers 1-5 with a max len of 4.
-    '''
 
-    
-    card_list  = hand_organization.organize_hand(bot_hand)
-    junk_index = get_junk_index(bot_hand)
+    Examples/Doctests:
+    >>> hand_organization.cards_to_tuples(calculate_keep(hand_organization.hand_from_dict({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(6,3)]})))
+    [(13, 1), (13, 2)]
+    >>> hand_organization.cards_to_tuples(calculate_keep(hand_organization.hand_from_dict({0:[(2,0), (5,0), (9,0), (11,0)], 1:[(13,1)], 2:[], 3:[]})))
+    [(2, 0), (5, 0), (9, 0), (11, 0)]
+    '''
+    #Score, organize and count the hand once for every check below
+    analysis   = hand_organization.HandAnalysis(bot_hand) if analysis is None else analysis
+    card_list  = analysis.card_list
+    junk_index = analysis.junk_index
 
     
     if junk_index == 5: #Bot hand is a: Straight, Flush, Full House, xor Straight Flush
-        return card_list            #Don't replace any cards
+        return card_list[:]         #Don't replace any cards
     
     #if the current score of the hands is 0 check for potential flush and straight
-    if poker_functions.score_hand(bot_hand) == 0:
+    if analysis.score == 0:
         #Check for flush first (worth more points)
-        suited_replacement_list = check_n_suited(bot_hand, 4)
+        suited_replacement_list = check_n_suited(bot_hand, 4, analysis)
         if suited_replacement_list != card_list:
             return suited_replacement_list
         
         #Check straight nexts
-        sequence_replacement_list = check_4_sequenced(bot_hand)
+        sequence_replacement_list = check_4_sequenced(bot_hand, analysis)
         if sequence_replacement_list != card_list:
             return sequence_replacement_list
 
     #If you have a 4 of a kind with a 12 or 13 kicker don't get rid of the kicker
-    keep_list = card_list[:] if poker_functions.score_hand(bot_hand) == 7 and card_list[junk_index][0] >= 12 else card_list[:junk_index]
+    keep_list = card_list[:] if analysis.score == 7 and poker_functions.card_rank(card_list[junk_index]) >= 12 else card_list[:junk_index]
     
     return keep_list
 
-def check_4_sequenced(bot_hand:dict) -> list:
+def keep_all(bot_hand:int) -> list:
+    '''
+    Stand pat: keep every card, the static hand of bot_test
+
+    Parameters:
+        bot_hand: integer holding one bit for each card in the hand
+
+    Returns:
+        keep_list: list of every card integer in the hand
+    '''
+    return hand_organization.create_card_list(bot_hand)
+
+def calculate_optimal_keep(bot_hand:int) -> list:
+    '''
+    Look up the cards to keep with the best expected result against a random
+        hand, see discard_table. The table is built the first time it is used
+
+    Parameters:
+        bot_hand: integer holding one bit for each card in the hand
+
+    Returns:
+        keep_list: list of card integers to keep
+
+    Examples/Doctests:
+    >>> hand_organization.cards_to_tuples(calculate_optimal_keep(hand_organization.hand_from_dict({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(6,3)]})))
+    [(13, 1), (13, 2)]
+    '''
+    return discard_table.best_keep(bot_hand)
+
+def check_4_sequenced(bot_hand:int, analysis:hand_organization.HandAnalysis = None) -> list:
     '''
     Given a hand check if there is a possible sequence given hand already has n cards within a sequence
 
@@ -78,14 +102,26 @@ def check_4_sequenced(bot_hand:dict) -> list:
     [X]     [6 7 8 9] |    2
 
     Parameters:
-        bot_hand: a dictionary of cards sorted by suit
+        bot_hand: integer holding one bit for each card in the hand
+
+        analysis: HandAnalysis of bot_hand, worked out here when not given
 
     Return:
         sequence_keep_list: list of cards that make up 4 sequence
 
         organized_card_list: default list to be returned if there is not possiblle sequence
+
+    Examples/Doctests:
+    >>> #2 3 + 6 + Q K: the Q K end is dropped down to one card, the king goes, see construct_card_list
+    >>> hand = hand_organization.hand_from_dict({0:[], 1:[(2,1), (13,1), (12,1)], 2:[(6,2), (3,2)], 3:[]})
+    >>> hand_organization.cards_to_tuples(check_4_sequenced(hand))
+    [(2, 1), (12, 1), (3, 2), (6, 2)]
+    >>> hand = hand_organization.hand_from_dict({0:[(12,0), (2,0)], 1:[(3,1)], 2:[(6,2)], 3:[(13,3)]})
+    >>> hand_organization.cards_to_tuples(check_4_sequenced(hand))
+    [(2, 0), (12, 0), (3, 1), (6, 2)]
     '''
-    rank_list = poker_functions.hand_ranks(bot_hand)
+    analysis  = hand_organization.HandAnalysis(bot_hand) if analysis is None else analysis
+    rank_list = analysis.rank_list
 
     #Create initial data structure
     list_of_lists = [[]]
@@ -102,7 +138,7 @@ def check_4_sequenced(bot_hand:dict) -> list:
     for count in range(list_of_lists.count(list())):
         list_of_lists.remove(list())
 
-    card_list = hand_organization.organize_hand(bot_hand)
+    card_list = analysis.card_list
     
     #If there are more than 3 sublists exit function
     if len(list_of_lists) > 3:
@@ -129,52 +165,105 @@ def check_4_sequenced(bot_hand:dict) -> list:
     return construct_card_list(bot_hand, sequence_list)
 
 
-def construct_card_list(bot_hand:dict, sequence_list) -> list:
+def construct_card_list(bot_hand:int, sequence_list) -> list:
     '''
     Up to this point is is fair to assume the bot_hand has no
         points associated with it. Search through the card list
         and remove any card who's rank is not in the sequence list
 
+    Only one card is removed. When two cards are off the sequence, which
+        happens when both ends of a three part sequence hold two cards, the
+        higher rank goes whatever the suits
+
     Parameters:
-        bot_hand: a dictionary of cards sorted by suit
+        bot_hand: integer holding one bit for each card in the hand
 
         sequence_list: a list of card ranks in the hand that make a sequence of 4 cards
 
     Returns:
-        card_list: list of tuples whose ranks are in the sequence_list
+        card_list: list of card integers whose ranks are in the sequence_list
     '''
     card_list = hand_organization.create_card_list(bot_hand)
-    for card in card_list:
-        if card[0] not in sequence_list:
-            card_list.remove(card)
-            return card_list
+    off_cards = [card for card in card_list if poker_functions.card_rank(card) not in sequence_list]
+    if off_cards:
+        card_list.remove(max(off_cards, key=poker_functions.card_rank))
+        return card_list
 
     
 
-def check_n_suited(bot_hand:dict, n_suited:int) -> list:
+def check_n_suited(bot_hand:int, n_suited:int, analysis:hand_organization.HandAnalysis = None) -> list:
     '''
     Given a hand check if there is a possible sequence given hand already has n cards within a sequence
 
     Parameters:
-        bot_hand: a dictionary of cards sorted by suit
+        bot_hand: integer holding one bit for each card in the hand
+
+        analysis: HandAnalysis of bot_hand, worked out here when not given
 
     Return:
         suited_keep_list: the string of card numbers 1->n with a max len of (5-n).
 
         organized_card_list: default list to be returned if there is not possiblle flush
     '''
-    for suit_list in bot_hand.values():
-        if len(suit_list) >= n_suited:
-            return suit_list
+    analysis = hand_organization.HandAnalysis(bot_hand) if analysis is None else analysis
 
-    return hand_organization.organize_hand(bot_hand)
+    for suit in poker_functions.suits.keys():
+        if analysis.suit_counts >> (4 * suit) & 0xF >= n_suited:
+            return hand_organization.create_card_list(bot_hand & (poker_functions.suit_mask << (13 * suit)))
 
-    
+    return analysis.card_list
 
+############################### Strategy Registry ##################################
+#A discard strategy takes a hand integer and returns the list of card integers to
+#  keep. Strategies are module level functions so worker processes can find them
+#name -> discard strategy
+strategies = {
+    'keep_all':  keep_all,
+    'strategic': calculate_keep,
+    'optimal':   calculate_optimal_keep,
+}
+
+def register_strategy(name:str, keep_function) -> None:
+    '''
+    Add a discard strategy so tournaments and bot_test can pick it by name
+
+    Parameters:
+        name: name of the strategy
+
+        keep_function: module level function, hand integer in, list of card integers to keep out
+
+    Raises:
+        ValueError: name is already taken
+
+    Examples/Doctests:
+    >>> register_strategy('strategic', calculate_keep)
+    Traceback (most recent call last):
+    ...
+    ValueError: strategy strategic is already registered
+    '''
+    if name in strategies:
+        raise ValueError('strategy {} is already registered'.format(name))
+
+    strategies[name] = keep_function
+
+def get_strategy(name:str):
+    '''
+    Look up a discard strategy by name
+
+    Raises:
+        KeyError: no strategy has that name
+
+    Examples/Doctests:
+    >>> get_strategy('keep_all') is keep_all
+    True
+    '''
+    if name not in strategies:
+        raise KeyError('unknown strategy {}, pick from {}'.format(name, ', '.join(strategies)))
+
+    return strategies[name]
 
-    
 ####################################################################################
 
 
 if __name__ == "__main__":
-    calculate_keep({0:[(1,0), (2,0)], 1:[(3,1)], 2:[(5,2)], 3:[(11,3)]})
+    calculate_keep(hand_organization.hand_from_dict({0:[(1,0), (2,0)], 1:[(3,1)], 2:[(5,2)], 3:[(11,3)]}))
@@ -1,30 +1,82 @@
+import argparse
+import random
 
-import poker_game
-import poker_functions
+import simulation
+import bot_functions
+import discard_table
+import instrumentation
 
 if __name__ == "__main__":
 
     TEST_ROUNDS = 1000000
 
-    hand_one_wins = 0
-    hand_two_wins = 0
-    split_pot     = 0
+    parser = argparse.ArgumentParser(description='Play the static hand against the strategic bot discard')
+    parser.add_argument('--rounds',      type=int,   default=TEST_ROUNDS, help='number of rounds to play (the most rounds when stopping early)')
+    parser.add_argument('--seed',        type=int,   default=None,        help='seed for a reproducible run')
+    parser.add_argument('--workers',     type=int,   default=None,        help='worker processes (default: one per core)')
+    parser.add_argument('--strategy',    type=str,   default='strategic', choices=list(bot_functions.strategies), help='discard strategy of hand two')
+    parser.add_argument('--optimal',     action='store_true',             help='same as --strategy optimal')
+    parser.add_argument('--profile',     action='store_true',             help='time every stage of a round (plays in one process)')
+    parser.add_argument('--tolerance',   type=float, default=None,        help='stop once the 95%% interval of the win rate difference is within +/- this')
+    parser.add_argument('--time-budget', type=float, default=None,        help='stop after this many seconds')
+    parser.add_argument('--sampling',    type=str,   default=None,        choices=simulation.SAMPLING_MODES, help='estimate the win rate gap with a variance reduction mode')
+    parser.add_argument('--batch',       action='store_true',             help='deal and settle rounds as numpy arrays a batch at a time (plays in one process)')
+    parser.add_argument('--history',     type=str,   default=None,        help='record every round to this hand history file (plays in one process)')
+    arguments = parser.parse_args()
 
-    for rounds in range(TEST_ROUNDS):
-        hands        = poker_game.start_new_game()
+    #Stage timers live in this process, so a profiled run plays every round here
+    workers = 1 if arguments.profile else arguments.workers
+    if arguments.profile:
+        instrumentation.enable()
 
-        static_hand  = hands[0]
-        bot_hand     = hands[1]
+    strategy_name = 'optimal' if arguments.optimal else arguments.strategy
+    if strategy_name == 'optimal':
+        #Build the table once here so forked workers share it instead of each building their own
+        discard_table.get_discard_table()
+    keep_function = bot_functions.get_strategy(strategy_name)
 
-        bot_hand     = poker_game.modify_bot_hand(bot_hand)
+    seed     = random.randrange(2 ** 32) if arguments.seed is None else arguments.seed
+    adaptive = arguments.history is None and not arguments.batch and arguments.sampling is None and (arguments.tolerance is not None or arguments.time_budget is not None)
 
-        winner       = poker_functions.compare_hands(static_hand, bot_hand)
+    #The history, batch and sampling modules need numpy, so they are only imported for their flag
+    if arguments.history is not None:
+        import hand_history
+        tally     = hand_history.record_simulation(arguments.history, arguments.rounds, seed, keep_function)
+    elif arguments.batch:
+        import batch_dealer
+        tally     = batch_dealer.run_batch_simulation(arguments.rounds, seed, keep_function)
+    elif arguments.sampling is not None:
+        import variance_reduction
+        sampled   = variance_reduction.run_sampled_simulation(arguments.rounds, seed, arguments.sampling, workers,
+                                                              keep_function=keep_function)
+        tally     = sampled.tally
+    elif adaptive:
+        tolerance = 0.0 if arguments.tolerance is None else arguments.tolerance
+        estimate  = simulation.run_adaptive_simulation(seed, tolerance, arguments.rounds, arguments.time_budget,
+                                                       workers, keep_function=keep_function)
+        tally     = estimate.tally
+    else:
+        tally     = simulation.run_simulation(arguments.rounds, seed, workers, keep_function=keep_function)
 
-        hand_one_wins += 1 if winner == 'ONE'   else 0
-        hand_two_wins += 1 if winner == 'TWO'   else 0
-        split_pot     += 1 if winner == 'SPLIT' else 0
+    print('Seed:              {}'.format(seed))
+    print('No Discard:        {}'.format(tally['ONE']))
+    print('{:<19}{}'.format(strategy_name.replace('_', ' ').title() + ' Discard:', tally['TWO']))
+    print('Split Pot:         {}'.format(tally['SPLIT']))
 
-    print('No Discard:        {}'.format(hand_one_wins))
-    print('Strategic Discard: {}'.format(hand_two_wins))
-    print('Split Pot:         {}'.format(split_pot))
+    if adaptive:
+        intervals = simulation.outcome_intervals(tally)
+        print()
+        print('Rounds Played:     {} (stopped by {})'.format(sum(tally.values()), estimate.stop_reason))
+        for outcome, label in [('ONE', 'No Discard'), ('TWO', 'Bot Discard'), ('SPLIT', 'Split Pot')]:
+            print('{:<19}{:.4f} +/- {:.4f}'.format(label + ' Rate:', *intervals[outcome]))
+        print('{:<19}{:+.4f} +/- {:.4f}'.format('Win Rate Gap:', estimate.difference, estimate.half_width))
 
+    if arguments.history is None and not arguments.batch and arguments.sampling is not None:
+        print()
+        print('Sampling Mode:     {}'.format(sampled.mode))
+        print('{:<19}{:+.4f} +/- {:.4f}'.format('Win Rate Gap:', sampled.difference, sampled.half_width))
+        print('Effective Rounds:  {:.0f} ({:.2f}x the rounds played)'.format(sampled.effective_rounds, sampled.effective_rounds / sum(tally.values())))
+
+    if arguments.profile:
+        print()
+        instrumentation.print_report()
@@ -0,0 +1,165 @@
+import poker_functions
+import hand_organization
+import hand_isomorphism
+import table_cache
+
+from math import comb
+
+################################ Payoff Totals #################################
+def strength_payoffs() -> dict:
+    '''
+    Payoff of finishing with each strength against a random five card hand:
+        twice the number of hands it beats plus the number it splits with,
+        so payoffs stay whole numbers
+
+    Returns:
+        payoffs: dictionary of strength -> payoff
+
+    Examples/Doctests:
+    >>> payoffs = strength_payoffs()
+    >>> payoffs[min(payoffs)], payoffs[max(payoffs)]
+    (1020, 5197916)
+    '''
+    counts  = poker_functions.strength_counts()
+    payoffs = dict()
+
+    hands_below = 0
+    for strength in sorted(counts):
+        payoffs[strength] = 2 * hands_below + counts[strength]
+        hands_below      += counts[strength]
+
+    return payoffs
+
+def build_payoff_totals(payoffs:dict) -> dict:
+    '''
+    For every canonical set of 0-4 cards add up the payoff of every five card
+        hand holding that set
+
+    Parameters:
+        payoffs: dictionary from strength_payoffs
+
+    Returns:
+        payoff_totals: dictionary of canonical card set -> payoff total
+    '''
+    payoff_totals = dict()
+
+    #Four card sets are finished by each of the 48 other cards
+    for card_set in hand_isomorphism.canonical_hands(4):
+        total = 0
+        for card in range(52):
+            if not card_set >> card & 1:
+                total += payoffs[poker_functions.hand_strength(card_set | 1 << card)]
+        payoff_totals[card_set] = total
+
+    #Smaller sets add up the sets one card larger, every hand holding the
+    #  smaller set is reached once for each of its 5 - card_count other cards
+    for card_count in range(3, -1, -1):
+        for card_set in hand_isomorphism.canonical_hands(card_count):
+            total = 0
+            for card in range(52):
+                if not card_set >> card & 1:
+                    total += payoff_totals[hand_isomorphism.canonical_hand(card_set | 1 << card)]
+            payoff_totals[card_set] = total // (5 - card_count)
+
+    return payoff_totals
+
+############################### Keep Evaluation ################################
+def keep_values(hand:int, payoff_totals:dict, payoffs:dict) -> list:
+    '''
+    Work out the exact expected payoff of all 32 ways to keep cards from a
+        hand, drawing the rest from the 47 cards not in the hand
+
+    Parameters:
+        hand: integer holding one bit for each card in the hand
+
+        payoff_totals: dictionary from build_payoff_totals
+
+        payoffs: dictionary from strength_payoffs
+
+    Returns:
+        keep_values: list of 32 floats, keep_values[keep] is the expected payoff when
+            keeping the cards of hand_organization.create_card_list(hand) whose
+            bit is set in keep
+    '''
+    card_list = hand_organization.create_card_list(hand)
+
+    #values[keep] starts as the payoff total of every hand holding the kept cards
+    values = list()
+    for keep in range(32):
+        kept_cards = 0
+        for index in range(5):
+            if keep >> index & 1:
+                kept_cards |= 1 << card_list[index]
+
+        if keep == 31:
+            values.append(payoffs[poker_functions.hand_strength(hand)])
+        else:
+            values.append(payoff_totals[hand_isomorphism.canonical_hand(kept_cards)])
+
+    #Take away every hand that holds a discarded card (inclusion-exclusion),
+    #  leaving only the draws from the 47 unseen cards
+    for index in range(5):
+        bit = 1 << index
+        for keep in range(32):
+            if not keep & bit:
+                values[keep] -= values[keep | bit]
+
+    return [value / comb(47, 5 - keep.bit_count()) for keep, value in enumerate(values)]
+
+def build_discard_table() -> list:
+    '''
+    Find the best cards to keep for every five card isomorphism class
+
+    Returns:
+        discard_table: list indexed by hand_isomorphism.class_id, the cards to
+            keep from the canonical hand of each class
+    '''
+    payoffs       = strength_payoffs()
+    payoff_totals = build_payoff_totals(payoffs)
+    discard_table = list()
+
+    for canonical_hand in hand_isomorphism.canonical_hands(5):
+        values    = keep_values(canonical_hand, payoff_totals, payoffs)
+        best_keep = max(range(31, -1, -1), key=values.__getitem__)
+
+        card_list  = hand_organization.create_card_list(canonical_hand)
+        kept_cards = 0
+        for index in range(5):
+            if best_keep >> index & 1:
+                kept_cards |= 1 << card_list[index]
+
+        discard_table.append(kept_cards)
+
+    return discard_table
+
+discard_table = None
+
+def get_discard_table() -> list:
+    '''
+    Return the discard table. The first call opens it from the table cache,
+        building it (about half a minute) when the cache does not hold it yet
+
+    Returns:
+        discard_table: memoryview indexed by hand_isomorphism.class_id
+    '''
+    global discard_table
+
+    if discard_table is None:
+        sources       = [__file__, poker_functions.__file__, hand_organization.__file__, hand_isomorphism.__file__]
+        discard_table = table_cache.cached_table('discard_table', 'Q', build_discard_table, sources=sources)
+
+    return discard_table
+
+def best_keep(hand:int) -> list:
+    '''
+    Look up the cards to keep that give the best expected payoff
+
+    Parameters:
+        hand: integer holding one bit for each card in the hand
+
+    Returns:
+        keep_list: list of card integers to keep
+    '''
+    kept_cards = get_discard_table()[hand_isomorphism.class_id(hand)]
+
+    return hand_isomorphism.real_cards(hand_organization.create_card_list(kept_cards), hand)
@@ -0,0 +1,185 @@
+import itertools
+
+from fractions import Fraction
+from math import comb
+
+import numpy as np
+
+import poker_functions
+import hand_organization
+import hand_isomorphism
+import table_cache
+
+############################## Draw Distributions ##############################
+#For every canonical set of 0-4 kept cards the table holds how many of the
+#  five card hands holding that set finish in each score category. Drawing to
+#  a keep is picking one of those hands at random, so a row is the exact
+#  chance of every category after the draw. Cards known to be out of the deck
+#  (the discards) are taken away by inclusion-exclusion, the same way
+#  discard_table.keep_values does for payoffs
+
+def build_draw_table() -> list:
+    '''
+    Count the final score category of every five card hand holding each
+        canonical set of 0-4 cards
+
+    Returns:
+        draw_table: list indexed by card count of (sets, 9) arrays, row
+            hand_isomorphism.class_id(card_set) holds the hands finishing in each score
+    '''
+    draw_table = [None] * 5
+
+    #Four card sets are finished by each of the 48 other cards
+    four_card_sets = hand_isomorphism.canonical_hands(4)
+    counts         = np.zeros((len(four_card_sets), 9), dtype=np.int64)
+    for row, card_set in enumerate(four_card_sets):
+        for card in range(52):
+            if not card_set >> card & 1:
+                counts[row, poker_functions.score_hand(card_set | 1 << card)] += 1
+    draw_table[4] = counts
+
+    #Smaller sets add up the sets one card larger, every hand holding the
+    #  smaller set is reached once for each of its 5 - card_count other cards
+    for card_count in range(3, -1, -1):
+        card_sets  = hand_isomorphism.canonical_hands(card_count)
+        larger_ids = hand_isomorphism.get_class_ids(card_count + 1)
+        counts     = np.zeros((len(card_sets), 9), dtype=np.int64)
+        for row, card_set in enumerate(card_sets):
+            for card in range(52):
+                if not card_set >> card & 1:
+                    counts[row] += draw_table[card_count + 1][larger_ids[hand_isomorphism.canonical_hand(card_set | 1 << card)]]
+        draw_table[card_count] = counts // (5 - card_count)
+
+    return draw_table
+
+draw_table = None
+
+def get_draw_table() -> list:
+    '''
+    Return the draw table. The first call opens it from the table cache,
+        building it (a few seconds) when the cache does not hold it yet
+
+    Returns:
+        draw_table: list from build_draw_table, the arrays are views of the cache file
+    '''
+    global draw_table
+
+    if draw_table is None:
+        #Cached as the rows of every card count one after another
+        def build_values() -> list:
+            return np.concatenate(build_draw_table()).ravel().tolist()
+
+        sources    = [__file__, poker_functions.__file__, hand_isomorphism.__file__]
+        draw_table = split_draw_table(table_cache.cached_table('draw_table', 'q', build_values, sources=sources))
+
+    return draw_table
+
+def split_draw_table(values) -> list:
+    '''
+    Turn the flat values of a cached or shared draw table back into one array
+        per card count, as views of values
+
+    Parameters:
+        values: buffer of int64 counts, the rows of every card count one after another
+
+    Returns:
+        draw_table: list from build_draw_table
+    '''
+    rows       = np.frombuffer(values, dtype=np.int64).reshape(-1, 9)
+    set_counts = [len(hand_isomorphism.get_class_ids(card_count)) for card_count in range(5)]
+    ends       = list(itertools.accumulate(set_counts))
+
+    return [rows[end - count:end] for count, end in zip(set_counts, ends)]
+
+################################## Query API ###################################
+def category_counts(card_set:int) -> np.ndarray:
+    '''
+    Number of five card hands holding card_set that finish in each score category
+
+    Parameters:
+        card_set: integer holding one bit for each card, 0-5 cards
+
+    Returns:
+        counts: (9,) array indexed by score
+    '''
+    card_count = card_set.bit_count()
+    if card_count == 5:
+        counts = np.zeros(9, dtype=np.int64)
+        counts[poker_functions.score_hand(card_set)] = 1
+        return counts
+
+    return get_draw_table()[card_count][hand_isomorphism.class_id(card_set)]
+
+def draw_distribution(keep_list:list, dead_cards:list = ()) -> list:
+    '''
+    Work out the exact chance of finishing in each score category after
+        keeping keep_list and drawing back up to five cards, as modify_hand
+        does, from the cards that are neither kept nor dead
+
+    Parameters:
+        keep_list: list of card integers kept, 0-5 cards
+
+        dead_cards: list of card integers out of the deck, usually the discards
+
+    Returns:
+        probabilities: list of 9 Fractions indexed by score
+
+    Examples/Doctests:
+    >>> #Four hearts kept and the fifth card thrown: 9 of the 47 unseen cards make the flush
+    >>> hand = hand_organization.hand_from_dict({0:[(2,0), (5,0), (9,0), (11,0)], 1:[(13,1)], 2:[], 3:[]})
+    >>> hearts = hand_organization.create_card_list(hand & poker_functions.suit_mask)
+    >>> thrown = hand_organization.create_card_list(hand & ~poker_functions.suit_mask)
+    >>> draw_distribution(hearts, thrown)[5]
+    Fraction(9, 47)
+    >>> #Nothing kept, drawing five from a full deck
+    >>> draw_distribution([])[1] == Fraction(1098240, comb(52, 5))
+    True
+    '''
+    kept = hand_organization.create_hand(list(keep_list))
+    dead = [card for card in dead_cards if not kept >> card & 1]
+
+    #Every hand holding the kept cards, less each hand holding a dead card
+    counts = np.zeros(9, dtype=np.int64)
+    for dead_count in range(min(len(dead), 5 - kept.bit_count()) + 1):
+        sign = -1 if dead_count % 2 else 1
+        for dead_set in itertools.combinations(dead, dead_count):
+            counts += sign * category_counts(kept | hand_organization.create_hand(list(dead_set)))
+
+    draws = comb(52 - kept.bit_count() - len(dead), 5 - kept.bit_count())
+
+    return [Fraction(int(count), draws) for count in counts]
+
+def category_chance(keep_list:list, hand_type:str, dead_cards:list = ()) -> Fraction:
+    '''
+    Chance of finishing with a hand_type or better after drawing to keep_list
+
+    Parameters:
+        keep_list: list of card integers kept, 0-5 cards
+
+        hand_type: name of a category, see poker_functions.get_hand_type
+
+        dead_cards: list of card integers out of the deck, usually the discards
+
+    Returns:
+        chance: Fraction
+
+    Raises:
+        ValueError: hand_type is not the name of a category
+
+    Examples/Doctests:
+    >>> #Pair of kings kept, three cards thrown
+    >>> hand = hand_organization.hand_from_dict({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(6,3)]})
+    >>> kings  = [card for card in hand_organization.create_card_list(hand) if poker_functions.card_rank(card) == 13]
+    >>> thrown = [card for card in hand_organization.create_card_list(hand) if poker_functions.card_rank(card) != 13]
+    >>> round(float(category_chance(kings, 'Two Pair', thrown)), 4)
+    0.2871
+    >>> category_chance(kings, 'Two Pairs', thrown)
+    Traceback (most recent call last):
+    ...
+    ValueError: unknown hand type 'Two Pairs'
+    '''
+    score = 0 if hand_type == 'Highest Card' else next((score for score in range(1, 9) if poker_functions.get_hand_type(score) == hand_type), None)
+    if score is None:
+        raise ValueError('unknown hand type {!r}'.format(hand_type))
+
+    return sum(draw_distribution(keep_list, dead_cards)[score:], Fraction(0))
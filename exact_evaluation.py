@@ -0,0 +1,225 @@
+import itertools
+
+from fractions import Fraction
+from math import comb
+
+import numpy as np
+
+import poker_functions
+import hand_organization
+import bot_functions
+import batch_evaluator
+
+############################### Exact Outcomes #################################
+#The bot_test matchup deals hand one (kept as dealt) and hand two, then hand
+#  two draws from the 42 cards left. Every question below is answered by
+#  enumerating every card that could still come instead of sampling them
+
+def combination_cards(cards:list, count:int) -> np.ndarray:
+    '''
+    List every way to pick count cards from cards
+
+    Parameters:
+        cards: list of card integers
+
+        count: number of cards in each pick
+
+    Returns:
+        picks: (C(len(cards), count), count) array of card integers
+
+    Examples/Doctests:
+    >>> combination_cards([3, 7, 9], 2).tolist()
+    [[3, 7], [3, 9], [7, 9]]
+    >>> combination_cards([3, 7, 9], 0).shape
+    (1, 0)
+    '''
+    picks = list(itertools.combinations(cards, count))
+
+    return np.array(picks, dtype=np.int64).reshape(len(picks), count)
+
+def card_masks(picks:np.ndarray) -> np.ndarray:
+    '''
+    Turn an (N, k) array of card integers into N hand integers
+
+    Examples/Doctests:
+    >>> card_masks(np.array([[0, 1], [13, 51]])).tolist()
+    [3, 2251799813693440]
+    '''
+    return np.bitwise_or.reduce(np.left_shift(np.uint64(1), picks.astype(np.uint64)), axis=1, initial=np.uint64(0))
+
+def draw_strengths(keep_list:list, unseen_cards:list) -> np.ndarray:
+    '''
+    Find the strength of every hand the bot can end with after keeping
+        keep_list and drawing the rest from unseen_cards
+
+    Parameters:
+        keep_list: list of card integers kept
+
+        unseen_cards: list of card integers the draw can come from
+
+    Returns:
+        draws: (N, 5 - len(keep_list)) array of the cards drawn
+
+        strengths: (N,) array of the final strength for each draw
+    '''
+    draws       = combination_cards(unseen_cards, 5 - len(keep_list))
+    kept_cards  = np.tile(np.array(keep_list, dtype=np.int64), (len(draws), 1))
+    final_cards = np.hstack([kept_cards, draws])
+
+    return draws, batch_evaluator.batch_evaluate(final_cards)[1]
+
+def outcome_fractions(lower:int, equal:int, higher:int) -> dict:
+    '''
+    Turn counts of hand two ending lower, equal and higher than hand one into
+        exact outcome probabilities
+
+    Examples/Doctests:
+    >>> outcome_fractions(1, 1, 2)
+    {'ONE': Fraction(1, 4), 'TWO': Fraction(1, 2), 'SPLIT': Fraction(1, 4)}
+    '''
+    total = lower + equal + higher
+
+    return {'ONE': Fraction(lower, total), 'TWO': Fraction(higher, total), 'SPLIT': Fraction(equal, total)}
+
+def exact_deal(static_hand:int, bot_hand:int, keep_function = None) -> dict:
+    '''
+    Work out the exact outcome probabilities of one deal over every draw
+        the bot can make from the 42 cards left
+
+    Parameters:
+        static_hand: integer holding one bit for each card of hand one
+
+        bot_hand: integer holding one bit for each card of hand two
+
+        keep_function: bot strategy used by hand two, bot_functions.calculate_keep
+            when not given
+
+    Returns:
+        probabilities: dictionary of outcome_indicator -> Fraction
+
+    Examples/Doctests:
+    >>> static_hand = hand_organization.hand_from_dict({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(6,3)]})
+    >>> bot_hand    = hand_organization.hand_from_dict({0:[(9,0), (10,0), (11,0), (12,0)], 1:[(3,1)], 2:[], 3:[]})
+    >>> probabilities = exact_deal(static_hand, bot_hand)
+    >>> probabilities['TWO'] == Fraction(7 + 4, 42) #7 hearts left for the flush, 3 eights and a king for the straight
+    True
+    '''
+    keep_function = bot_functions.calculate_keep if keep_function is None else keep_function
+    keep_list     = keep_function(bot_hand)
+
+    unseen_cards        = [card for card in range(52) if not (static_hand | bot_hand) >> card & 1]
+    draws, strengths    = draw_strengths(keep_list, unseen_cards)
+    static_strength     = poker_functions.hand_strength(static_hand)
+
+    return outcome_fractions(int((strengths < static_strength).sum()),
+                             int((strengths == static_strength).sum()),
+                             int((strengths > static_strength).sum()))
+
+################################ Bot Hand Odds #################################
+#Strength of every five card hand, built the first time it is needed
+hand_arrays = None
+
+def get_hand_arrays() -> tuple:
+    '''
+    Return every five card hand and its strength, sorted by strength
+
+    Returns:
+        masks: (2598960,) array of hand integers
+
+        strengths: (2598960,) array of strengths, lowest first
+    '''
+    global hand_arrays
+
+    if hand_arrays is None:
+        cards     = combination_cards(list(range(52)), 5)
+        strengths = batch_evaluator.batch_evaluate(cards)[1]
+        order     = np.argsort(strengths, kind='stable')
+        hand_arrays = (card_masks(cards)[order], strengths[order])
+
+    return hand_arrays
+
+def exact_bot_hand(bot_hand:int, keep_function = None) -> dict:
+    '''
+    Work out the exact outcome probabilities once hand two is known, over
+        every hand one and every draw. For each draw the hands one avoiding
+        the dead cards are counted in a single vector pass, so the cost grows
+        with the number of draws: instant for a pat hand or a one card draw,
+        about half a minute for a three card draw
+
+    Parameters:
+        bot_hand: integer holding one bit for each card of hand two
+
+        keep_function: bot strategy used by hand two, bot_functions.calculate_keep
+            when not given
+
+    Returns:
+        probabilities: dictionary of outcome_indicator -> Fraction
+
+    Examples/Doctests:
+    >>> flush = hand_organization.hand_from_dict({0:[(2,0), (5,0), (9,0), (11,0), (13,0)], 1:[], 2:[], 3:[]})
+    >>> probabilities = exact_bot_hand(flush)
+    >>> float(probabilities['TWO']) > 0.99, probabilities['SPLIT'] == Fraction(3, comb(47, 5)) #the same ranks in another suit
+    (True, True)
+    '''
+    keep_function = bot_functions.calculate_keep if keep_function is None else keep_function
+    keep_list     = keep_function(bot_hand)
+
+    masks, strengths = get_hand_arrays()
+    live             = (masks & np.uint64(bot_hand)) == 0
+    masks            = masks[live]
+    strengths        = strengths[live]
+
+    unseen_cards         = [card for card in range(52) if not bot_hand >> card & 1]
+    draws, bot_strengths = draw_strengths(keep_list, unseen_cards)
+    draw_masks           = card_masks(draws)
+
+    #Every draw leaves C(42, 5) hands one, so only the lower and equal ones need counting
+    hands_left = comb(47 - draws.shape[1], 5)
+    beaten     = 0
+    split      = 0
+    for draw_mask, bot_strength in zip(draw_masks, bot_strengths):
+        lower_end = np.searchsorted(strengths, bot_strength, side='left')
+        equal_end = np.searchsorted(strengths, bot_strength, side='right')
+        avoiding  = (masks[:equal_end] & draw_mask) == 0
+
+        beaten += int(np.count_nonzero(avoiding[:lower_end]))
+        split  += int(np.count_nonzero(avoiding[lower_end:]))
+
+    total = hands_left * len(draws)
+
+    return outcome_fractions(total - beaten - split, split, beaten)
+
+if __name__ == "__main__":
+    import argparse
+    import random
+
+    import simulation
+
+    parser = argparse.ArgumentParser(description='Exact bot_test odds once the bot hand is dealt')
+    parser.add_argument('--seed',   type=int, default=0,      help='seed of the deck dealing the bot hand')
+    parser.add_argument('--rounds', type=int, default=100000, help='sampled rounds to check the exact odds against')
+    arguments = parser.parse_args()
+
+    deck = poker_functions.Deck(arguments.seed)
+    deck.shuffle()
+    bot_hand = poker_functions.deal_hands(1, deck)[0]
+
+    print('Bot Hand:')
+    poker_functions.print_hand(bot_hand)
+
+    probabilities = exact_bot_hand(bot_hand)
+
+    #Sample the same question: a fresh hand one and draw for the same bot hand each round
+    rng          = random.Random(arguments.seed)
+    keep_list    = bot_functions.calculate_keep(bot_hand)
+    unseen_cards = [card for card in range(52) if not bot_hand >> card & 1]
+    tally        = simulation.new_tally()
+    for round_count in range(arguments.rounds):
+        picks       = rng.sample(unseen_cards, 10 - len(keep_list))
+        static_hand = hand_organization.create_hand(picks[:5])
+        final_hand  = hand_organization.create_hand(keep_list + picks[5:])
+        tally[poker_functions.showdown(static_hand, final_hand).winner] += 1
+
+    intervals = simulation.outcome_intervals(tally)
+    for outcome in ['ONE', 'TWO', 'SPLIT']:
+        print('{:<6} exact {:.6f}   sampled {:.6f} +/- {:.6f}'.format(outcome, float(probabilities[outcome]), *intervals[outcome]))
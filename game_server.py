@@ -0,0 +1,200 @@
+import argparse
+import asyncio
+import itertools
+
+import poker_functions
+import poker_game
+
+################################# Game Server ##################################
+#Every connection sits at a table of its own with its own deck, so one
+#  process serves many players at once. A table only holds its deck and two
+#  hands while it waits on the player, so idle players cost a coroutine each
+#  and never a thread
+
+#Seconds a table waits for the player before the seat is closed
+IDLE_TIMEOUT = 600
+
+#table id -> Table of every table being played
+tables   = dict()
+table_id = itertools.count(1)
+
+class Table:
+    '''
+    One player's table
+
+    table_id: number of the table
+    deck:     Deck the table plays with
+    reader:   asyncio.StreamReader of the player's connection
+    writer:   asyncio.StreamWriter of the player's connection
+    rounds:   number of rounds played
+    '''
+    def __init__(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter, seed = None) -> None:
+        '''
+        Parameters:
+            reader: asyncio.StreamReader of the player's connection
+
+            writer: asyncio.StreamWriter of the player's connection
+
+            seed: optional seed for the table's deck
+        '''
+        self.table_id = next(table_id)
+        self.deck     = poker_functions.Deck(seed)
+        self.reader   = reader
+        self.writer   = writer
+        self.rounds   = 0
+
+    async def send(self, lines:list) -> None:
+        '''
+        Send lines of text to the player
+        '''
+        self.writer.write(('\n'.join(lines) + '\n').encode())
+        await asyncio.wait_for(self.writer.drain(), IDLE_TIMEOUT)
+
+    async def ask(self, prompt:str) -> str:
+        '''
+        Send a prompt and wait for the player's answer
+
+        Returns:
+            answer: line typed by the player without the line ending
+
+        Raises:
+            ConnectionError: the player left
+
+            ValueError: the line is longer than the stream limit
+        '''
+        self.writer.write(prompt.encode())
+        await asyncio.wait_for(self.writer.drain(), IDLE_TIMEOUT)
+
+        line = await asyncio.wait_for(self.reader.readline(), IDLE_TIMEOUT)
+        if not line:
+            raise ConnectionError('player left the table')
+
+        return line.decode(errors='replace').strip()
+
+    async def play_round(self) -> str:
+        '''
+        Deal, let the player and the bot draw and settle the showdown
+
+        Returns:
+            outcome_indicator: ONE, TWO, SPLIT
+        '''
+        hands       = poker_game.start_new_game(self.deck)
+        player_hand = hands[0]
+        bot_hand    = hands[1]
+
+        await self.send(['Your Hand:'] + poker_functions.format_hand(player_hand) + ['invalid input will result in no replacement'])
+        replacement_string = await self.ask('what Card(s) would you like to keep Ex.351: ')
+
+        player_hand = poker_game.modify_hand(poker_game.parse_keep(player_hand, replacement_string), self.deck)
+        bot_hand    = poker_game.modify_bot_hand(bot_hand, self.deck)
+
+        result = poker_functions.showdown(player_hand, bot_hand)
+        await self.send(poker_functions.format_compare_hands(player_hand, bot_hand, result))
+
+        self.rounds += 1
+
+        return result.winner
+
+    async def play(self) -> None:
+        '''
+        Greet the player and play rounds until they stop
+        '''
+        await self.send(poker_game.greeting_lines())
+        await self.ask('press enter to continue...')
+        await self.send(['--------------------------------'])
+
+        repeat_string = 'y'
+        while repeat_string == 'y':
+            await self.play_round()
+            repeat_string = (await self.ask('Would you like to play again (y/n):')).lower()
+
+        await self.send(['Thanks for playing'])
+
+async def handle_player(reader:asyncio.StreamReader, writer:asyncio.StreamWriter, seed = None) -> None:
+    '''
+    Seat a new connection at a table of its own and play until the player
+        stops, leaves or goes idle for IDLE_TIMEOUT seconds
+
+    Parameters:
+        reader: asyncio.StreamReader of the player's connection
+
+        writer: asyncio.StreamWriter of the player's connection
+
+        seed: optional seed for the table's deck
+    '''
+    table = Table(reader, writer, seed)
+    tables[table.table_id] = table
+
+    try:
+        await table.play()
+    except (ConnectionError, asyncio.TimeoutError, ValueError):
+        #The player left, stopped reading or answering, or sent a line
+        #  longer than the stream limit
+        pass
+    finally:
+        del tables[table.table_id]
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            #The player already reset the connection
+            pass
+
+async def start_server(host:str = '127.0.0.1', port:int = 8765, unix_path:str = None) -> asyncio.AbstractServer:
+    '''
+    Start listening for players on a TCP port, or on a Unix socket when
+        unix_path is given
+
+    Parameters:
+        host: address to listen on
+
+        port: TCP port to listen on, 0 picks a free port
+
+        unix_path: path of a Unix socket to listen on instead of TCP
+
+    Returns:
+        server: asyncio server, already accepting players
+
+    Examples/Doctests:
+    >>> async def play_one_round():
+    ...     server = await start_server(port=0)
+    ...     reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+    ...     writer.write(b'\\n12\\nn\\n')
+    ...     text = (await reader.read()).decode()
+    ...     writer.close()
+    ...     await writer.wait_closed()
+    ...     server.close()
+    ...     await server.wait_closed()
+    ...     return text
+    >>> text = asyncio.run(play_one_round())
+    >>> 'Welcome to the Poker Championship' in text, 'CPU HAND' in text, text.endswith('Thanks for playing\\n')
+    (True, True, True)
+    >>> any(line.startswith(('HAND ONE WINS', 'HAND TWO WINS', 'SPLIT POT')) for line in text.splitlines())
+    True
+    '''
+    if unix_path is not None:
+        return await asyncio.start_unix_server(handle_player, path=unix_path)
+
+    return await asyncio.start_server(handle_player, host, port)
+
+async def serve(host:str, port:int, unix_path:str = None) -> None:
+    '''
+    Run the server until the process is stopped
+    '''
+    server = await start_server(host, port, unix_path)
+
+    where = unix_path if unix_path is not None else '{}:{}'.format(host, port)
+    print('Serving poker tables on {}'.format(where))
+
+    async with server:
+        await server.serve_forever()
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Host five card draw tables for many players at once')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='address to listen on')
+    parser.add_argument('--port', type=int, default=8765,        help='TCP port to listen on')
+    parser.add_argument('--unix', type=str, default=None,        help='listen on this Unix socket instead of TCP')
+    arguments = parser.parse_args()
+
+    asyncio.run(serve(arguments.host, arguments.port, arguments.unix))
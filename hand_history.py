@@ -0,0 +1,349 @@
+import array
+import os
+import sys
+
+import numpy as np
+
+import poker_functions
+import poker_game
+import hand_organization
+import bot_functions
+import batch_evaluator
+import simulation
+
+################################ Record Layout #################################
+#One round is a 16 byte record of two little endian 64 bit words. Cards are
+#  6 bit card integers (0-51), five per hand from the lowest card up
+#
+#  word 0  bits  0-29  hand one (static hand) cards
+#          bits 30-59  hand two (bot hand) cards as dealt
+#          bits 60-61  outcome: SPLIT 0, ONE 1, TWO 2 (see batch_evaluator)
+#  word 1  bits  0-29  hand two cards after the draw
+#          bits 30-34  keep mask, bit i set when card i of the dealt bot hand was kept
+#          bits 35-38  score of hand one
+#          bits 39-42  score of hand two as dealt
+#          bits 43-46  score of hand two after the draw
+#
+#A file starts with a 16 byte header: the magic bytes, a version and the
+#  record size, so readers can refuse files they do not understand
+MAGIC         = b'PKHH'
+VERSION       = 1
+HEADER_SIZE   = 16
+RECORD_DTYPE  = np.dtype([('deal', '<u8'), ('draw', '<u8')])
+OUTCOME_CODES = {'SPLIT': batch_evaluator.SPLIT, 'ONE': batch_evaluator.ONE, 'TWO': batch_evaluator.TWO}
+
+#Records held in memory before the writer sends them to disk in one write
+BUFFER_RECORDS = 1 << 16
+
+def pack_cards(hand:int) -> int:
+    '''
+    Pack the five cards of a hand into 30 bits, 6 bits per card
+
+    Examples/Doctests:
+    >>> packed = pack_cards(1 << 0 | 1 << 1 | 1 << 13 | 1 << 26 | 1 << 51)
+    >>> [packed >> (6 * index) & 0x3F for index in range(5)]
+    [0, 1, 13, 26, 51]
+    '''
+    packed = 0
+    for index, card in enumerate(hand_organization.create_card_list(hand)):
+        packed |= card << (6 * index)
+
+    return packed
+
+def unpack_cards(packed:int) -> int:
+    '''
+    Turn 30 packed bits back into a hand integer
+
+    Examples/Doctests:
+    >>> hand = 1 << 0 | 1 << 1 | 1 << 13 | 1 << 26 | 1 << 51
+    >>> unpack_cards(pack_cards(hand)) == hand
+    True
+    '''
+    hand = 0
+    for index in range(5):
+        hand |= 1 << (packed >> (6 * index) & 0x3F)
+
+    return hand
+
+def pack_record(static_hand:int, bot_hand:int, keep_list:list, final_hand:int, winner:str) -> tuple:
+    '''
+    Pack one round into the two words of a record
+
+    Parameters:
+        static_hand: hand integer of hand one
+
+        bot_hand: hand integer of hand two as dealt
+
+        keep_list: list of card integers hand two kept
+
+        final_hand: hand integer of hand two after the draw
+
+        winner: ONE, TWO, SPLIT
+
+    Returns:
+        deal_word: int
+
+        draw_word: int
+    '''
+    keep_mask = 0
+    for index, card in enumerate(hand_organization.create_card_list(bot_hand)):
+        if card in keep_list:
+            keep_mask |= 1 << index
+
+    deal_word = pack_cards(static_hand) | pack_cards(bot_hand) << 30 | OUTCOME_CODES[winner] << 60
+    draw_word = (pack_cards(final_hand) | keep_mask << 30
+                 | poker_functions.score_hand(static_hand) << 35
+                 | poker_functions.score_hand(bot_hand) << 39
+                 | poker_functions.score_hand(final_hand) << 43)
+
+    return deal_word, draw_word
+
+################################ History Writer ################################
+class HistoryWriter:
+    '''
+    Stream records to a hand history file, buffering BUFFER_RECORDS records
+        between writes
+
+    Examples/Doctests:
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'rounds.pkhh')
+    >>> hand_one = hand_organization.hand_from_dict({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(6,3)]})
+    >>> hand_two = hand_organization.hand_from_dict({0:[(9,0), (10,0), (11,0), (12,0)], 1:[(3,1)], 2:[], 3:[]})
+    >>> final    = hand_organization.hand_from_dict({0:[(9,0), (10,0), (11,0), (12,0), (13,0)], 1:[], 2:[], 3:[]})
+    >>> with HistoryWriter(path) as writer:
+    ...     writer.write(hand_one, hand_two, hand_organization.create_card_list(hand_two & final), final, 'TWO')
+    >>> records = read_history(path)
+    >>> len(records), outcomes(records).tolist(), scores(records, 'final').tolist()
+    (1, [2], [8])
+    >>> unpack_cards(int(cards(records, 'dealt')[0])) == hand_two, keep_masks(records).tolist()
+    (True, [15])
+    '''
+    def __init__(self, path:str, buffer_records:int = BUFFER_RECORDS) -> None:
+        '''
+        Parameters:
+            path: file to write, replaced when it exists
+
+            buffer_records: records held before each write
+        '''
+        self.file           = open(path, 'wb')
+        self.buffer         = array.array('Q')
+        self.buffer_records = buffer_records
+        self.records        = 0
+
+        self.file.write(MAGIC + VERSION.to_bytes(4, 'little') + RECORD_DTYPE.itemsize.to_bytes(8, 'little'))
+
+    def write(self, static_hand:int, bot_hand:int, keep_list:list, final_hand:int, winner:str) -> None:
+        '''
+        Add one round, see pack_record
+        '''
+        self.buffer.extend(pack_record(static_hand, bot_hand, keep_list, final_hand, winner))
+        self.records += 1
+
+        if len(self.buffer) >= 2 * self.buffer_records:
+            self.flush()
+
+    def flush(self) -> None:
+        '''
+        Write every buffered record
+        '''
+        if sys.byteorder != 'little':
+            self.buffer.byteswap()
+
+        self.buffer.tofile(self.file)
+        self.buffer = array.array('Q')
+
+    def close(self) -> None:
+        '''
+        Write every buffered record and close the file
+        '''
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.close()
+
+############################### Recorded Rounds ################################
+def record_simulation(path:str, rounds:int, seed:int, keep_function = None,
+                      chunk_rounds:int = simulation.CHUNK_ROUNDS) -> dict:
+    '''
+    Play bot_test rounds in this process and keep every one of them in a
+        hand history. The decks are seeded chunk by chunk like
+        simulation.run_simulation, so the recorded rounds are the rounds it plays
+
+    Parameters:
+        path: hand history file to write
+
+        rounds: number of rounds to play
+
+        seed: seed of the whole simulation
+
+        keep_function: bot strategy used by hand two, bot_functions.calculate_keep when not given
+
+        chunk_rounds: rounds played by each chunk
+
+    Returns:
+        tally: dictionary of outcome_indicator -> number of rounds
+
+    Examples/Doctests:
+    >>> import tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'rounds.pkhh')
+    >>> record_simulation(path, 500, 7, chunk_rounds=200) == simulation.run_simulation(500, 7, 1, chunk_rounds=200)
+    True
+    >>> records = read_history(path)
+    >>> len(records), int((outcomes(records) == batch_evaluator.TWO).sum()) == record_simulation(path, 500, 7, chunk_rounds=200)['TWO']
+    (500, True)
+    '''
+    keep_function = bot_functions.calculate_keep if keep_function is None else keep_function
+    tally         = simulation.new_tally()
+
+    with HistoryWriter(path) as writer:
+        for chunk_index, chunk in enumerate(simulation.split_rounds(rounds, chunk_rounds)):
+            deck = poker_functions.Deck(simulation.chunk_seed(seed, chunk_index))
+
+            for round_count in range(chunk):
+                static_hand, bot_hand = poker_game.start_new_game(deck)
+                keep_list             = keep_function(bot_hand)
+                final_hand            = poker_game.modify_hand(list(keep_list), deck)
+                winner                = poker_functions.showdown(static_hand, final_hand).winner
+
+                writer.write(static_hand, bot_hand, keep_list, final_hand, winner)
+                tally[winner] += 1
+
+    return tally
+
+################################ History Reader ################################
+def read_history(path:str) -> np.ndarray:
+    '''
+    Map a hand history file into memory without reading it. Slices and
+        filters only touch the pages they need
+
+    Parameters:
+        path: hand history file
+
+    Returns:
+        records: (N,) memory mapped array of RECORD_DTYPE
+
+    Raises:
+        ValueError: the file is not a hand history this reader understands
+    '''
+    with open(path, 'rb') as history_file:
+        header = history_file.read(HEADER_SIZE)
+
+    if header[:4] != MAGIC or int.from_bytes(header[4:8], 'little') != VERSION:
+        raise ValueError('{} is not a version {} hand history'.format(path, VERSION))
+
+    #A file of no records cannot be mapped
+    if os.path.getsize(path) == HEADER_SIZE:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE)
+
+def scan_history(path:str, chunk_records:int = 1 << 22):
+    '''
+    Walk a hand history in chunks so files of billions of records are
+        filtered with bounded memory
+
+    Parameters:
+        path: hand history file
+
+        chunk_records: records in each chunk
+
+    Yields:
+        records: (chunk_records,) slice of the memory mapped records
+    '''
+    records = read_history(path)
+    for start in range(0, len(records), chunk_records):
+        yield records[start:start + chunk_records]
+
+#Where each field sits: (word, shift, bits)
+fields = {
+    'static':       ('deal', 0,  30),
+    'dealt':        ('deal', 30, 30),
+    'outcome':      ('deal', 60, 2),
+    'final':        ('draw', 0,  30),
+    'keep':         ('draw', 30, 5),
+    'static_score': ('draw', 35, 4),
+    'dealt_score':  ('draw', 39, 4),
+    'final_score':  ('draw', 43, 4),
+}
+
+def field(records:np.ndarray, name:str) -> np.ndarray:
+    '''
+    Pull one field out of every record
+
+    Parameters:
+        records: array of RECORD_DTYPE
+
+        name: key of fields
+
+    Returns:
+        values: (N,) array of uint64
+    '''
+    word, shift, bits = fields[name]
+
+    return records[word] >> np.uint64(shift) & np.uint64((1 << bits) - 1)
+
+def cards(records:np.ndarray, hand:str) -> np.ndarray:
+    '''
+    Packed cards of one hand of every record: 'static', 'dealt' or 'final'
+    '''
+    return field(records, hand)
+
+def outcomes(records:np.ndarray) -> np.ndarray:
+    '''
+    Outcome code of every record: SPLIT 0, ONE 1, TWO 2
+    '''
+    return field(records, 'outcome')
+
+def scores(records:np.ndarray, hand:str) -> np.ndarray:
+    '''
+    Score (0-8) of one hand of every record: 'static', 'dealt' or 'final'
+    '''
+    return field(records, hand + '_score')
+
+def keep_masks(records:np.ndarray) -> np.ndarray:
+    '''
+    Keep mask of every record, bit i set when card i of the dealt bot hand was kept
+    '''
+    return field(records, 'keep')
+
+def card_arrays(packed:np.ndarray) -> np.ndarray:
+    '''
+    Unpack packed cards into an (N, 5) array of card integers, ready for batch_evaluator
+
+    Examples/Doctests:
+    >>> card_arrays(np.array([pack_cards(0b11111)], dtype=np.uint64)).tolist()
+    [[0, 1, 2, 3, 4]]
+    '''
+    shifts = np.arange(0, 30, 6, dtype=np.uint64)
+
+    return (packed[:, None] >> shifts & np.uint64(0x3F)).astype(np.int64)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Count the recorded rounds matching a filter')
+    parser.add_argument('path',                                           help='hand history file')
+    parser.add_argument('--outcome',     choices=list(OUTCOME_CODES),     help='only rounds with this outcome')
+    parser.add_argument('--final-score', type=int, default=None,          help='only rounds where hand two ends with this score (0-8)')
+    parser.add_argument('--dealt-score', type=int, default=None,          help='only rounds where hand two is dealt this score (0-8)')
+    arguments = parser.parse_args()
+
+    matched = 0
+    total   = 0
+    for records in scan_history(arguments.path):
+        keep = np.ones(len(records), dtype=bool)
+        if arguments.outcome is not None:
+            keep &= outcomes(records) == OUTCOME_CODES[arguments.outcome]
+        if arguments.final_score is not None:
+            keep &= scores(records, 'final') == arguments.final_score
+        if arguments.dealt_score is not None:
+            keep &= scores(records, 'dealt') == arguments.dealt_score
+
+        matched += int(np.count_nonzero(keep))
+        total   += len(records)
+
+    print('{} of {} rounds match'.format(matched, total))
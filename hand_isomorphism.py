@@ -0,0 +1,195 @@
+import bisect
+
+import poker_functions
+import table_cache
+
+############################### Suit Isomorphism ###############################
+#Swapping suits around never changes what a hand can make, so any table keyed
+#  by hand only needs one entry per isomorphism class. The canonical hand of a
+#  class holds the suit rows of the hand sorted from the largest to the
+#  smallest 13 bit row: the first suit gets the largest row, the last suit the
+#  smallest
+
+def suit_rows(hand:int) -> list:
+    '''
+    Split a hand into the 13 bit rank row of each suit
+
+    Parameters:
+        hand: integer holding one bit for each card in the hand
+
+    Returns:
+        rows: list of 4 integers indexed by suit
+
+    Examples/Doctests:
+    >>> suit_rows(0b101 | 1 << 13 | 1 << 51)
+    [5, 1, 0, 4096]
+    '''
+    return [poker_functions.suit_ranks(hand, suit) for suit in poker_functions.suits.keys()]
+
+def canonical_hand(hand:int) -> int:
+    '''
+    Reduce a hand to the canonical hand of its isomorphism class
+
+    Parameters:
+        hand: integer holding one bit for each card in the hand
+
+    Returns:
+        canonical_hand: integer holding one bit for each card in the canonical hand
+
+    Examples/Doctests:
+    >>> canonical_hand(1 << 13 | 1 << 40) == canonical_hand(1 << 26 | 1 << 1)
+    True
+    >>> bin(canonical_hand(1 << 39 | 1 << 40 | 1 << 13))
+    '0b10000000000011'
+    '''
+    rows = sorted(suit_rows(hand), reverse=True)
+
+    return rows[0] | rows[1] << 13 | rows[2] << 26 | rows[3] << 39
+
+def suit_permutation(hand:int) -> list:
+    '''
+    Find which real suit of a hand sits in each canonical suit
+
+    Parameters:
+        hand: integer holding one bit for each card in the hand
+
+    Returns:
+        real_suits: list of 4 suits, real_suits[canonical_suit] is the real suit
+
+    Examples/Doctests:
+    >>> suit_permutation(1 << 39 | 1 << 40 | 1 << 13)
+    [3, 1, 0, 2]
+    '''
+    rows = suit_rows(hand)
+
+    return sorted(poker_functions.suits.keys(), key=lambda suit: rows[suit], reverse=True)
+
+def real_cards(card_list:list, hand:int) -> list:
+    '''
+    Move cards picked on the canonical hand back to the real suits of hand
+
+    Parameters:
+        card_list: list of card integers in canonical suits
+
+        hand: integer holding one bit for each card in the real hand
+
+    Returns:
+        card_list: list of card integers in the real suits
+
+    Examples/Doctests:
+    >>> hand = 1 << 39 | 1 << 40 | 1 << 13
+    >>> real_cards([0, 1], hand)
+    [39, 40]
+    '''
+    real_suits = suit_permutation(hand)
+
+    return [real_suits[poker_functions.card_suit(card)] * 13 + poker_functions.card_rank(card) - 1 for card in card_list]
+
+def canonical_hands(card_count:int) -> list:
+    '''
+    List the canonical hand of every isomorphism class holding card_count
+        cards, from the lowest to the highest canonical hand
+
+    Parameters:
+        card_count: number of cards in each hand, 0-5
+
+    Returns:
+        canonical_hands: list of canonical hand integers
+
+    Examples/Doctests:
+    >>> [len(canonical_hands(card_count)) for card_count in range(6)]
+    [1, 13, 169, 1755, 16432, 134459]
+    '''
+    rows_by_count = [list() for count in range(card_count + 1)]
+    for row in range(poker_functions.suit_mask + 1):
+        if row.bit_count() <= card_count:
+            rows_by_count[row.bit_count()].append(row)
+
+    hands = list()
+
+    #Fill the suits one at a time, each row no larger than the row before it
+    def place_rows(suit:int, cards_left:int, largest_row:int, hand:int) -> None:
+        if suit == 3:
+            for row in rows_by_count[cards_left]:
+                if row > largest_row:
+                    break
+                hands.append(hand | row << 39)
+            return
+
+        for count in range(cards_left + 1):
+            for row in rows_by_count[count]:
+                if row > largest_row:
+                    break
+                place_rows(suit + 1, cards_left - count, row, hand | row << (13 * suit))
+
+    place_rows(0, card_count, poker_functions.suit_mask, 0)
+
+    return sorted(hands)
+
+############################### Class Numbering ################################
+#canonical hand -> class id, one dictionary per card count built on first use
+class_ids = dict()
+
+class SortedIndex:
+    '''
+    Class ids found by binary search over the sorted canonical hands. Stands
+        in for a class id dictionary where the canonical hands live in memory
+        shared between processes, so no process builds a dictionary of its own
+
+    hands: sorted sequence of canonical hand integers
+
+    Examples/Doctests:
+    >>> index = SortedIndex(canonical_hands(2))
+    >>> index[canonical_hand(1 << 13 | 1 << 40)] == get_class_ids(2)[canonical_hand(1 << 13 | 1 << 40)], len(index)
+    (True, 169)
+    '''
+    def __init__(self, hands) -> None:
+        self.hands = hands
+
+    def __getitem__(self, hand:int) -> int:
+        index = bisect.bisect_left(self.hands, hand)
+        if index == len(self.hands) or self.hands[index] != hand:
+            raise KeyError(hand)
+
+        return index
+
+    def __len__(self) -> int:
+        return len(self.hands)
+
+def get_class_ids(card_count:int) -> dict:
+    '''
+    Return the class id of every canonical hand holding card_count cards,
+        numbering them in the order of canonical_hands
+
+    Parameters:
+        card_count: number of cards in each hand, 0-5
+
+    Returns:
+        class_ids: dictionary of canonical hand -> class id
+    '''
+    if card_count not in class_ids:
+        #Listing the classes of five cards takes a while, the list is kept in the table cache
+        hands = table_cache.cached_table('canonical_hands_{}'.format(card_count), 'Q',
+                                         lambda: canonical_hands(card_count), sources=[__file__]).tolist()
+        class_ids[card_count] = dict(zip(hands, range(len(hands))))
+
+    return class_ids[card_count]
+
+def class_id(hand:int) -> int:
+    '''
+    Find the isomorphism class id of a hand, a dense number from 0 up to
+        the number of classes for its card count
+
+    Parameters:
+        hand: integer holding one bit for each card in the hand
+
+    Returns:
+        class_id: integer
+
+    Examples/Doctests:
+    >>> class_id(1 << 13 | 1 << 40) == class_id(1 << 26 | 1 << 1)
+    True
+    >>> class_id(1 << 51)
+    12
+    '''
+    return get_class_ids(hand.bit_count())[canonical_hand(hand)]
@@ -1,96 +1,237 @@
 import poker_functions
 
-def create_card_list(hand:dict) -> list:
+def card_from_tuple(card:tuple) -> int:
+    '''
+    Convert a (rank, suit) card tuple into its card integer
+
+    Parameters:
+        card: (rank(int), suit(int)) tuple that represents one card
+
+    Returns:
+        card: integer 0-51
+
+    Examples/Doctests:
+    >>> card_from_tuple((1, 0)), card_from_tuple((13, 3))
+    (0, 51)
+    '''
+    return card[1] * 13 + card[0] - 1
+
+def card_to_tuple(card:int) -> tuple:
+    '''
+    Convert a card integer into a (rank, suit) card tuple
+
+    Parameters:
+        card: integer 0-51
+
+    Returns:
+        card: (rank(int), suit(int)) tuple that represents one card
+
+    Examples/Doctests:
+    >>> card_to_tuple(0), card_to_tuple(51)
+    ((1, 0), (13, 3))
+    '''
+    return (poker_functions.card_rank(card), poker_functions.card_suit(card))
+
+def cards_to_tuples(card_list:list) -> list:
+    '''
+    Convert a list of card integers into a list of (rank, suit) card tuples
+
+    Parameters:
+        card_list: list of card integers
+
+    Returns:
+        card_list: list of tuples
+
+    Examples/Doctests:
+    >>> cards_to_tuples([12, 25, 0])
+    [(13, 0), (13, 1), (1, 0)]
+    '''
+    return [card_to_tuple(card) for card in card_list]
+
+def hand_from_dict(hand_dict:dict) -> int:
+    '''
+    Convert a dictionary of card tuples sorted by suit into a hand integer
+
+    Parameters:
+        hand_dict: a dictionary of cards sorted by suit
+
+    Returns:
+        hand: integer holding one bit for each card in the hand
+
+    Examples/Doctests:
+    >>> bin(hand_from_dict({0:[(1,0), (3,0)], 1:[(2,1)], 2:[], 3:[]}))
+    '0b100000000000101'
+    '''
+    hand = 0
+    for suit_list in hand_dict.values():
+        for card in suit_list:
+            hand |= 1 << card_from_tuple(card)
+
+    return hand
+
+def hand_to_dict(hand:int) -> dict:
+    '''
+    Convert a hand integer into a dictionary of card tuples sorted by suit
+
+    Parameters:
+        hand: integer holding one bit for each card in the hand
+
+    Returns:
+        hand_dict: a dictionary of cards sorted by suit
+
+    Examples/Doctests:
+    >>> hand_to_dict(hand_from_dict({0:[(1,0), (3,0)], 1:[(2,1)], 2:[], 3:[(13,3)]}))
+    {0: [(1, 0), (3, 0)], 1: [(2, 1)], 2: [], 3: [(13, 3)]}
+    '''
+    hand_dict = {0:[], 1:[], 2:[], 3:[]}
+    for card in create_card_list(hand):
+        hand_dict[poker_functions.card_suit(card)].append(card_to_tuple(card))
+
+    return hand_dict
+
+def create_card_list(hand:int) -> list:
     '''
     Create a card list from all the cards in a given hand
 
     Parameters:
-        hand: a dictionary of cards sorted by suit
+        hand: integer holding one bit for each card in the hand
 
     Return:
-        card_list: unorganized list of tuples
+        card_list: list of card integers from the lowest to the highest bit
 
     Examples/Doctests:
-    >>> create_card_list({0:[(2, 0), (5,0)], 1:[(3,1)], 2:[(13,2)], 3:[(6,3)]})
+    >>> cards_to_tuples(create_card_list(hand_from_dict({0:[(2, 0), (5,0)], 1:[(3,1)], 2:[(13,2)], 3:[(6,3)]})))
     [(2, 0), (5, 0), (3, 1), (13, 2), (6, 3)]
     '''
     card_list = list()
-    for suit_list in hand.values():
-        card_list += suit_list
+    while hand:
+        lowest_bit = hand & -hand
+        card_list.append(lowest_bit.bit_length() - 1)
+        hand ^= lowest_bit
 
     return card_list
 
-def create_hand_dict(card_list:list) -> dict:
+def create_hand(card_list:list) -> int:
     '''
-    From the given card list create a dictionary that discribes that card list
+    From the given card list create the hand integer that discribes that card list
     
     Parameters:
-        card_list: unorganized list of tuples
+        card_list: unorganized list of card integers
     
     Returns:
-        hand: a dictionary of cards sorted by suit
+        hand: integer holding one bit for each card in the hand
 
     Examples/Doctest:
-    >>> create_hand_dict({0:[(2,0), (5,0)], 1:[(3,1)], 2:[(13,2)], 3:[(6,3)]})
-    [(2, 0), (5, 0), (3, 1), (13, 2), (6, 3)]
+    >>> hand_to_dict(create_hand([1, 4, 15, 38, 44]))
+    {0: [(2, 0), (5, 0)], 1: [(3, 1)], 2: [(13, 2)], 3: [(6, 3)]}
     '''
-    hand = {0:[], 1:[], 2:[], 3:[]}
+    hand = 0
     for card in card_list:
-        card_suit = card[1]
-        hand[card_suit].append(card)
+        hand |= 1 << card
 
     return hand
 
 #####################################################################################
 
-def organize_hand(hand:dict) -> list:
+#score(int) : index(int) of the first organized card that is not part of the points
+junk_index_table = (#                       01234
+#############################################################
+        1,  #Highest Card    : Junk Index:  K0000
+        2,  #One Pair        : Junk Index:  KK000
+        4,  #Two Pair        : Junk Index:  KKQQ0
+        3,  #Three of a Kind : Junk Index:  KKK00
+        5,  #Straight        : Junk Index:  5
+        5,  #Flush           : Junk Index:  5
+        5,  #Full House      : Junk Index:  5
+        4,  #Four of a Kind  : Junk Index:  QQQQK
+        5   #Straight Flush  : Junk Index:  5
+)
+
+class HandAnalysis:
+    '''
+    Everything scoring, organizing and the bot discard logic read about one
+        hand, worked out in a single pass when the analysis is created
+
+    hand:        integer holding one bit for each card in the hand
+    strength:    strength of the hand (see poker_functions.hand_strength)
+    score:       score (0-8) of the hand
+    rank_list:   list that holds how many of each rank is in the hand
+    suit_counts: bitfield holding how many cards of each suit is in the hand
+    card_list:   organized list of card integers (see organize_hand)
+    junk_index:  index of the first card in card_list not associated with points
+
+    Examples/Doctests:
+    >>> analysis = HandAnalysis(hand_from_dict({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(5,3)]}))
+    >>> analysis.score, analysis.junk_index, hex(analysis.suit_counts)
+    (2, 4, '0x1112')
+    >>> cards_to_tuples(analysis.card_list)
+    [(13, 1), (13, 2), (5, 0), (5, 3), (2, 0)]
+    '''
+    __slots__ = ('hand', 'strength', 'score', 'rank_list', 'suit_counts', 'card_list', 'junk_index')
+
+    def __init__(self, hand:int) -> None:
+        '''
+        Parameters:
+            hand: integer holding one bit for each card in the hand
+        '''
+        self.hand        = hand
+        self.strength    = poker_functions.hand_strength(hand)
+        self.score       = self.strength >> poker_functions.strength_shift
+        self.rank_list   = poker_functions.hand_ranks(hand)
+        self.suit_counts = poker_functions.suit_counts(hand)
+        self.card_list   = organize_hand(hand, self.score)
+        self.junk_index  = junk_index_table[self.score]
+
+def organize_hand(hand:int, score:int = None) -> list:
     '''
     Organize hand based of the best possible score made from hand
 
     Parameters:
-        hand: a dictionary of cards sorted by suit
+        hand: integer holding one bit for each card in the hand
+
+        score: score of the hand when already known, scored here when not given
 
     Return:
         organized_card_list: The list of cards in a hand based of the score of the hand
 
     Examples/Doctests:
     #High Card
-    >>> organize_hand({0:[(2, 0), (5,0)], 1:[(3,1)], 2:[(13,2)], 3:[(6,3)]})
+    >>> cards_to_tuples(organize_hand(hand_from_dict({0:[(2, 0), (5,0)], 1:[(3,1)], 2:[(13,2)], 3:[(6,3)]})))
     [(13, 2), (2, 0), (5, 0), (3, 1), (6, 3)]
 
     #One Pair
-    >>> organize_hand({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(6,3)]})
+    >>> cards_to_tuples(organize_hand(hand_from_dict({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(6,3)]})))
     [(13, 1), (13, 2), (2, 0), (5, 0), (6, 3)]
 
     #Two Pair
-    >>> organize_hand({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(5,3)]})
+    >>> cards_to_tuples(organize_hand(hand_from_dict({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(5,3)]})))
     [(13, 1), (13, 2), (5, 0), (5, 3), (2, 0)]
 
     #Three of a Kind
-    >>> organize_hand({0:[(13,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(6,3)]})
+    >>> cards_to_tuples(organize_hand(hand_from_dict({0:[(13,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(6,3)]})))
     [(13, 0), (13, 1), (13, 2), (5, 0), (6, 3)]
 
     #Straight
-    >>> organize_hand({0:[(10,0), (9,0)], 1:[(13,1)], 2:[(12,2)], 3:[(11,3)]})
+    >>> cards_to_tuples(organize_hand(hand_from_dict({0:[(10,0), (9,0)], 1:[(13,1)], 2:[(12,2)], 3:[(11,3)]})))
     [(13, 1), (12, 2), (11, 3), (10, 0), (9, 0)]
 
     #Flush
-    >>> organize_hand({0:[(10,0), (9,0), (1,0), (7,0), (12,0)], 1:[], 2:[], 3:[]})
+    >>> cards_to_tuples(organize_hand(hand_from_dict({0:[(10,0), (9,0), (1,0), (7,0), (12,0)], 1:[], 2:[], 3:[]})))
     [(12, 0), (10, 0), (9, 0), (7, 0), (1, 0)]
 
     #Full House
-    >>> organize_hand({0:[(10,0), (9,0), (1,0), (7,0), (12,0)], 1:[], 2:[], 3:[]})
+    >>> cards_to_tuples(organize_hand(hand_from_dict({0:[(10,0), (9,0), (1,0), (7,0), (12,0)], 1:[], 2:[], 3:[]})))
     [(12, 0), (10, 0), (9, 0), (7, 0), (1, 0)]
 
     #Four of a Kind
-    >>> organize_hand({0:[(13,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(13,3)]})
+    >>> cards_to_tuples(organize_hand(hand_from_dict({0:[(13,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(13,3)]})))
     [(13, 0), (13, 1), (13, 2), (13, 3), (5, 0)]
 
     #Straight Flush
-    >>> organize_hand({0:[(10,0), (9,0), (8,0), (7,0), (11,0)], 1:[], 2:[], 3:[]})
+    >>> cards_to_tuples(organize_hand(hand_from_dict({0:[(10,0), (9,0), (8,0), (7,0), (11,0)], 1:[], 2:[], 3:[]})))
     [(11, 0), (10, 0), (9, 0), (8, 0), (7, 0)]
     '''
-    score = poker_functions.score_hand(hand)
+    score = poker_functions.score_hand(hand) if score is None else score
     
     #dictionary whose keys are all possible score values for a given hand
     #dictionary values are the function that would best organize the hand for 
@@ -107,38 +248,38 @@ def organize_hand(hand:dict) -> list:
         8: organize_straight_flush
     }
 
-    #Pass the hand dictionary into whichever function will best organize 
+    #Pass the hand integer into whichever function will best organize 
     # the hand into an organized card list based of the current 
     # score of the hand
     organized_card_list = organization_station[score](hand)
     return organized_card_list
 
-def organize_high_card(hand:dict) -> list:
+def organize_high_card(hand:int) -> list:
     '''
     Organzed list of cards with the highest card at index 0
 
     Parameters:
-        hand: a dictionary of cards sorted by suit
+        hand: integer holding one bit for each card in the hand
     
     Return:
-        organized_card_list: organized list of tuples
+        organized_card_list: organized list of card integers
 
     Examples/Doctests:
-    >>> organize_high_card({0:[(2, 0), (5,0)], 1:[(3,1)], 2:[(13,2)], 3:[(6,3)]})
+    >>> cards_to_tuples(organize_high_card(hand_from_dict({0:[(2, 0), (5,0)], 1:[(3,1)], 2:[(13,2)], 3:[(6,3)]})))
     [(13, 2), (2, 0), (5, 0), (3, 1), (6, 3)]
 
-    >>> organize_high_card({0:[(2, 0), (6,0)], 1:[(3,1)], 2:[(5,2)], 3:[(12,3)]})
+    >>> cards_to_tuples(organize_high_card(hand_from_dict({0:[(2, 0), (6,0)], 1:[(3,1)], 2:[(5,2)], 3:[(12,3)]})))
     [(12, 3), (2, 0), (6, 0), (3, 1), (5, 2)]
 
-    >>> organize_high_card({0:[(13, 0), (5,0)], 1:[(3,1)], 2:[(1,2)], 3:[(6,3)]})
+    >>> cards_to_tuples(organize_high_card(hand_from_dict({0:[(13, 0), (5,0)], 1:[(3,1)], 2:[(1,2)], 3:[(6,3)]})))
     [(13, 0), (5, 0), (3, 1), (1, 2), (6, 3)]
     '''
     #Determine what card has the highest rank
     card_list = create_card_list(hand)
     high_card = card_list[0]
     for card_index in range(len(card_list)-1, 0, -1):
-        current_card_rank = card_list[card_index][0]
-        high_card_rank    = high_card[0]
+        current_card_rank = poker_functions.card_rank(card_list[card_index])
+        high_card_rank    = poker_functions.card_rank(high_card)
         high_card         = card_list[card_index] if current_card_rank > high_card_rank else high_card
 
     #Set the card with the highest rank to the top of the list
@@ -150,48 +291,48 @@ def organize_high_card(hand:dict) -> list:
 
     return organized_list
 
-def organize_one_pair(hand:dict) -> list:
+def organize_one_pair(hand:int) -> list:
     '''
     Organize list of cards so that a pair takes index 0-1
 
     Parameters:
-        hand: a dictionary of cards sorted by suit
+        hand: integer holding one bit for each card in the hand
 
     Returns:
-        organized_card_list: organized list of tuples
+        organized_card_list: organized list of card integers
     
     Examples/Doctests:
-    >>> organize_one_pair({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(6,3)]})
+    >>> cards_to_tuples(organize_one_pair(hand_from_dict({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(6,3)]})))
     [(13, 1), (13, 2), (2, 0), (5, 0), (6, 3)]
 
-    >>> organize_one_pair({0:[(2,0), (5,0)], 1:[(3,1)], 2:[(13,2)], 3:[(5,3)]})
+    >>> cards_to_tuples(organize_one_pair(hand_from_dict({0:[(2,0), (5,0)], 1:[(3,1)], 2:[(13,2)], 3:[(5,3)]})))
     [(5, 0), (5, 3), (2, 0), (3, 1), (13, 2)]
 
-    >>> organize_one_pair({0:[(2,0), (5,0)], 1:[(3,1)], 2:[(2,2)], 3:[(6,3)]})
+    >>> cards_to_tuples(organize_one_pair(hand_from_dict({0:[(2,0), (5,0)], 1:[(3,1)], 2:[(2,2)], 3:[(6,3)]})))
     [(2, 0), (2, 2), (5, 0), (3, 1), (6, 3)]
 
     '''
     return organize_n_of_a_kind(hand, 2)
 
-def organize_two_pair(hand:dict) -> list:
+def organize_two_pair(hand:int) -> list:
     '''
     Organize list of cards so that the largest ranked pair takes index 0-1 and
         the smallest ranked pair takes index 2-3
 
     Parameters:
-        hand: a dictionary of cards sorted by suit
+        hand: integer holding one bit for each card in the hand
 
     Returns:
-        organized_card_list: organized list of tuples
+        organized_card_list: organized list of card integers
 
     Examples/Doctests:
-    >>> organize_two_pair({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(5,3)]})
+    >>> cards_to_tuples(organize_two_pair(hand_from_dict({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(5,3)]})))
     [(13, 1), (13, 2), (5, 0), (5, 3), (2, 0)]
 
-    >>> organize_two_pair({0:[(12,0), (5,0)], 1:[(3,1)], 2:[(12,2)], 3:[(5,3)]})
+    >>> cards_to_tuples(organize_two_pair(hand_from_dict({0:[(12,0), (5,0)], 1:[(3,1)], 2:[(12,2)], 3:[(5,3)]})))
     [(12, 0), (12, 2), (5, 0), (5, 3), (3, 1)]
 
-    >>> organize_two_pair({0:[(2,0), (5,0)], 1:[(6,1)], 2:[(2,2)], 3:[(6,3)]})
+    >>> cards_to_tuples(organize_two_pair(hand_from_dict({0:[(2,0), (5,0)], 1:[(6,1)], 2:[(2,2)], 3:[(6,3)]})))
     [(6, 1), (6, 3), (2, 0), (2, 2), (5, 0)]
     '''
     rank_list = poker_functions.hand_ranks(hand)
@@ -217,7 +358,7 @@ def organize_two_pair(hand:dict) -> list:
 
     #Sort the different pairs into the cooresponding list
     for card in list(card_list):
-        card_rank = card[0]
+        card_rank = poker_functions.card_rank(card)
         if card_rank == max_rank:
             max_pair.append(card)
             card_list.remove(card)
@@ -227,169 +368,169 @@ def organize_two_pair(hand:dict) -> list:
 
     return max_pair + min_pair + card_list
             
-def organize_three_of_a_kind(hand:dict) -> list:
+def organize_three_of_a_kind(hand:int) -> list:
     '''
     Organize list of cards so that a pair takes index 0-2
 
     Parameters:
-        hand: a dictionary of cards sorted by suit
+        hand: integer holding one bit for each card in the hand
 
     Returns:
-        organized_card_list: organized list of tuples
+        organized_card_list: organized list of card integers
     
     Examples/Doctests:
-    >>> organize_three_of_a_kind({0:[(13,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(6,3)]})
+    >>> cards_to_tuples(organize_three_of_a_kind(hand_from_dict({0:[(13,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(6,3)]})))
     [(13, 0), (13, 1), (13, 2), (5, 0), (6, 3)]
 
-    >>> organize_three_of_a_kind({0:[(2,0), (5,0)], 1:[(5,1)], 2:[(13,2)], 3:[(5,3)]})
+    >>> cards_to_tuples(organize_three_of_a_kind(hand_from_dict({0:[(2,0), (5,0)], 1:[(5,1)], 2:[(13,2)], 3:[(5,3)]})))
     [(5, 0), (5, 1), (5, 3), (2, 0), (13, 2)]
 
-    >>> organize_three_of_a_kind({0:[(2,0), (5,0)], 1:[(3,1)], 2:[(2,2)], 3:[(2,3)]})
+    >>> cards_to_tuples(organize_three_of_a_kind(hand_from_dict({0:[(2,0), (5,0)], 1:[(3,1)], 2:[(2,2)], 3:[(2,3)]})))
     [(2, 0), (2, 2), (2, 3), (5, 0), (3, 1)]
     '''
     
     return organize_n_of_a_kind(hand, 3)
 
-def organize_straight(hand:dict) -> list:
+def organize_straight(hand:int) -> list:
     '''
     Organize list of cards from largest rank to smallest rank
 
     Parameters:
-        hand: a dictionary of cards sorted by suit
+        hand: integer holding one bit for each card in the hand
 
     Returns:
-        organized_card_list: organized list of tuples
+        organized_card_list: organized list of card integers
 
     Examples/Doctests:
-    >>> organize_straight({0:[(10,0), (9,0)], 1:[(13,1)], 2:[(12,2)], 3:[(11,3)]})
+    >>> cards_to_tuples(organize_straight(hand_from_dict({0:[(10,0), (9,0)], 1:[(13,1)], 2:[(12,2)], 3:[(11,3)]})))
     [(13, 1), (12, 2), (11, 3), (10, 0), (9, 0)]
 
-    >>> organize_straight({0:[(1,0), (5,0)], 1:[(3,1)], 2:[(2,2)], 3:[(4,3)]})
+    >>> cards_to_tuples(organize_straight(hand_from_dict({0:[(1,0), (5,0)], 1:[(3,1)], 2:[(2,2)], 3:[(4,3)]})))
     [(5, 0), (4, 3), (3, 1), (2, 2), (1, 0)]
 
-    >>> organize_straight({0:[(7,0), (5,0)], 1:[(8,1)], 2:[(9,2)], 3:[(6,3)]})
+    >>> cards_to_tuples(organize_straight(hand_from_dict({0:[(7,0), (5,0)], 1:[(8,1)], 2:[(9,2)], 3:[(6,3)]})))
     [(9, 2), (8, 1), (7, 0), (6, 3), (5, 0)]
     '''
     card_list = create_card_list(hand)
 
-    card_list.sort(reverse=True)
+    card_list.sort(key=poker_functions.card_rank, reverse=True)
 
     return card_list
 
-def organize_flush(hand:dict) -> list:
+def organize_flush(hand:int) -> list:
     '''
     Organize list of cards from largest rank to smallest rank
 
     Parameters:
-        hand: a dictionary of cards sorted by suit
+        hand: integer holding one bit for each card in the hand
 
     Returns:
-        organized_card_list: organized list of tuples
+        organized_card_list: organized list of card integers
 
     Examples/Doctests:
-    >>> organize_straight({0:[(10,0), (9,0), (1,0), (7,0), (12,0)], 1:[], 2:[], 3:[]})
+    >>> cards_to_tuples(organize_straight(hand_from_dict({0:[(10,0), (9,0), (1,0), (7,0), (12,0)], 1:[], 2:[], 3:[]})))
     [(12, 0), (10, 0), (9, 0), (7, 0), (1, 0)]
 
-    >>> organize_straight({0:[], 1:[(10,1), (9,1), (1,1), (7,1), (12,1)], 2:[], 3:[]})
+    >>> cards_to_tuples(organize_straight(hand_from_dict({0:[], 1:[(10,1), (9,1), (1,1), (7,1), (12,1)], 2:[], 3:[]})))
     [(12, 1), (10, 1), (9, 1), (7, 1), (1, 1)]
 
-    >>> organize_straight({0:[], 1:[], 2:[], 3:[(10,3), (9,3), (1,3), (7,3), (12,3)]})
+    >>> cards_to_tuples(organize_straight(hand_from_dict({0:[], 1:[], 2:[], 3:[(10,3), (9,3), (1,3), (7,3), (12,3)]})))
     [(12, 3), (10, 3), (9, 3), (7, 3), (1, 3)]
     '''
     return organize_straight(hand)
 
-def organize_full_house(hand:dict) -> list:
+def organize_full_house(hand:int) -> list:
     '''
     Organize list of cards from largest rank to smallest rank
 
     Parameters:
-        hand: a dictionary of cards sorted by suit
+        hand: integer holding one bit for each card in the hand
 
     Returns:
-        organized_card_list: organized list of tuples
+        organized_card_list: organized list of card integers
 
     Examples/Doctests:
-    >>> organize_straight({0:[(10,0), (9,0), (1,0), (7,0), (12,0)], 1:[], 2:[], 3:[]})
+    >>> cards_to_tuples(organize_straight(hand_from_dict({0:[(10,0), (9,0), (1,0), (7,0), (12,0)], 1:[], 2:[], 3:[]})))
     [(12, 0), (10, 0), (9, 0), (7, 0), (1, 0)]
 
-    >>> organize_straight({0:[], 1:[(10,1), (9,1), (1,1), (7,1), (12,1)], 2:[], 3:[]})
+    >>> cards_to_tuples(organize_straight(hand_from_dict({0:[], 1:[(10,1), (9,1), (1,1), (7,1), (12,1)], 2:[], 3:[]})))
     [(12, 1), (10, 1), (9, 1), (7, 1), (1, 1)]
 
-    >>> organize_straight({0:[], 1:[], 2:[], 3:[(10,3), (9,3), (1,3), (7,3), (12,3)]})
+    >>> cards_to_tuples(organize_straight(hand_from_dict({0:[], 1:[], 2:[], 3:[(10,3), (9,3), (1,3), (7,3), (12,3)]})))
     [(12, 3), (10, 3), (9, 3), (7, 3), (1, 3)]
     '''
     pair_list = organize_n_of_a_kind(hand, 2)
     three_of_a_kind_list = organize_n_of_a_kind(hand, 3)
 
-    pair_rank = pair_list[0][0]
-    three_of_a_kind_rank = three_of_a_kind_list[0][0]
+    pair_rank = poker_functions.card_rank(pair_list[0])
+    three_of_a_kind_rank = poker_functions.card_rank(three_of_a_kind_list[0])
 
     #Return the pair version of the list or the three of a kin version of the list depending on which rank is larger
     return three_of_a_kind_list if three_of_a_kind_rank > pair_rank else pair_list
 
-def organize_four_of_a_kind(hand:dict) -> list:
+def organize_four_of_a_kind(hand:int) -> list:
     '''
     Organize list of cards so that a pair takes index 0-3
 
     Parameters:
-        hand: a dictionary of cards sorted by suit
+        hand: integer holding one bit for each card in the hand
 
     Returns:
-        organized_card_list: organized list of tuples
+        organized_card_list: organized list of card integers
     
     Examples/Doctests:
-    >>> organize_four_of_a_kind({0:[(13,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(13,3)]})
+    >>> cards_to_tuples(organize_four_of_a_kind(hand_from_dict({0:[(13,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(13,3)]})))
     [(13, 0), (13, 1), (13, 2), (13, 3), (5, 0)]
 
-    >>> organize_four_of_a_kind({0:[(5,0), (5,0)], 1:[(5,1)], 2:[(13,2)], 3:[(5,3)]})
-    [(5, 0), (5, 0), (5, 1), (5, 3), (13, 2)]
+    >>> cards_to_tuples(organize_four_of_a_kind(hand_from_dict({0:[(5,0)], 1:[(5,1)], 2:[(5,2), (13,2)], 3:[(5,3)]})))
+    [(5, 0), (5, 1), (5, 2), (5, 3), (13, 2)]
 
-    >>> organize_four_of_a_kind({0:[(12,0), (5,0)], 1:[(12,1)], 2:[(12,2)], 3:[(12,3)]})
+    >>> cards_to_tuples(organize_four_of_a_kind(hand_from_dict({0:[(12,0), (5,0)], 1:[(12,1)], 2:[(12,2)], 3:[(12,3)]})))
     [(12, 0), (12, 1), (12, 2), (12, 3), (5, 0)]
 
     '''
     return organize_n_of_a_kind(hand, 4)
 
-def organize_straight_flush(hand:dict) -> list:
+def organize_straight_flush(hand:int) -> list:
     '''
     Organize list of cards from largest rank to smallest rank
 
     Parameters:
-        hand: a dictionary of cards sorted by suit
+        hand: integer holding one bit for each card in the hand
 
     Returns:
-        organized_card_list: organized list of tuples
+        organized_card_list: organized list of card integers
 
     Examples/Doctests:
-    >>> organize_straight_flush({0:[(10,0), (9,0), (8,0), (7,0), (11,0)], 1:[], 2:[], 3:[]})
+    >>> cards_to_tuples(organize_straight_flush(hand_from_dict({0:[(10,0), (9,0), (8,0), (7,0), (11,0)], 1:[], 2:[], 3:[]})))
     [(11, 0), (10, 0), (9, 0), (8, 0), (7, 0)]
 
-    >>> organize_straight_flush({0:[], 1:[(10,1), (9,1), (11,1), (13,1), (12,1)], 2:[], 3:[]})
+    >>> cards_to_tuples(organize_straight_flush(hand_from_dict({0:[], 1:[(10,1), (9,1), (11,1), (13,1), (12,1)], 2:[], 3:[]})))
     [(13, 1), (12, 1), (11, 1), (10, 1), (9, 1)]
 
-    >>> organize_straight_flush({0:[], 1:[], 2:[], 3:[(3,3), (4,3), (5,3), (7,3), (6,3)]})
+    >>> cards_to_tuples(organize_straight_flush(hand_from_dict({0:[], 1:[], 2:[], 3:[(3,3), (4,3), (5,3), (7,3), (6,3)]})))
     [(7, 3), (6, 3), (5, 3), (4, 3), (3, 3)]
     '''
     return organize_straight(hand)
 
-def organize_n_of_a_kind(hand:dict, n_of_a_kind:int) -> list:
+def organize_n_of_a_kind(hand:int, n_of_a_kind:int) -> list:
     '''
     Organize list of cards so that a pair takes index 0-n
 
     Parameters:
-        hand: a dictionary of cards sorted by suit
+        hand: integer holding one bit for each card in the hand
 
     Returns:
-        organized_card_list: organized list of tuples
+        organized_card_list: organized list of card integers
     
     Examples/Doctests:
-    >>> organize_n_of_a_kind({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(6,3)]}, 2)
+    >>> cards_to_tuples(organize_n_of_a_kind(hand_from_dict({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(6,3)]}), 2))
     [(13, 1), (13, 2), (2, 0), (5, 0), (6, 3)]
 
-    >>> organize_n_of_a_kind({0:[(2,0), (5,0)], 1:[(5,1)], 2:[(13,2)], 3:[(5,3)]}, 3)
+    >>> cards_to_tuples(organize_n_of_a_kind(hand_from_dict({0:[(2,0), (5,0)], 1:[(5,1)], 2:[(13,2)], 3:[(5,3)]}), 3))
     [(5, 0), (5, 1), (5, 3), (2, 0), (13, 2)]
 
-    >>> organize_n_of_a_kind({0:[(12,0), (5,0)], 1:[(12,1)], 2:[(12,2)], 3:[(12,3)]}, 4)
+    >>> cards_to_tuples(organize_n_of_a_kind(hand_from_dict({0:[(12,0), (5,0)], 1:[(12,1)], 2:[(12,2)], 3:[(12,3)]}), 4))
     [(12, 0), (12, 1), (12, 2), (12, 3), (5, 0)]
 
     '''
@@ -407,7 +548,7 @@ def organize_n_of_a_kind(hand:dict, n_of_a_kind:int) -> list:
     not_of_a_kind_list = list()
 
     for card in card_list:
-        card_rank = card[0]
+        card_rank = poker_functions.card_rank(card)
         if card_rank == n_rank:
             of_a_kind_list.append(card)
             continue
@@ -415,9 +556,3 @@ def organize_n_of_a_kind(hand:dict, n_of_a_kind:int) -> list:
         not_of_a_kind_list.append(card)
 
     return of_a_kind_list + not_of_a_kind_list
-
-
-
-    
-
-
@@ -0,0 +1,209 @@
+import math
+import time
+
+import poker_functions
+import poker_game
+import bot_functions
+import simulation
+
+############################### Stage Timers ###################################
+#Each stage keeps a call counter, a cumulative time and a histogram of call
+#  times. The histogram has 8 buckets per doubling of the time, so a bucket
+#  is at most 12.5% wide. A percentile is read back as the geometric middle
+#  of its bucket, within about 6% of the true time, without keeping every sample
+class StageTimer:
+    '''
+    Counters and cumulative time for one stage of a round
+
+    name:    name of the stage
+    count:   number of calls timed
+    total:   cumulative time of every call, in nanoseconds
+    buckets: dictionary of histogram bucket -> number of calls
+
+    Examples/Doctests:
+    >>> timer = StageTimer('deal_hands')
+    >>> for nanoseconds in [1000] * 90 + [5000] * 9 + [40000]:
+    ...     timer.add(nanoseconds)
+    >>> timer.count, timer.total
+    (100, 175000)
+    >>> timer.percentile(0.50), timer.percentile(0.95), timer.percentile(0.99), timer.percentile(1.0)
+    (991, 4857, 4857, 38858)
+    '''
+    __slots__ = ('name', 'count', 'total', 'buckets')
+
+    def __init__(self, name:str) -> None:
+        '''
+        Parameters:
+            name: name of the stage
+        '''
+        self.name    = name
+        self.count   = 0
+        self.total   = 0
+        self.buckets = dict()
+
+    def add(self, nanoseconds:int) -> None:
+        '''
+        Count one call that took nanoseconds
+        '''
+        self.count += 1
+        self.total += nanoseconds
+
+        #Bucket on the bit length and the 3 bits after the leading bit
+        length = nanoseconds.bit_length()
+        bucket = nanoseconds if length < 4 else length << 3 | nanoseconds >> (length - 4) & 7
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, fraction:float) -> int:
+        '''
+        Find the time that fraction of the calls finished within
+
+        Parameters:
+            fraction: 0.5 for p50, 0.99 for p99
+
+        Returns:
+            nanoseconds: geometric middle of the histogram bucket holding the
+                percentile, exact below 16 nanoseconds where a bucket is one value
+        '''
+        needed = fraction * self.count
+        seen   = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= needed:
+                break
+
+        if bucket < 8:
+            return bucket
+
+        shift = (bucket >> 3) - 4
+        lower = (8 | bucket & 7) << shift
+        if shift == 0:
+            return lower
+
+        return round(math.sqrt(lower * (lower + (1 << shift))))
+
+#stage name -> StageTimer
+stages = dict()
+
+############################### Opt-in Switch ##################################
+#(owner, function name, stage name) of every timed call. Nested stages are
+#  timed on their own as well as inside the stage that calls them
+timed_calls = (
+    (poker_functions.Deck, 'reset',                  'create_deck'),
+    (poker_functions.Deck, 'shuffle',                'shuffle'),
+    (poker_functions,      'deal_hands',             'deal_hands'),
+    (bot_functions,        'calculate_keep',         'calculate_keep'),
+    (bot_functions,        'calculate_optimal_keep', 'calculate_keep'),
+    (poker_functions,      'compare_hands',          'compare_hands'),
+    (poker_functions,      'showdown',               'showdown'),
+    (simulation,           'play_round',             'round'),
+)
+
+#(function name, stage name) of the timed calls made from the game module
+game_calls = (
+    ('modify_bot_hand', 'modify_bot_hand'),
+    ('modify_hand',     'modify_hand'),
+)
+
+#(owner, function name) -> original function while timing is enabled
+original_functions = dict()
+
+#strategy name -> original strategy of the registry entries replaced while timing is enabled
+original_strategies = dict()
+
+def timed(function, timer:StageTimer):
+    '''
+    Wrap a function so every call is added to timer
+    '''
+    perf_counter_ns = time.perf_counter_ns
+
+    def timed_function(*arguments, **keyword_arguments):
+        start = perf_counter_ns()
+        try:
+            return function(*arguments, **keyword_arguments)
+        finally:
+            timer.add(perf_counter_ns() - start)
+
+    return timed_function
+
+def enable(game = poker_game) -> None:
+    '''
+    Start timing every stage in timed_calls and game_calls. Nothing is timed,
+        and nothing costs extra, until this is called
+
+    Parameters:
+        game: module holding the game loop, poker_game.py passes its own
+            __main__ module when it is run as a script
+
+    Examples/Doctests:
+    >>> enable()
+    >>> deck = poker_functions.Deck(1)
+    >>> winner = simulation.play_round(deck)
+    >>> disable()
+    >>> [stages[name].count for name in ['create_deck', 'shuffle', 'deal_hands', 'calculate_keep', 'modify_hand', 'round']]
+    [1, 1, 1, 1, 1, 1]
+    >>> bot_functions.get_strategy('strategic') is bot_functions.calculate_keep
+    True
+    >>> reset()
+    '''
+    disable()
+
+    calls = timed_calls + tuple((game, name, stage_name) for name, stage_name in game_calls)
+
+    for owner, name, stage_name in calls:
+        timer = stages.setdefault(stage_name, StageTimer(stage_name))
+        original_functions[(owner, name)] = getattr(owner, name)
+        setattr(owner, name, timed(original_functions[(owner, name)], timer))
+
+    #Strategies picked by name come from the registry, so time those entries too
+    for name, function in bot_functions.strategies.items():
+        function_name = getattr(function, '__name__', None)
+        if original_functions.get((bot_functions, function_name)) is function:
+            original_strategies[name]      = function
+            bot_functions.strategies[name] = getattr(bot_functions, function_name)
+
+def disable() -> None:
+    '''
+    Stop timing and put the original functions back, the stage timers are kept
+    '''
+    for (owner, name), function in original_functions.items():
+        setattr(owner, name, function)
+
+    original_functions.clear()
+
+    bot_functions.strategies.update(original_strategies)
+    original_strategies.clear()
+
+def reset() -> None:
+    '''
+    Forget every stage timer
+    '''
+    stages.clear()
+
+def format_report() -> list:
+    '''
+    Create the lines of a table with the calls, total time, mean and
+        p50/p95/p99 of every stage that was called. The percentiles are the
+        geometric middles of histogram buckets, see StageTimer
+
+    Returns:
+        lines: list of strings
+    '''
+    lines = ['{:<16}{:>10}{:>12}{:>10}{:>10}{:>10}{:>10}'.format('stage', 'calls', 'total ms', 'mean us', 'p50 us', 'p95 us', 'p99 us')]
+    for name, timer in stages.items():
+        if timer.count == 0:
+            continue
+
+        lines.append('{:<16}{:>10}{:>12.1f}{:>10.2f}{:>10.2f}{:>10.2f}{:>10.2f}'.format(
+            name, timer.count, timer.total / 1e6, timer.total / timer.count / 1e3,
+            timer.percentile(0.50) / 1e3, timer.percentile(0.95) / 1e3, timer.percentile(0.99) / 1e3))
+
+    lines.append('p50/p95/p99: middle of an 8 per doubling histogram bucket, within about 6%')
+
+    return lines
+
+def print_report() -> None:
+    '''
+    Display the stage timing table
+    '''
+    for line in format_report():
+        print(line)
@@ -0,0 +1,215 @@
+from fractions import Fraction
+from math import comb
+from typing import NamedTuple
+
+import numpy as np
+
+import poker_functions
+import hand_isomorphism
+import table_cache
+
+############################### Percentile Index ###############################
+#For every five card hand the index holds how many of the C(47, 5) hands an
+#  opponent could hold from the other 47 cards are weaker and how many are
+#  just as strong, by full strength with every kicker. The index is built
+#  once per isomorphism class: a class shares its counts, since changing the
+#  suits of both hands the same way changes neither strength
+#
+#An opponent hand that is not a flush is valued by its ranks alone, so the
+#  opponent hands are counted per rank class (the 6175 ways to hold 5 ranks):
+#  the number of live hands of a rank class is the product over its ranks of
+#  C(live cards of the rank, cards of the rank held). Five different ranks in
+#  one suit are a flush instead, they are counted per suit from the ranks
+#  still live in that suit
+
+#Opponent hands once five cards are known
+OPPONENT_HANDS = comb(47, 5)
+
+#Canonical hands scored together while building the index
+BUILD_BATCH = 512
+
+def rank_classes() -> tuple:
+    '''
+    List every rank class of five cards with its strength, and the flush
+        strength of the classes of five different ranks
+
+    Returns:
+        rank_counts: (6175, 13) array, cards of each rank held by the class
+
+        strengths: (6175,) array, strength of the class when it is not a flush
+
+        rank_bits: (1287,) array, the 13 rank bits of each class of five
+            different ranks, in the order those classes appear in rank_counts
+
+        flush_strengths: (1287,) array, strength of those ranks as a flush
+    '''
+    rank_counts = []
+    strengths   = []
+    for rank_count_bits, strength in poker_functions.strength_table.items():
+        rank_list = [rank_count_bits >> (4 * index) & 0xF for index in range(13)]
+        if sum(rank_list) == 5:
+            rank_counts.append(rank_list)
+            strengths.append(strength)
+
+    rank_bits       = [sum(1 << index for index in range(13) if rank_list[index]) for rank_list in rank_counts if max(rank_list) == 1]
+    flush_strengths = [poker_functions.flush_table[bits] for bits in rank_bits]
+
+    return (np.array(rank_counts, dtype=np.int64), np.array(strengths, dtype=np.int64),
+            np.array(rank_bits, dtype=np.int64), np.array(flush_strengths, dtype=np.int64))
+
+def opponent_counts(hands:list, classes:tuple = None) -> tuple:
+    '''
+    Count the opponent hands weaker than and as strong as each hand
+
+    Parameters:
+        hands: list of hand integers, five cards each
+
+        classes: tuple from rank_classes, worked out here when not given
+
+    Returns:
+        below: (N,) array of opponent hands each hand beats
+
+        equal: (N,) array of opponent hands each hand ties with
+
+    Examples/Doctests:
+    >>> #The lowest hand beats nothing and ties with the same ranks in other suits
+    >>> import hand_organization
+    >>> lowest = hand_organization.hand_from_dict({0:[(1,0), (2,0), (3,0), (4,0)], 1:[(6,1)], 2:[], 3:[]})
+    >>> below, equal = opponent_counts([lowest])
+    >>> int(below[0]), int(equal[0])
+    (0, 241)
+    '''
+    rank_counts, strengths, rank_bits, flush_strengths = rank_classes() if classes is None else classes
+
+    held  = np.array(hands, dtype=np.uint64)
+    suits = np.stack([(held >> np.uint64(13 * suit)).astype(np.int64) & poker_functions.suit_mask for suit in range(4)], axis=1)
+    live  = 4 - sum((suits[:, [suit]] >> np.arange(13)) & 1 for suit in range(4))
+
+    #Live hands of every rank class: product over the ranks of C(live, held)
+    choose = np.array([[comb(live_cards, taken) for taken in range(5)] for live_cards in range(5)], dtype=np.int64)
+    counts = np.ones((len(hands), len(strengths)), dtype=np.int64)
+    for rank in range(13):
+        counts *= choose[live[:, [rank]], rank_counts[None, :, rank]]
+
+    #Each suit still holding all five ranks of a class turns one of its hands into a flush
+    flushes = sum(((suits[:, [suit]] & rank_bits) == 0).astype(np.int64) for suit in range(4))
+    distinct = rank_counts.max(axis=1) == 1
+    counts[:, distinct] -= flushes
+
+    hand_strengths = np.array([poker_functions.hand_strength(hand) for hand in hands], dtype=np.int64)[:, None]
+
+    below = (counts * (strengths < hand_strengths)).sum(axis=1) + (flushes * (flush_strengths < hand_strengths)).sum(axis=1)
+    equal = (counts * (strengths == hand_strengths)).sum(axis=1) + (flushes * (flush_strengths == hand_strengths)).sum(axis=1)
+
+    return below, equal
+
+def build_percentile_index() -> list:
+    '''
+    Count the opponent hands weaker than and as strong as the canonical hand
+        of every isomorphism class, a minute or two
+
+    Returns:
+        percentile_index: list of 2 values per class id, the hands beaten then the hands tied
+    '''
+    canonical_hands  = hand_isomorphism.canonical_hands(5)
+    classes          = rank_classes()
+    percentile_index = np.zeros((len(canonical_hands), 2), dtype=np.int64)
+
+    for start in range(0, len(canonical_hands), BUILD_BATCH):
+        below, equal = opponent_counts(canonical_hands[start:start + BUILD_BATCH], classes)
+        percentile_index[start:start + BUILD_BATCH, 0] = below
+        percentile_index[start:start + BUILD_BATCH, 1] = equal
+
+    return percentile_index.ravel().tolist()
+
+percentile_index = None
+
+def get_percentile_index(build:bool = True) -> memoryview:
+    '''
+    Return the percentile index. The first call opens it from the table
+        cache, building it when the cache does not hold it yet
+
+    Parameters:
+        build: when False the index is never built, a minute or two, and
+            None is returned while the cache does not hold it. Run
+            table_cache.py to build every table ahead of time
+
+    Returns:
+        percentile_index: memoryview, see build_percentile_index
+    '''
+    global percentile_index
+
+    if percentile_index is None:
+        sources = [__file__, poker_functions.__file__, hand_isomorphism.__file__]
+        if build:
+            percentile_index = table_cache.cached_table('percentile_index', 'I', build_percentile_index, sources=sources)
+        else:
+            percentile_index = table_cache.open_cached_table('percentile_index', 'I', sources=sources)
+
+    return percentile_index
+
+################################## Lookup API ##################################
+class HandPercentile(NamedTuple):
+    '''
+    Share of the hands a random opponent could hold that a hand beats, ties
+        with and loses to
+
+    beats: Fraction
+    ties:  Fraction
+    loses: Fraction
+    '''
+    beats: Fraction
+    ties:  Fraction
+    loses: Fraction
+
+def hand_percentile(hand:int) -> HandPercentile:
+    '''
+    Look up how a hand fares against every hand an opponent could hold from
+        the other 47 cards
+
+    Parameters:
+        hand: integer holding one bit for each card in the hand
+
+    Returns:
+        percentile: HandPercentile
+
+    Examples/Doctests:
+    >>> import hand_organization
+    >>> pair = hand_organization.hand_from_dict({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(6,3)]})
+    >>> percentile = hand_percentile(pair)
+    >>> round(float(percentile.beats), 4), percentile.beats + percentile.ties + percentile.loses
+    (0.9158, Fraction(1, 1))
+    >>> hand_percentile(pair) == hand_percentile(hand_isomorphism.canonical_hand(pair))
+    True
+    '''
+    index = 2 * hand_isomorphism.class_id(hand)
+    below = get_percentile_index()[index]
+    equal = get_percentile_index()[index + 1]
+
+    return HandPercentile(Fraction(below, OPPONENT_HANDS), Fraction(equal, OPPONENT_HANDS),
+                          Fraction(OPPONENT_HANDS - below - equal, OPPONENT_HANDS))
+
+def hand_equity(hand:int) -> float:
+    '''
+    Share of a pot a hand would take if it was shown down against a random
+        opponent hand right now, a tie counting as half
+
+    Examples/Doctests:
+    >>> import hand_organization
+    >>> hand_equity(hand_organization.hand_from_dict({0:[(1,0), (2,0), (3,0), (4,0), (5,0)], 1:[], 2:[], 3:[]})) > 0.999
+    True
+    '''
+    percentile = hand_percentile(hand)
+
+    return float(percentile.beats + percentile.ties / 2)
+
+def format_hand_hint(hand:int) -> str:
+    '''
+    Create the hint shown to a player about the strength of their hand
+
+    Examples/Doctests:
+    >>> import hand_organization
+    >>> format_hand_hint(hand_organization.hand_from_dict({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(6,3)]}))
+    'Hint: this hand beats 91.6% of the hands an opponent could hold'
+    '''
+    return 'Hint: this hand beats {:.1%} of the hands an opponent could hold'.format(float(hand_percentile(hand).beats))
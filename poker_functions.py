@@ -1,8 +1,9 @@
 import hand_organization
+import random
+import table_cache
+from typing import NamedTuple
 
 ############################## Deck Functions #################################
-deck = list()
-
 suits = {
     0: 'H',
     1: 'D',
@@ -13,34 +14,212 @@ suits = {
 #A-K -> 1-13
 ranks = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13)
 
+#Cards are the integers 0-51: card = suit * 13 + (rank - 1)
+#A hand is a single integer with bit number card set for every card it holds
+#   bits  0-12: hearts   A-K
+#   bits 13-25: diamonds A-K
+#   bits 26-38: clubs    A-K
+#   bits 39-51: spades   A-K
+suit_mask = 0x1FFF
+
+def card_rank(card:int) -> int:
+    '''
+    Return the rank (1-13) of a card
+
+    Examples/Doctests:
+    >>> card_rank(0), card_rank(12), card_rank(51)
+    (1, 13, 13)
+    '''
+    return card % 13 + 1
+
+def card_suit(card:int) -> int:
+    '''
+    Return the suit (0-3) of a card
+
+    Examples/Doctests:
+    >>> card_suit(0), card_suit(12), card_suit(51)
+    (0, 0, 3)
+    '''
+    return card // 13
+
+def suit_ranks(hand:int, suit:int) -> int:
+    '''
+    Return the ranks a hand holds in one suit as 13 bits (bit rank - 1)
+
+    Parameters:
+        hand: integer holding one bit for each card in the hand
+
+        suit: integer 0-3
+
+    Returns:
+        rank_bits: integer 0-8191
+
+    Examples/Doctests:
+    >>> bin(suit_ranks(1 << 13 | 1 << 17 | 1 << 51, 1))
+    '0b10001'
+    '''
+    return hand >> (13 * suit) & suit_mask
+
+class Deck:
+    '''
+    A deck of 52 cards with its own random number generator so several games
+        can run side by side without sharing any state
+
+    The card list always holds all 52 cards. Cards are dealt from the end of
+        the list and size marks where the undealt cards stop, so dealing is
+        O(1) and reset() puts every card back without building a new list
+
+    Examples/Doctests:
+    >>> deck = Deck(seed=7)
+    >>> len(deck)
+    52
+    >>> deck.shuffle()
+    >>> first_card = deck.deal()
+    >>> len(deck)
+    51
+    >>> deck.reset()
+    >>> len(deck), sorted(deck.cards) == sorted(Deck().cards)
+    (52, True)
+    >>> other_deck = Deck(seed=7)
+    >>> other_deck.shuffle()
+    >>> other_deck.deal() == first_card
+    True
+    '''
+
+    def __init__(self, seed=None) -> None:
+        '''
+        Using the suits dictionary and the ranks tuple create a
+            single list of 52 cards
+
+        Parameters:
+            seed: optional value for the deck's random number generator
+        '''
+        self.random = random.Random(seed)
+        self.cards  = [suit * 13 + rank - 1 for suit in suits.keys() for rank in ranks]
+        self.size   = len(self.cards)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def reset(self) -> None:
+        '''
+        Return every dealt card to the deck
+        '''
+        self.size = len(self.cards)
+
+    def mark(self) -> int:
+        '''
+        Remember the current position of the deck, see rewind
+
+        Returns:
+            position: number of undealt cards
+        '''
+        return self.size
+
+    def rewind(self, position:int) -> None:
+        '''
+        Put back every card dealt since mark returned position. Dealing never
+            moves the cards, so the same cards are dealt again in the same
+            order, which lets one deal be played out several ways
+
+        Parameters:
+            position: value returned by mark, no shuffle may happen in between
+
+        Examples/Doctests:
+        >>> deck = Deck(seed=5)
+        >>> deck.shuffle()
+        >>> position = deck.mark()
+        >>> cards = [deck.deal(), deck.deal()]
+        >>> deck.rewind(position)
+        >>> [deck.deal(), deck.deal()] == cards
+        True
+        >>> deck.rewind(53)
+        Traceback (most recent call last):
+        ...
+        ValueError: cannot rewind a deck of 50 undealt cards to 53
+        '''
+        if not self.size <= position <= len(self.cards):
+            raise ValueError('cannot rewind a deck of {} undealt cards to {}'.format(self.size, position))
+
+        self.size = position
+
+    def shuffle(self) -> None:
+        '''
+        Shuffle the undealt cards in place in linear time
+        '''
+        if self.size == len(self.cards):
+            self.random.shuffle(self.cards)
+            return
+
+        undealt_cards = self.cards[:self.size]
+        self.random.shuffle(undealt_cards)
+        self.cards[:self.size] = undealt_cards
+
+    def deal(self) -> int:
+        '''
+        Remove the top card of the deck and return the card
+
+        Returns:
+            card: integer 0-51
+        '''
+        if self.size == 0:
+            raise IndexError('deal from an empty deck')
+
+        self.size -= 1
+
+        return self.cards[self.size]
+
+    def return_cards(self, card_list:list) -> None:
+        '''
+        Put dealt cards back beneath the undealt cards, the way a dealer
+            uses the muck once the deck runs short. Shuffle afterwards to
+            mix them in
+
+        Parameters:
+            card_list: list of dealt card integers
+
+        Examples/Doctests:
+        >>> deck = Deck(seed=3)
+        >>> hands = deal_hands(10, deck)
+        >>> len(deck)
+        2
+        >>> deck.return_cards(hand_organization.create_card_list(hands[0]))
+        >>> len(deck), sorted(deck.cards) == list(range(52))
+        (7, True)
+        >>> set(deck.cards[:5]) == set(hand_organization.create_card_list(hands[0]))
+        True
+        '''
+        returned    = set(card_list)
+        still_dealt = [card for card in self.cards[self.size:] if card not in returned]
+
+        self.cards = list(card_list) + self.cards[:self.size] + still_dealt
+        self.size += len(card_list)
+
+#Deck used whenever a function is not handed a deck of its own
+default_deck = Deck()
+
 def create_deck() -> None:
     '''
-    Using the suits dictionary and the ranks tuple create a
-        single list of 52 cards
+    Return all 52 cards to the default deck
     '''
-    
-    #Create an instance of a new list
-    global deck
-    deck = list()
-     
-    #For each suit in suits
-    for suit in suits.keys():
-        #For each rank in ranks
-        for rank in ranks:
-            #Create a card tuple and add to deck list
-            deck.append((rank, suit))
+    default_deck.reset()
 
-def print_card(card:tuple) -> None:
+def format_card(card:int) -> str:
     '''
-    Given the card tuple data structure (rank, suit), print 
-        out "{rank} of {suit}"
+    Given the card integer (suit * 13 + rank - 1), build the 
+        text "{rank} of {suit}"
 
     Parameters:
-        Card: (rank(int), suit(int)) tuple that represents one card
+        Card: integer 0-51 that represents one card
 
     Returns:
-        The funtion itself returns None, however the 
-            function print "{rank} of {suit}" to console    
+        card_text: str Ex. " K of S"
+
+    Examples/Doctests:
+    >>> format_card(51)
+    ' K of S'
+    >>> format_card(9)
+    '10 of H'
     '''
 
     faces = {
@@ -51,138 +230,205 @@ def print_card(card:tuple) -> None:
     }
     #if the integer is inside the faces dictionary then use the name in 
     #dictionary otherwise use the given number
-    rank = faces[card[0]] if card[0] in faces.keys() else card[0]
+    rank = card_rank(card)
+    rank = faces[rank] if rank in faces.keys() else rank
 
     #Use the suit associated with the given number
-    suit = suits[card[1]]
+    suit = suits[card_suit(card)]
 
-    print("{:>2} of {}".format(rank, suit))
+    return "{:>2} of {}".format(rank, suit)
 
-def shuffle() -> None:
-    '''
-    Remove all cards from deck into temp_deck, 1 randomly chosen card
-        at a time until the deck has no more cards and temp_deck holds
-        all the cards. Set deck to temp_deck
+def print_card(card:int) -> None:
     '''
-    import random
-
+    Given the card integer (suit * 13 + rank - 1), print 
+        out "{rank} of {suit}"
 
-    global deck
-    temp_deck = list()
+    Parameters:
+        Card: integer 0-51 that represents one card
 
-    while len(deck) > 0:
-        random_card_index = random.randint(0, len(deck)-1) #
-        temp_deck.append(deck[random_card_index][:])
-        deck.remove(deck[random_card_index])
+    Returns:
+        The funtion itself returns None, however the 
+            function print "{rank} of {suit}" to console    
+    '''
+    print(format_card(card))
 
-    deck = temp_deck[:]
+def shuffle() -> None:
+    '''
+    Shuffle the cards remaining in the default deck
+    '''
+    default_deck.shuffle()
 
-def deal() -> tuple:
+def deal() -> int:
     '''
-    Remove the top card of the global deck list and return the card
+    Remove the top card of the default deck and return the card
 
     Returns:
-        card: Tuple (rank, suit)
+        card: integer 0-51
     '''
-    global deck
-
-    card = deck.pop(0)
-
-    return card
+    return default_deck.deal()
 
 ############################### Hand Functions ##################################
-def deal_hands(number_of_hands:int) -> list:
+def deal_hands(number_of_hands:int, deck:Deck = None) -> list:
     '''
     Deal five cards by alternating dealing a single card to each hand
 
     Parameters:
         number_of_hands: integer
 
+        deck: Deck to deal from, the default deck when not given
+
     Returns:
-        hands: list of hand dictionaries
+        hands: list of hand integers
     '''
-    hands = list()
-    
-    #each player gets a hand data structure
-    for hand_count in range(0, number_of_hands):
-        
-        hand = { 0:[], 1:[], 2:[], 3:[]}
-        
-        hands.append(hand)
+    deck  = default_deck if deck is None else deck
+
+    #each player starts with an empty hand
+    hands = [0] * number_of_hands
 
     #deal cards around as if at a poker table
     cards_per_hand = 5
     for card_count in range(0, number_of_hands * cards_per_hand):
         
         hand_index   = card_count % number_of_hands
-        card         = deal()
-        suit_of_card = card[1]
+        card         = deck.deal()
 
-        hands[hand_index][suit_of_card].append(card)
+        hands[hand_index] |= 1 << card
 
     return hands
 
-def print_hand(hand:dict) -> None:
+def format_hand(hand:int) -> list:
     '''
-    Print cards from a new card list structure
+    Build one line of text per card from a new card list structure
 
     Parameters:
-        hand: a dictionary of cards sorted by suit
+        hand: integer holding one bit for each card in the hand
+
+    Returns:
+        hand_lines: list of str Ex. ["   C1:  K of S", ...]
+
+    Examples/Doctests:
+    >>> format_hand(hand_organization.hand_from_dict({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(6,3)]}))[:2]
+    ['   C1:  K of D', '   C2:  K of C']
     '''
     card_list = hand_organization.organize_hand(hand)
 
-    for index, card in enumerate(card_list):
-        print(f'   C{index + 1}:', end=" ")
-        print_card(card)
+    return [f'   C{index + 1}: ' + format_card(card) for index, card in enumerate(card_list)]
+
+def print_hand(hand:int) -> None:
+    '''
+    Print cards from a new card list structure
+
+    Parameters:
+        hand: integer holding one bit for each card in the hand
+    '''
+    for hand_line in format_hand(hand):
+        print(hand_line)
     
 ########################### Ranking ############################################
-def hand_ranks(hand:dict) -> list:
+def build_rank_spread() -> list:
+    '''
+    For every set of 13 rank bits build the rank count bitfield that set adds
+        to a hand, giving each rank its own 4 bits (bits 4 * (rank - 1))
+
+    Returns:
+        rank_spread: list of 8192 integers
+
+    Examples/Doctests:
+    >>> hex(build_rank_spread()[0b1000000000101])
+    '0x1000000000101'
+    '''
+    rank_spread = [0] * (suit_mask + 1)
+
+    for rank_bits in range(1, suit_mask + 1):
+        lowest_bit = rank_bits & -rank_bits
+        rank_spread[rank_bits] = rank_spread[rank_bits ^ lowest_bit] + (1 << 4 * (lowest_bit.bit_length() - 1))
+
+    return rank_spread
+
+rank_spread = build_rank_spread()
+
+def rank_counts(hand:int) -> int:
+    '''
+    Count how many of each rank is in a given hand as a bitfield holding 4 bits
+        per rank, rank r counted in bits 4 * (r - 1)
+
+    Parameters:
+        hand: integer holding one bit for each card in the hand
+
+    Returns:
+        rank_count_bits: integer
+
+    Examples/Doctests:
+    >>> hex(rank_counts(hand_organization.hand_from_dict({0:[(1,0),(2,0)], 1:[(1,1)], 2:[(1,2)], 3:[(1,3)]})))
+    '0x14'
+    '''
+    return (rank_spread[hand & suit_mask]
+            + rank_spread[hand >> 13 & suit_mask]
+            + rank_spread[hand >> 26 & suit_mask]
+            + rank_spread[hand >> 39])
+
+def suit_counts(hand:int) -> int:
+    '''
+    Count how many cards of each suit is in a given hand as a bitfield holding
+        4 bits per suit, suit s counted in bits 4 * s
+
+    Parameters:
+        hand: integer holding one bit for each card in the hand
+
+    Returns:
+        suit_count_bits: integer
+
+    Examples/Doctests:
+    >>> hex(suit_counts(hand_organization.hand_from_dict({0:[(1,0),(2,0)], 1:[(1,1)], 2:[(1,2)], 3:[(1,3)]})))
+    '0x1112'
+    '''
+    return ((hand & suit_mask).bit_count()
+            | (hand >> 13 & suit_mask).bit_count() << 4
+            | (hand >> 26 & suit_mask).bit_count() << 8
+            | (hand >> 39).bit_count() << 12)
+
+def hand_ranks(hand:int) -> list:
     '''
     create a list that holds how many of each rank is in a given hand
 
     Parameters:
-        hand: a dictionary of cards sorted by suit
+        hand: integer holding one bit for each card in the hand
 
     Returns:
         rank_list: list
 
     Examples/Doctests:
-    >>> hand_ranks({0:[(1,0),(2,0)], 1:[(1,1)], 2:[(1,2)], 3:[(1,3)]})
+    >>> hand_ranks(hand_organization.hand_from_dict({0:[(1,0),(2,0)], 1:[(1,1)], 2:[(1,2)], 3:[(1,3)]}))
     [4, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
 
-    >>> hand_ranks({ 0:[], 1:[(1,1), (2,1), (3,1), (4,1), (5,1)], 2:[], 3:[]})
+    >>> hand_ranks(hand_organization.hand_from_dict({ 0:[], 1:[(1,1), (2,1), (3,1), (4,1), (5,1)], 2:[], 3:[]}))
     [1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0]
 
-    >>> hand_ranks({0:[(1,1),(10,0)], 1:[(2,1)], 2:[(2,2)], 3:[(11,3)]})
+    >>> hand_ranks(hand_organization.hand_from_dict({0:[(1,1),(10,0)], 1:[(2,1)], 2:[(2,2)], 3:[(11,3)]}))
     [1, 2, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0]
 
     '''
-    rank_list = [0] * 13
-    card_list = hand_organization.create_card_list(hand)
-
-    for card in card_list:
-        rank = card[0]
-        rank_list[rank - 1] += 1
+    rank_count_bits = rank_counts(hand)
 
-    return rank_list
+    return [rank_count_bits >> (4 * index) & 0xF for index in range(13)]
 
-def straight_flush(hand:dict) -> int: #8 points
+def straight_flush(hand:int) -> int: #8 points
     '''
     Return points for a hand that has all cards of the same suit and 
         ranks are incrementing by 1
 
     Parameters:
-        hand: a dictionary of cards sorted by suit
+        hand: integer holding one bit for each card in the hand
 
     Returns:
         points: int
 
     Examples/Doctests:
-    >>> straight_flush({0:[(1,0), (2,0), (3,0), (4,0), (5,0)], 1:[], 2:[], 3:[]})
+    >>> straight_flush(hand_organization.hand_from_dict({0:[(1,0), (2,0), (3,0), (4,0), (5,0)], 1:[], 2:[], 3:[]}))
     8
-    >>> straight_flush({ 0:[], 1:[(1,1), (2,1), (3,1), (4,1), (5,1)], 2:[], 3:[]})
+    >>> straight_flush(hand_organization.hand_from_dict({ 0:[], 1:[(1,1), (2,1), (3,1), (4,1), (5,1)], 2:[], 3:[]}))
     8
-    >>> straight_flush({ 0:[], 1:[], 2:[], 3:[]})
+    >>> straight_flush(hand_organization.hand_from_dict({ 0:[], 1:[], 2:[], 3:[]}))
     0
     '''
     rank_list = hand_ranks(hand)
@@ -240,26 +486,26 @@ def full_house(rank_list:list) -> int: #6 points
 
     return 6 if one_pair_points != 0 and three_of_a_kind_points != 0 else 0
 
-def flush(hand:dict) -> int: #5 points
+def flush(hand:int) -> int: #5 points
     '''
     Return points for a hand that has all cards of the same suit
 
     Parameters:
-        hand: a dictionary of cards sorted by suit
+        hand: integer holding one bit for each card in the hand
 
     Returns:
         points: int
 
     Examples/Doctests:
-    >>> flush({0:[(1,0), (2,0), (3,0), (4,0), (5,0)], 1:[], 2:[], 3:[]})
+    >>> flush(hand_organization.hand_from_dict({0:[(1,0), (2,0), (3,0), (4,0), (5,0)], 1:[], 2:[], 3:[]}))
     5
-    >>> flush({ 0:[], 1:[(1,1), (2,1), (3,1), (4,1), (5,1)], 2:[], 3:[]})
+    >>> flush(hand_organization.hand_from_dict({ 0:[], 1:[(1,1), (2,1), (3,1), (4,1), (5,1)], 2:[], 3:[]}))
     5
-    >>> flush({ 0:[], 1:[], 2:[], 3:[]})
+    >>> flush(hand_organization.hand_from_dict({ 0:[], 1:[], 2:[], 3:[]}))
     0
     '''
-    for suit_list in hand.values():
-        if len(suit_list) == 5:
+    for suit in suits.keys():
+        if suit_ranks(hand, suit).bit_count() == 5:
             return 5
         
     return 0
@@ -401,57 +647,268 @@ def highest_card(rank_list:list) -> int:
             return index + 1
 
 ################################### Hand Scoring ###############################################
-def score_hand(hand:dict) -> int:
+def score_ranks(rank_list:list) -> int:
+    '''
+    Scores a rank list without looking at suits (no flush or straight flush)
+
+    Parameters:
+        rank_list: a list that holds how many of each rank is in a given hand
+
+    Returns:
+        score: an integer value represent the amount of points the ranks are worth
+
+    Examples/Doctests:
+    >>> score_ranks([4, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0])
+    7
+    >>> score_ranks([0, 0, 0, 2, 0, 0, 0, 0, 0, 0, 3, 0, 0])
+    6
+    >>> score_ranks([1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0])
+    4
+    >>> score_ranks([1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1])
+    0
+    '''
+    points = 0
+
+    points = points if one_pair(rank_list)        == 0 else 1
+    points = points if two_pair(rank_list)        == 0 else 2
+    points = points if three_of_a_kind(rank_list) == 0 else 3
+    points = points if straight(rank_list)        == 0 else 4
+    points = points if full_house(rank_list)      == 0 else 6
+    points = points if four_of_a_kind(rank_list)  == 0 else 7
+
+    return points
+
+def tiebreak_ranks(rank_list:list) -> list:
+    '''
+    List every rank in a hand in the order ties are broken: the ranks held the
+        most times come first and equal counts go from highest to lowest rank
+
+    Parameters:
+        rank_list: a list that holds how many of each rank is in a given hand
+
+    Returns:
+        tiebreak_list: list of ranks, one entry per card
+
+    Examples/Doctests:
+    >>> tiebreak_ranks([0, 3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2])
+    [2, 2, 2, 13, 13]
+    >>> tiebreak_ranks([1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 1])
+    [4, 4, 13, 9, 1]
+    >>> tiebreak_ranks([1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0])
+    [5, 4, 3, 2, 1]
+    '''
+    tiebreak_list = list()
+
+    for count in range(4, 0, -1):
+        for index in range(12, -1, -1):
+            if rank_list[index] == count:
+                tiebreak_list += [index + 1] * count
+
+    return tiebreak_list
+
+#Bits below the score that hold the five tiebreak ranks (4 bits per rank)
+strength_shift = 20
+
+def build_strength_tables() -> tuple:
+    '''
+    Work out the strength of every possible set of up to 5 ranks once so a hand
+        can be valued with a single lookup on its rank count bitfield
+
+    A strength is the score shifted above the tiebreak ranks, so any two hands
+        are compared with a single integer comparison and score = strength >> 20
+
+    Returns:
+        strength_table: dictionary of rank count bitfield -> strength when the hand is not a flush
+
+        flush_table: list indexed by the 13 rank bits of one suit -> strength when
+            those are 5 cards of that suit, 0 otherwise
+
+    Examples/Doctests:
+    >>> strength_table, flush_table = build_strength_tables()
+    >>> len(strength_table), len([strength for strength in flush_table if strength])
+    (8555, 1287)
+    >>> hex(strength_table[0x14]), hex(flush_table[0b11111])
+    ('0x711112', '0x854321')
+    '''
+    from itertools import combinations_with_replacement
+
+    strength_table = dict()
+    flush_table    = [0] * (suit_mask + 1)
+
+    for card_count in range(0, 6):
+        for rank_combination in combinations_with_replacement(ranks, card_count):
+            rank_list = [0] * 13
+            rank_count_bits = 0
+            rank_bits       = 0
+            for rank in rank_combination:
+                rank_list[rank - 1] += 1
+                rank_count_bits += 1 << 4 * (rank - 1)
+                rank_bits       |= 1 << (rank - 1)
+
+            #A deck only holds 4 cards of each rank
+            if card_count > 0 and max(rank_list) > 4:
+                continue
+
+            #Pack the tiebreak ranks from the highest nibble down
+            tiebreak = 0
+            for index, rank in enumerate(tiebreak_ranks(rank_list)):
+                tiebreak |= rank << (16 - 4 * index)
+
+            strength_table[rank_count_bits] = score_ranks(rank_list) << strength_shift | tiebreak
+
+            #Only 5 different ranks can be a flush
+            if card_count == 5 and max(rank_list) == 1:
+                score = 8 if straight(rank_list) != 0 else 5
+                flush_table[rank_bits] = score << strength_shift | tiebreak
+
+    return strength_table, flush_table
+
+def load_strength_tables() -> tuple:
+    '''
+    Read the strength tables from the table cache, building them and writing
+        them to the cache the first time. Every lookup needs the strength
+        table as a dictionary, so the file, about 200 KB, is read in whole
+        rather than mapped
+
+    Returns:
+        strength_table: dictionary, see build_strength_tables
+
+        flush_table: list, see build_strength_tables
+
+    Examples/Doctests:
+    >>> load_strength_tables() == build_strength_tables()
+    True
+    '''
+    #Cached as one flat list: the flush table, then the strength table keys, then its strengths
+    def build_values() -> list:
+        strength_table, flush_table = build_strength_tables()
+        return flush_table + list(strength_table.keys()) + list(strength_table.values())
+
+    values  = table_cache.cached_table('strength_tables', 'Q', build_values, sources=[__file__], mapped=False).tolist()
+    entries = (len(values) - suit_mask - 1) // 2
+
+    flush_table    = values[:suit_mask + 1]
+    strength_table = dict(zip(values[suit_mask + 1:suit_mask + 1 + entries], values[suit_mask + 1 + entries:]))
+
+    return strength_table, flush_table
+
+strength_table, flush_table = load_strength_tables()
+
+def strength_counts() -> dict:
+    '''
+    Count how many of the 2,598,960 possible five card hands have each strength,
+        worked out from the strength tables instead of dealing every hand
+
+    Returns:
+        counts: dictionary of strength -> number of hands with that strength
+
+    Examples/Doctests:
+    >>> counts = strength_counts()
+    >>> score_totals = [0] * 9
+    >>> for strength, count in counts.items():
+    ...     score_totals[strength >> strength_shift] += count
+    >>> score_totals
+    [1303560, 1098240, 123552, 54912, 9180, 5112, 3744, 624, 36]
+    '''
+    from math import comb
+
+    counts = dict()
+
+    for rank_count_bits, strength in strength_table.items():
+        rank_list = [rank_count_bits >> (4 * index) & 0xF for index in range(13)]
+        if sum(rank_list) != 5:
+            continue
+
+        #Every way of picking suits for the ranks held
+        suit_choices = 1
+        for rank_count in rank_list:
+            suit_choices *= comb(4, rank_count)
+
+        #Picking one suit for all 5 ranks is a flush and counted below
+        if max(rank_list) == 1:
+            suit_choices -= 4
+
+        counts[strength] = counts.get(strength, 0) + suit_choices
+
+    for strength in flush_table:
+        if strength:
+            counts[strength] = counts.get(strength, 0) + 4
+
+    return counts
+
+def hand_strength(hand:int) -> int:
+    '''
+    Find the strength of a hand: an integer where a larger value is always the
+        better hand and equal values are a true split
+
+    Parameters:
+        hand: integer holding one bit for each card in the hand
+
+    Returns:
+        strength: integer holding the score followed by every tiebreak rank
+
+    Examples/Doctests:
+    >>> hex(hand_strength(hand_organization.hand_from_dict({0:[(13,0), (5,0)], 1:[(13,1)], 2:[(2,2)], 3:[(6,3)]})))
+    '0x1dd652'
+    >>> kicker_five = hand_strength(hand_organization.hand_from_dict({0:[(13,0), (5,0)], 1:[(13,1)], 2:[(2,2)], 3:[(6,3)]}))
+    >>> kicker_four = hand_strength(hand_organization.hand_from_dict({0:[(13,0), (4,0)], 1:[(13,1)], 2:[(2,2)], 3:[(6,3)]}))
+    >>> kicker_five > kicker_four
+    True
+    >>> hand_strength(hand_organization.hand_from_dict({0:[(1,0), (2,0), (3,0), (4,0), (5,0)], 1:[], 2:[], 3:[]})) >> 20
+    8
+    '''
+    hearts   = hand       & suit_mask
+    diamonds = hand >> 13 & suit_mask
+    clubs    = hand >> 26 & suit_mask
+    spades   = hand >> 39
+
+    #At most one suit can hold 5 cards, every other suit looks up 0
+    flush_strength = flush_table[hearts] | flush_table[diamonds] | flush_table[clubs] | flush_table[spades]
+
+    if flush_strength:
+        return flush_strength
+
+    return strength_table[rank_spread[hearts] + rank_spread[diamonds] + rank_spread[clubs] + rank_spread[spades]]
+
+def score_hand(hand:int) -> int:
     '''
     Scores a given hand
 
     Parameters:
-        hand: a dictionary of cards sorted by suit
+        hand: integer holding one bit for each card in the hand
 
     Returns:
         score: an integer value represent the amount of points a hand is worth
 
-    >>> score_hand({0:[(1,0), (2,0), (3,0), (4,0), (5,0)], 1:[], 2:[], 3:[]})
+    >>> score_hand(hand_organization.hand_from_dict({0:[(1,0), (2,0), (3,0), (4,0), (5,0)], 1:[], 2:[], 3:[]}))
     8
 
-    >>> score_hand({0:[(1,0), (2,0)], 1:[(1,1)], 2:[(1,2)], 3:[(1,3)]})
+    >>> score_hand(hand_organization.hand_from_dict({0:[(1,0), (2,0)], 1:[(1,1)], 2:[(1,2)], 3:[(1,3)]}))
     7
 
-    >>> score_hand({0:[(5,0), (9,0)], 1:[(5,1), (9,1)], 2:[(5,2)], 3:[]})
+    >>> score_hand(hand_organization.hand_from_dict({0:[(5,0), (9,0)], 1:[(5,1), (9,1)], 2:[(5,2)], 3:[]}))
     6
 
-    >>> score_hand({0:[(1,0), (2,0), (3,0), (5,0), (11,0)], 1:[], 2:[], 3:[]})
+    >>> score_hand(hand_organization.hand_from_dict({0:[(1,0), (2,0), (3,0), (5,0), (11,0)], 1:[], 2:[], 3:[]}))
     5
      
-    >>> score_hand({0:[(1,0), (3,0)], 1:[(2,1)], 2:[(5,2)], 3:[(4,3)]})
+    >>> score_hand(hand_organization.hand_from_dict({0:[(1,0), (3,0)], 1:[(2,1)], 2:[(5,2)], 3:[(4,3)]}))
     4
       
-    >>> score_hand({0:[(1,0), (2,0)], 1:[(1,1)], 2:[(1,2)], 3:[(4,3)]})
+    >>> score_hand(hand_organization.hand_from_dict({0:[(1,0), (2,0)], 1:[(1,1)], 2:[(1,2)], 3:[(4,3)]}))
     3
        
-    >>> score_hand({0:[(1,0), (2,0)], 1:[(1,1), (2,1)], 2:[], 3:[(11,3)]})
+    >>> score_hand(hand_organization.hand_from_dict({0:[(1,0), (2,0)], 1:[(1,1), (2,1)], 2:[], 3:[(11,3)]}))
     2
         
-    >>> score_hand({0:[(1,0)], 1:[(1,1)], 2:[(11,2),(2,2)], 3:[(13,3)]})
+    >>> score_hand(hand_organization.hand_from_dict({0:[(1,0)], 1:[(1,1)], 2:[(11,2),(2,2)], 3:[(13,3)]}))
     1
          
-    >>> score_hand({0:[], 1:[], 2:[], 3:[]})
+    >>> score_hand(hand_organization.hand_from_dict({0:[], 1:[], 2:[], 3:[]}))
     0
 
     '''
-    points = 0
-
-    rank_list = hand_ranks(hand)
-    points = points if one_pair(rank_list)        == 0 else 1
-    points = points if two_pair(rank_list)        == 0 else 2
-    points = points if three_of_a_kind(rank_list) == 0 else 3
-    points = points if straight(rank_list)        == 0 else 4
-    points = points if flush(hand)                == 0 else 5
-    points = points if full_house(rank_list)      == 0 else 6
-    points = points if four_of_a_kind(rank_list)  == 0 else 7
-    points = points if straight_flush(hand)       == 0 else 8
-
-    return points
+    return hand_strength(hand) >> strength_shift
 
 def get_hand_type(hand_score) -> str:
     '''
@@ -476,64 +933,239 @@ def get_hand_type(hand_score) -> str:
 
     return score_to_type[hand_score]
 
-def compare_hands(hand_one:dict, hand_two:dict) -> str:
+################################### Showdown ###################################
+class Showdown(NamedTuple):
+    '''
+    Outcome of two hands meeting at showdown
+
+    winner:       ONE, TWO, SPLIT
+    strength_one: strength of hand one
+    strength_two: strength of hand two
+    score_one:    score (0-8) of hand one
+    score_two:    score (0-8) of hand two
+    '''
+    winner:       str
+    strength_one: int
+    strength_two: int
+    score_one:    int
+    score_two:    int
+
+def showdown(hand_one:int, hand_two:int) -> Showdown:
+    '''
+    Decide which of two hands wins without printing anything
+
+    Parameters:
+        hand_one: integer holding one bit for each card in the hand
+
+        hand_two: integer holding one bit for each card in the hand
+
+    Returns:
+        result: Showdown holding the winner along with the strength and score of each hand
+
+    Examples/Doctests:
+    >>> result = showdown(hand_organization.hand_from_dict({0:[(13,0), (5,0)], 1:[(13,1)], 2:[(2,2)], 3:[(6,3)]}),
+    ...                   hand_organization.hand_from_dict({0:[(13,2), (4,0)], 1:[(13,3)], 2:[(2,1)], 3:[(6,0)]}))
+    >>> result.winner, result.score_one, result.score_two
+    ('ONE', 1, 1)
+    >>> showdown(hand_organization.hand_from_dict({0:[(1,0), (2,0), (3,0), (4,0), (5,0)], 1:[], 2:[], 3:[]}),
+    ...          hand_organization.hand_from_dict({0:[], 1:[(1,1), (2,1), (3,1), (4,1), (5,1)], 2:[], 3:[]})).winner
+    'SPLIT'
+    '''
+    #Value each hand once, the score sits above the tiebreak ranks
+    strength_one = hand_strength(hand_one)
+    strength_two = hand_strength(hand_two)
+
+    if strength_one > strength_two:
+        winner = 'ONE'
+    elif strength_one < strength_two:
+        winner = 'TWO'
+    else:
+        winner = 'SPLIT'
+
+    return Showdown(winner, strength_one, strength_two,
+                    strength_one >> strength_shift, strength_two >> strength_shift)
+
+def format_showdown(result:Showdown) -> str:
+    '''
+    Build the line announcing the result of a showdown
+
+    Parameters:
+        result: Showdown returned by showdown()
+
+    Returns:
+        result_text: str Ex. HAND ONE WINS WITH: Flush
+
+    Examples/Doctests:
+    >>> format_showdown(Showdown('TWO', 0x512345, 0x400000, 5, 4))
+    'HAND TWO WINS WITH: Straight'
+    >>> #Both hands hold a pair, the kickers settle it
+    >>> format_showdown(Showdown('ONE', 0x1dd652, 0x1dd642, 1, 1))
+    'HAND ONE WINS WITH: One Pair'
+    '''
+    if result.winner == 'SPLIT':
+        return 'SPLIT POT'
+
+    winning_score = result.score_one if result.winner == 'ONE' else result.score_two
+
+    return 'HAND {} WINS WITH: {}'.format(result.winner, winning_hand_type(winning_score))
+
+def winning_hand_type(score:int) -> str:
+    '''
+    Name the category a showdown was won with. Both the two hand and the table
+        announcements name the winning category, also when the losing hands
+        hold the same category and the ranks settled it
+
+    Parameters:
+        score: score of the winning hand 0-8
+
+    Returns:
+        hand_type: str Ex. Flush, Highest Card for a score of 0
+
+    Examples/Doctests:
+    >>> winning_hand_type(0), winning_hand_type(5)
+    ('Highest Card', 'Flush')
+    '''
+    return get_hand_type(score) if score else 'Highest Card'
+
+class TableShowdown(NamedTuple):
+    '''
+    Outcome of any number of hands meeting at showdown
+
+    winners:   list of the seat indexes sharing the pot, more than one is a split pot
+    strengths: list of the strength of every seat
+    ranking:   list of every seat index from the strongest to the weakest hand
+    '''
+    winners:   list
+    strengths: list
+    ranking:   list
+
+def table_showdown(hands:list) -> TableShowdown:
+    '''
+    Decide which seats win without printing anything. Every hand is valued
+        once and the winners are found in a single pass over the strengths
+
+    Parameters:
+        hands: list of hand integers, one per seat
+
+    Returns:
+        result: TableShowdown
+
+    Examples/Doctests:
+    >>> straight_one = hand_organization.hand_from_dict({0:[(1,0), (2,0), (3,0), (4,0)], 1:[(5,1)], 2:[], 3:[]})
+    >>> straight_two = hand_organization.hand_from_dict({0:[(5,0)], 1:[(1,1), (2,1), (3,1), (4,1)], 2:[], 3:[]})
+    >>> one_pair     = hand_organization.hand_from_dict({0:[], 1:[], 2:[(13,2), (9,2), (7,2)], 3:[(13,3), (8,3)]})
+    >>> result = table_showdown([one_pair, straight_one, straight_two])
+    >>> result.winners, result.ranking
+    ([1, 2], [1, 2, 0])
+    >>> table_showdown([straight_one, one_pair]).winners
+    [0]
+    '''
+    strengths = [hand_strength(hand) for hand in hands]
+
+    best_strength = -1
+    winners       = list()
+    for seat, strength in enumerate(strengths):
+        if strength > best_strength:
+            best_strength = strength
+            winners       = [seat]
+        elif strength == best_strength:
+            winners.append(seat)
+
+    ranking = sorted(range(len(hands)), key=strengths.__getitem__, reverse=True)
+
+    return TableShowdown(winners, strengths, ranking)
+
+def format_table_showdown(result:TableShowdown) -> str:
+    '''
+    Build the line announcing the result of a table showdown, seats are
+        numbered from 1
+
+    Parameters:
+        result: TableShowdown returned by table_showdown()
+
+    Returns:
+        result_text: str Ex. SEAT 3 WINS WITH: Flush
+
+    Examples/Doctests:
+    >>> format_table_showdown(TableShowdown([2], [0x1dd652, 0x400000, 0x512345], [2, 1, 0]))
+    'SEAT 3 WINS WITH: Flush'
+    >>> format_table_showdown(TableShowdown([0, 2], [0x400000, 0x1dd652, 0x400000], [0, 2, 1]))
+    'SPLIT POT BETWEEN SEATS 1, 3 WITH: Straight'
+    >>> format_table_showdown(TableShowdown([0], [0x1dd652, 0x1dd642], [0, 1]))
+    'SEAT 1 WINS WITH: One Pair'
+    '''
+    hand_type = winning_hand_type(result.strengths[result.winners[0]] >> strength_shift)
+
+    if len(result.winners) > 1:
+        seats = ', '.join(str(seat + 1) for seat in result.winners)
+        return 'SPLIT POT BETWEEN SEATS {} WITH: {}'.format(seats, hand_type)
+
+    return 'SEAT {} WINS WITH: {}'.format(result.winners[0] + 1, hand_type)
+
+def format_compare_hands(hand_one:int, hand_two:int, result:Showdown) -> list:
+    '''
+    Build the lines showing hand one and two along with the result
+
+    Parameters:
+        hand_one: integer holding one bit for each card in the hand
+
+        hand_two: integer holding one bit for each card in the hand
+
+        result: Showdown of the two hands
+
+    Returns:
+        lines: list of str
+    '''
+    #Hand One
+    lines = ['YOUR HAND', '==============']
+    lines.extend(format_hand(hand_one))
+    lines.append('\n')
+
+    #Hand Two
+    lines.extend(['CPU HAND', '=============='])
+    lines.extend(format_hand(hand_two))
+    lines.append('\n')
+
+    lines.append(format_showdown(result))
+
+    return lines
+
+def compare_hands(hand_one:int, hand_two:int) -> str:
     '''
     Print content of hand one and two to the console along with the result
 
     Parameters:
-        hand_one: a dictionary of cards sorted by suit
+        hand_one: integer holding one bit for each card in the hand
 
-        hand_two: a dictionary of cards sorted by suit
+        hand_two: integer holding one bit for each card in the hand
 
     Returns:
         outcome_indicator: ONE, TWO, SPLIT
     '''
-    #Print Hand One
-    print('YOUR HAND')
-    print('==============')
-    print_hand(hand_one)
-    print('\n')
-
-    #Print Hand Two
-    print('CPU HAND')
-    print('==============')
-    print_hand(hand_two)
-    print('\n')
-
-    #Score each hand
-    score_one = score_hand(hand_one)
-    score_two = score_hand(hand_two)
-
-    #If one has a higher score hand one wins
-    if score_one > score_two:
-        print('HAND ONE WINS WITH: {}'.format(get_hand_type(score_one)))
-        return 'ONE'
-    
-    #If two has a higher score hand two wins
-    elif score_one < score_two:
-        print('HAND TWO WINS WITH: {}'.format(get_hand_type(score_two)))
-        return 'TWO'
-    
-    #Each hand has the same base score Ex. 0:0, 5:5, 4:4, 8:8
-    else:
-        #Find high card for hand one
-        high_rank_card_one = hand_organization.organize_hand(hand_one)[0]
+    result = showdown(hand_one, hand_two)
+    for line in format_compare_hands(hand_one, hand_two, result):
+        print(line)
 
-        #Find high card for hand two
-        high_rank_card_two = hand_organization.organize_hand(hand_two)[0]
+    return result.winner
 
-        #If one has the higher rank within their hand
-        if high_rank_card_one > high_rank_card_two:
-            print('HAND ONE WINS WITH: Highest Card')
-            return 'ONE'
-        
-        #If two has the higher rank within their hand
-        elif high_rank_card_one < high_rank_card_two:
-            print('HAND TWO WINS WITH: Highest Card')
-            return 'TWO'
-        
-        #If one and two have the same score and the same high ranking card
-        else:
-            print('SPLIT POT')
-            return 'SPLIT'
-    
\ No newline at end of file
+def compare_table_hands(hands:list) -> list:
+    '''
+    Print every seat's hand to the console along with the result, seat 1
+        is the player
+
+    Parameters:
+        hands: list of hand integers, one per seat
+
+    Returns:
+        winners: list of the seat indexes sharing the pot
+    '''
+    for seat, hand in enumerate(hands):
+        print('YOUR HAND' if seat == 0 else 'CPU {} HAND'.format(seat))
+        print('==============')
+        print_hand(hand)
+        print('\n')
+
+    result = table_showdown(hands)
+    print(format_table_showdown(result))
+
+    return result.winners
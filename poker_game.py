@@ -3,109 +3,257 @@ import hand_organization
 import bot_functions
 
 ####################################### Base Game ######################################
+def greeting_lines() -> list:
+    '''
+    Build the lines of text with the rules for game
+
+    Returns:
+        lines: list of str
+
+    Examples/Doctests:
+    >>> greeting_lines()[2:4]
+    [' 8:   Straight Flush', ' 7:   Four of a Kind']
+    '''
+    lines = ['Welcome to the Poker Championship', '=================================\n']
+    for point in range(8,0, -1):
+        lines.append('{:>2}:{:>17}'.format(point, poker_functions.get_hand_type(point)))
+
+    lines.append('\n*** King is the Highest Rank ***')
+    lines.append('================================')
+
+    return lines
+
 def greet_player() -> None:
     '''
     Display rules for game
     '''
-    print('Welcome to the Poker Championship')
-    print('=================================\n')
-    for point in range(8,0, -1):
-        print('{:>2}:{:>17}'.format(point, poker_functions.get_hand_type(point)))
+    for line in greeting_lines():
+        print(line)
 
-    print('\n*** King is the Highest Rank ***')
-    print('================================')
     input('press enter to continue...')
     print('--------------------------------')
 
-def start_new_game() -> list:
+def start_new_game(deck:poker_functions.Deck = None, number_of_hands:int = 2) -> list:
     '''
-    Create a new deck and shuffle. Deal 2 hands
+    Return all cards to the deck and shuffle. Deal a hand to every seat
+
+    Parameters:
+        deck: Deck to play with, the default deck when not given
+
+        number_of_hands: number of seats at the table, 2-10
 
     Returns:
         hands: a list of each player hands
     '''
+    deck = poker_functions.default_deck if deck is None else deck
 
-    poker_functions.create_deck()
-    poker_functions.shuffle()
+    deck.reset()
+    deck.shuffle()
 
-    hands = poker_functions.deal_hands(2)
+    hands = poker_functions.deal_hands(number_of_hands, deck)
     return hands
 
 ###################################### Modify Hand ########################################
-def modify_hand(card_list:list) -> dict:
+def modify_hand(card_list:list, deck:poker_functions.Deck = None) -> int:
     '''
     Deal card list back up to 5 cards
 
     Parameters:
         card_list: list of cards remaining in hand
 
+        deck: Deck to draw from, the default deck when not given
+
     Return:
-        modify_hand: a dictionary of cards sorted by suit
+        modify_hand: integer holding one bit for each card in the hand
     '''
+    deck = poker_functions.default_deck if deck is None else deck
+
     while len(card_list) < 5:
-        card_list.append(poker_functions.deal())
+        card_list.append(deck.deal())
     
     
-    hand = hand_organization.create_hand_dict(card_list)
+    hand = hand_organization.create_hand(card_list)
 
     return hand
 
-def modify_player_hand(player_hand:dict) -> dict:
+def ask_player_keep(player_hand:int) -> list:
     '''
-    Display hand to user, take input from user, discard cards from hand
+    Display hand to user and take input from user on which cards to keep
 
     Parameters:
-        player_hand: a dictionary of cards sorted by suit
+        player_hand: integer holding one bit for each card in the hand
 
     Return:
-        modify_hand: a dictionary of cards sorted by suit
+        keep_list: list of card integers to keep
     '''
+    #Imported here so the game runs without numpy, the hint is only shown
+    #  once the percentile index is cached: building it takes a minute or two,
+    #  run table_cache.py to build every table ahead of time
+    try:
+        import percentile_index
+    except ImportError:
+        percentile_index = None
+
     print('Your Hand:')
     poker_functions.print_hand(player_hand)
+    if percentile_index is not None and percentile_index.get_percentile_index(build=False) is not None:
+        print(percentile_index.format_hand_hint(player_hand))
 
     print('invalid input will result in no replacement')
     replacement_string = input('what Card(s) would you like to keep Ex.351: ')
 
+    return parse_keep(player_hand, replacement_string)
+
+def parse_keep(player_hand:int, replacement_string:str) -> list:
+    '''
+    Turn the card numbers typed by a player into the cards to keep, numbered
+        the way print_hand shows the hand
+
+    Parameters:
+        player_hand: integer holding one bit for each card in the hand
+
+        replacement_string: card numbers 1-5 to keep Ex. 351
+
+    Return:
+        keep_list: list of card integers to keep
+
+    Examples/Doctests:
+    >>> hand = hand_organization.hand_from_dict({0:[(2,0), (5,0)], 1:[(13,1)], 2:[(13,2)], 3:[(6,3)]})
+    >>> hand_organization.cards_to_tuples(parse_keep(hand, '21'))
+    [(13, 1), (13, 2)]
+    >>> parse_keep(hand, 'none')
+    []
+    '''
     keep_list = list()
     card_list = hand_organization.organize_hand(player_hand)
     for i, card in enumerate(card_list):
         if str(i + 1) in replacement_string:
             keep_list.append(card)
 
-    return modify_hand(keep_list)
+    return keep_list
+
+def modify_player_hand(player_hand:int, deck:poker_functions.Deck = None) -> int:
+    '''
+    Display hand to user, take input from user, discard cards from hand
+
+    Parameters:
+        player_hand: integer holding one bit for each card in the hand
+
+        deck: Deck to draw from, the default deck when not given
+
+    Return:
+        modify_hand: integer holding one bit for each card in the hand
+    '''
+    return modify_hand(ask_player_keep(player_hand), deck)
 
 
-def modify_bot_hand(bot_hand:dict) -> dict:
+def modify_bot_hand(bot_hand:int, deck:poker_functions.Deck = None, keep_function = None) -> int:
     '''
     Parameters:
-        bot_hand: a dictionary of cards sorted by suit
+        bot_hand: integer holding one bit for each card in the hand
+
+        deck: Deck to draw from, the default deck when not given
+
+        keep_function: bot strategy that picks the cards to keep,
+            bot_functions.calculate_keep when not given
 
     Returns:
-        modify_hand a dictionary of cards sorted by suit
+        modify_hand: integer holding one bit for each card in the hand
     '''
 
-    keep_list = bot_functions.calculate_keep(bot_hand)
+    keep_function = bot_functions.calculate_keep if keep_function is None else keep_function
+
+    keep_list = keep_function(bot_hand)
+
+    return modify_hand(keep_list, deck)
+
+def modify_table_hands(hands:list, deck:poker_functions.Deck = None, keep_functions:list = None) -> list:
+    '''
+    Let every seat discard and draw in turn. Discards go to the muck, and
+        once the deck is too short for a draw the muck is shuffled back in,
+        so ten seats can play from one deck
+
+    Parameters:
+        hands: list of hand integers, one per seat
+
+        deck: Deck to draw from, the default deck when not given
 
-    return modify_hand(keep_list)
+        keep_functions: bot strategy of each seat, bot_functions.calculate_keep
+            for every seat when not given
+
+    Returns:
+        hands: list of hand integers after the draw
+
+    Examples/Doctests:
+    >>> deck  = poker_functions.Deck(seed=2)
+    >>> hands = modify_table_hands(start_new_game(deck, 10), deck)
+    >>> len(hands), all(hand.bit_count() == 5 for hand in hands)
+    (10, True)
+    >>> sum(hand.bit_count() for hand in hands) + len(deck) <= 52
+    True
+    '''
+    deck           = poker_functions.default_deck if deck is None else deck
+    keep_functions = [bot_functions.calculate_keep] * len(hands) if keep_functions is None else keep_functions
+
+    muck           = list()
+    modified_hands = list()
+    for hand, keep_function in zip(hands, keep_functions):
+        keep_list = keep_function(hand)
+        kept      = hand_organization.create_hand(keep_list)
+        muck.extend(hand_organization.create_card_list(hand & ~kept))
+
+        if len(deck) < 5 - len(keep_list):
+            deck.return_cards(muck)
+            deck.shuffle()
+            muck = list()
+
+        modified_hands.append(modify_hand(keep_list, deck))
+
+    return modified_hands
     
 
 
 if __name__ == "__main__":
+    import argparse
+    import sys
+
+    #Imported here, instrumentation imports this module to find the game loop
+    import instrumentation
+
+    parser = argparse.ArgumentParser(description='Play five card draw against the bot')
+    parser.add_argument('--profile', action='store_true', help='time every stage of each round and report when done')
+    parser.add_argument('--seats',   type=int, default=2,  choices=range(2, 11), metavar='{2-10}',
+                        help='seats at the table including yours, 2-10')
+    arguments = parser.parse_args()
+
+    if arguments.profile:
+        instrumentation.enable(sys.modules[__name__])
+
     greet_player()
 
+    deck          = poker_functions.Deck()
     repeat_string = 'y'
 
     while repeat_string == 'y':
-        hands        = start_new_game()
+        hands        = start_new_game(deck, arguments.seats)
 
-        player_hand  = hands[0]
-        bot_hand     = hands[1]
+        if arguments.seats == 2:
+            player_hand  = hands[0]
+            bot_hand     = hands[1]
 
-        player_hand  = modify_player_hand(player_hand)
-        bot_hand     = modify_bot_hand(bot_hand)
+            player_hand  = modify_player_hand(player_hand, deck)
+            bot_hand     = modify_bot_hand(bot_hand, deck)
 
-        winner       = poker_functions.compare_hands(player_hand, bot_hand)
+            winner       = poker_functions.compare_hands(player_hand, bot_hand)
+        else:
+            #You sit in seat 1, every other seat is a bot
+            keep_functions = [ask_player_keep] + [bot_functions.calculate_keep] * (arguments.seats - 1)
+            hands          = modify_table_hands(hands, deck, keep_functions)
 
-        repeat_string = input('Would you like to play again (y/n):').lower()
+            winners        = poker_functions.compare_table_hands(hands)
 
+        repeat_string = input('Would you like to play again (y/n):').lower()
 
+    if arguments.profile:
+        print()
+        instrumentation.print_report()
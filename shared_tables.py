@@ -0,0 +1,174 @@
+import array
+import atexit
+import sys
+
+from multiprocessing import shared_memory
+from typing import NamedTuple
+
+################################ Shared Tables #################################
+#A pool of workers would otherwise hold one copy of every lookup table per
+#  worker: the class id dictionary alone is over 10 MB in each process. The
+#  process starting the pool publishes each table it has loaded into one
+#  block of shared memory, and every worker attaches to the blocks read-only
+#  when it starts, so memory stays flat however many workers there are
+#
+#Only tables of modules this process has already imported are published, so
+#  a pool never makes its workers import numpy or build a table they do not use
+
+class SharedTable(NamedTuple):
+    '''
+    Handle of a published table, small enough to hand to every worker
+
+    name:     name of the table
+    block:    name of the shared memory block holding it
+    typecode: array typecode of the values
+    size:     number of bytes of the values
+    '''
+    name:     str
+    block:    str
+    typecode: str
+    size:     int
+
+#table name -> SharedMemory published or attached by this process
+blocks = dict()
+
+#table name -> SharedTable of the tables this process published
+published = dict()
+
+def publish_table(name:str, typecode:str, values) -> SharedTable:
+    '''
+    Copy a table into a new block of shared memory, once per process. The
+        block is removed when this process exits
+
+    Parameters:
+        name: name of the table
+
+        typecode: array typecode of the values
+
+        values: object holding the values, anything with the buffer protocol
+
+    Returns:
+        table: SharedTable to hand to the workers
+
+    Examples/Doctests:
+    >>> table = publish_table('doctest_squares', 'Q', array.array('Q', [0, 1, 4, 9]))
+    >>> table.size, publish_table('doctest_squares', 'Q', array.array('Q', [0])) == table
+    (32, True)
+    >>> attach_table(table).tolist()
+    [0, 1, 4, 9]
+    '''
+    if name in published:
+        return published[name]
+
+    source = memoryview(values).cast('B')
+    block  = shared_memory.SharedMemory(create=True, size=max(1, source.nbytes))
+    block.buf[:source.nbytes] = source
+
+    if not published:
+        atexit.register(release_tables)
+
+    blocks[name]    = block
+    published[name] = SharedTable(name, block.name, typecode, source.nbytes)
+
+    return published[name]
+
+def attach_table(table:SharedTable) -> memoryview:
+    '''
+    Attach to a published table, from the process that published it or a
+        worker it started
+
+    Returns:
+        values: read-only memoryview of the values
+    '''
+    if table.name in published:
+        block = blocks[table.name]
+    else:
+        #Pool workers share the resource tracker of the process that started
+        #  them, so attaching here does not make the block outlive or die
+        #  before the publishing process
+        block = shared_memory.SharedMemory(name=table.block)
+        blocks[table.name] = block
+
+    return block.buf[:table.size].toreadonly().cast(table.typecode)
+
+def release_tables() -> None:
+    '''
+    Remove every block this process published
+    '''
+    for name in published:
+        try:
+            blocks[name].close()
+        except BufferError:
+            pass
+        blocks[name].unlink()
+        del blocks[name]
+
+    published.clear()
+
+def publish_loaded_tables() -> list:
+    '''
+    Publish every lookup table this process has loaded
+
+    Returns:
+        tables: list of SharedTable, pass it to attach_tables in each worker
+    '''
+    tables = []
+
+    discard_table = sys.modules.get('discard_table')
+    if discard_table is not None and discard_table.discard_table is not None:
+        tables.append(publish_table('discard_table', 'Q', discard_table.discard_table))
+
+    hand_isomorphism = sys.modules.get('hand_isomorphism')
+    if hand_isomorphism is not None and 5 in hand_isomorphism.class_ids:
+        class_ids = hand_isomorphism.class_ids[5]
+        hands     = class_ids.hands if isinstance(class_ids, hand_isomorphism.SortedIndex) else array.array('Q', class_ids)
+        tables.append(publish_table('canonical_hands_5', 'Q', hands))
+
+    draw_table = sys.modules.get('draw_table')
+    if draw_table is not None and draw_table.draw_table is not None:
+        import numpy as np
+        tables.append(publish_table('draw_table', 'q', np.concatenate(draw_table.draw_table)))
+
+    exact_evaluation = sys.modules.get('exact_evaluation')
+    if exact_evaluation is not None and exact_evaluation.hand_arrays is not None:
+        masks, strengths = exact_evaluation.hand_arrays
+        tables.append(publish_table('hand_masks',     'Q', masks))
+        tables.append(publish_table('hand_strengths', 'q', strengths))
+
+    percentile_index = sys.modules.get('percentile_index')
+    if percentile_index is not None and percentile_index.percentile_index is not None:
+        tables.append(publish_table('percentile_index', 'I', percentile_index.percentile_index))
+
+    return tables
+
+def attach_tables(tables:list) -> None:
+    '''
+    Attach to published tables and put them where their modules look for
+        them, the initializer of every pool worker
+
+    Parameters:
+        tables: list from publish_loaded_tables
+    '''
+    values = {table.name: attach_table(table) for table in tables}
+
+    if 'discard_table' in values:
+        import discard_table
+        discard_table.discard_table = values['discard_table']
+
+    if 'canonical_hands_5' in values:
+        import hand_isomorphism
+        hand_isomorphism.class_ids[5] = hand_isomorphism.SortedIndex(values['canonical_hands_5'])
+
+    if 'draw_table' in values:
+        import draw_table
+        draw_table.draw_table = draw_table.split_draw_table(values['draw_table'])
+
+    if 'hand_masks' in values:
+        import numpy as np
+        import exact_evaluation
+        exact_evaluation.hand_arrays = (np.frombuffer(values['hand_masks'], dtype=np.uint64),
+                                        np.frombuffer(values['hand_strengths'], dtype=np.int64))
+
+    if 'percentile_index' in values:
+        import percentile_index
+        percentile_index.percentile_index = values['percentile_index']
@@ -0,0 +1,489 @@
+import collections
+import concurrent.futures
+import math
+import os
+import time
+
+from typing import NamedTuple
+
+import poker_functions
+import poker_game
+import shared_tables
+
+############################### Simulation Rounds ##############################
+#Rounds played by one chunk of work. Every chunk deals from its own deck seeded
+#  from the simulation seed and the chunk number, so the rounds played never
+#  depend on how many workers share the chunks
+CHUNK_ROUNDS = 10000
+
+def chunk_seed(seed:int, chunk_index:int) -> str:
+    '''
+    Build the seed for the deck of one chunk
+
+    Parameters:
+        seed: seed of the whole simulation
+
+        chunk_index: number of the chunk within the simulation
+
+    Returns:
+        chunk_seed: str, string seeds give random.Random the same stream on every platform
+
+    Examples/Doctests:
+    >>> chunk_seed(42, 3)
+    '42:3'
+    '''
+    return f'{seed}:{chunk_index}'
+
+def play_round(deck:poker_functions.Deck, keep_function = None) -> str:
+    '''
+    Play one bot_test round: hand one keeps every card, hand two uses the
+        strategic bot discard
+
+    Parameters:
+        deck: Deck to play the round with
+
+        keep_function: bot strategy used by hand two, bot_functions.calculate_keep when not given
+
+    Returns:
+        outcome_indicator: ONE, TWO, SPLIT
+    '''
+    hands       = poker_game.start_new_game(deck)
+
+    static_hand = hands[0]
+    bot_hand    = poker_game.modify_bot_hand(hands[1], deck, keep_function)
+
+    return poker_functions.showdown(static_hand, bot_hand).winner
+
+def new_tally() -> dict:
+    '''
+    Create an empty outcome tally
+
+    Returns:
+        tally: dictionary of outcome_indicator -> number of rounds
+
+    Examples/Doctests:
+    >>> new_tally()
+    {'ONE': 0, 'TWO': 0, 'SPLIT': 0}
+    '''
+    return {'ONE': 0, 'TWO': 0, 'SPLIT': 0}
+
+def merge_tallies(tallies:list) -> dict:
+    '''
+    Add several outcome tallies together
+
+    Parameters:
+        tallies: list of tally dictionaries
+
+    Returns:
+        tally: dictionary of outcome_indicator -> number of rounds
+
+    Examples/Doctests:
+    >>> merge_tallies([{'ONE': 2, 'TWO': 1, 'SPLIT': 0}, {'ONE': 1, 'TWO': 4, 'SPLIT': 1}])
+    {'ONE': 3, 'TWO': 5, 'SPLIT': 1}
+    '''
+    tally = new_tally()
+    for chunk_tally in tallies:
+        for outcome, rounds in chunk_tally.items():
+            tally[outcome] += rounds
+
+    return tally
+
+def run_chunk(seed:int, chunk_index:int, rounds:int, keep_function = None) -> dict:
+    '''
+    Play the rounds of one chunk on a deck of its own
+
+    Parameters:
+        seed: seed of the whole simulation
+
+        chunk_index: number of the chunk within the simulation
+
+        rounds: number of rounds to play
+
+        keep_function: bot strategy used by hand two, bot_functions.calculate_keep when not given
+
+    Returns:
+        tally: dictionary of outcome_indicator -> number of rounds
+    '''
+    deck  = poker_functions.Deck(chunk_seed(seed, chunk_index))
+    tally = new_tally()
+
+    for round_count in range(rounds):
+        tally[play_round(deck, keep_function)] += 1
+
+    return tally
+
+def split_rounds(rounds:int, chunk_rounds:int = CHUNK_ROUNDS) -> list:
+    '''
+    Split the rounds of a simulation into chunks
+
+    Parameters:
+        rounds: total number of rounds
+
+        chunk_rounds: most rounds in one chunk
+
+    Returns:
+        chunk_sizes: list holding the number of rounds in each chunk
+
+    Examples/Doctests:
+    >>> split_rounds(25, 10)
+    [10, 10, 5]
+    '''
+    return [min(chunk_rounds, rounds - start) for start in range(0, rounds, chunk_rounds)]
+
+def worker_pool(workers:int = None) -> concurrent.futures.ProcessPoolExecutor:
+    '''
+    Start a pool of worker processes sharing the lookup tables this process
+        has loaded instead of each holding its own copy, see shared_tables
+
+    Parameters:
+        workers: number of worker processes, os.cpu_count() when not given
+
+    Returns:
+        executor: ProcessPoolExecutor, use it in a with statement
+    '''
+    tables = shared_tables.publish_loaded_tables()
+
+    return concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=shared_tables.attach_tables,
+                                                  initargs=(tables,))
+
+def run_simulation(rounds:int, seed:int, workers:int = None, chunk_rounds:int = CHUNK_ROUNDS,
+                   keep_function = None) -> dict:
+    '''
+    Play bot_test rounds across a pool of worker processes and add up the outcomes
+
+    Parameters:
+        rounds: total number of rounds
+
+        seed: seed of the whole simulation, the same seed always gives the same tally
+
+        workers: number of worker processes, os.cpu_count() when not given,
+            1 plays every chunk in this process
+
+        chunk_rounds: most rounds in one chunk
+
+        keep_function: bot strategy used by hand two, bot_functions.calculate_keep
+            when not given. A module level function so worker processes can find it
+
+    Returns:
+        tally: dictionary of outcome_indicator -> number of rounds
+
+    Examples/Doctests:
+    >>> tally = run_simulation(300, seed=5, workers=1, chunk_rounds=100)
+    >>> sum(tally.values())
+    300
+    >>> run_simulation(300, seed=5, workers=2, chunk_rounds=100) == tally
+    True
+    '''
+    chunk_sizes   = split_rounds(rounds, chunk_rounds)
+    chunk_indexes = range(len(chunk_sizes))
+    seeds         = [seed] * len(chunk_sizes)
+    strategies    = [keep_function] * len(chunk_sizes)
+
+    if workers == 1:
+        return merge_tallies(map(run_chunk, seeds, chunk_indexes, chunk_sizes, strategies))
+
+    with worker_pool(workers) as executor:
+        return merge_tallies(executor.map(run_chunk, seeds, chunk_indexes, chunk_sizes, strategies))
+
+############################# Adaptive Simulation ##############################
+#z value of a 95% confidence interval
+CONFIDENCE_Z = 1.96
+
+#Sampling modes of variance_reduction, listed here so picking one does not import numpy
+SAMPLING_MODES = ('plain', 'stratified', 'control', 'antithetic')
+
+def win_rate_difference(tally:dict, z:float = CONFIDENCE_Z) -> tuple:
+    '''
+    Estimate how much more often hand two wins than hand one, with the half
+        width of its confidence interval. Each round counts +1 when hand two
+        wins, -1 when hand one wins and 0 on a split pot
+
+    Parameters:
+        tally: dictionary of outcome_indicator -> number of rounds
+
+        z: z value of the confidence interval
+
+    Returns:
+        difference: estimated TWO win rate minus ONE win rate
+
+        half_width: half the width of the confidence interval of difference
+
+        Both are undefined (nan, inf) when no rounds were played
+
+    Examples/Doctests:
+    >>> difference, half_width = win_rate_difference({'ONE': 3500, 'TWO': 6490, 'SPLIT': 10})
+    >>> round(difference, 4), round(half_width, 4)
+    (0.299, 0.0187)
+    >>> win_rate_difference(new_tally())
+    (nan, inf)
+    '''
+    rounds   = sum(tally.values())
+    if rounds == 0:
+        return math.nan, math.inf
+
+    rate_one = tally['ONE'] / rounds
+    rate_two = tally['TWO'] / rounds
+
+    difference = rate_two - rate_one
+    variance   = rate_one + rate_two - difference ** 2
+
+    return difference, z * math.sqrt(variance / rounds)
+
+def outcome_intervals(tally:dict, z:float = CONFIDENCE_Z) -> dict:
+    '''
+    Estimate the rate of every outcome with the half width of its confidence interval
+
+    Parameters:
+        tally: dictionary of outcome_indicator -> number of rounds
+
+        z: z value of the confidence interval
+
+    Returns:
+        intervals: dictionary of outcome_indicator -> (rate, half_width),
+            (nan, inf) when no rounds were played
+
+    Examples/Doctests:
+    >>> intervals = outcome_intervals({'ONE': 25, 'TWO': 75, 'SPLIT': 0})
+    >>> [(outcome, round(rate, 3), round(half_width, 3)) for outcome, (rate, half_width) in intervals.items()]
+    [('ONE', 0.25, 0.085), ('TWO', 0.75, 0.085), ('SPLIT', 0.0, 0.0)]
+    >>> outcome_intervals(new_tally())['ONE']
+    (nan, inf)
+    '''
+    rounds    = sum(tally.values())
+    intervals = dict()
+    for outcome, count in tally.items():
+        if rounds == 0:
+            intervals[outcome] = (math.nan, math.inf)
+            continue
+
+        rate = count / rounds
+        intervals[outcome] = (rate, z * math.sqrt(rate * (1 - rate) / rounds))
+
+    return intervals
+
+class Estimate(NamedTuple):
+    '''
+    Result of an adaptive simulation
+
+    tally:       dictionary of outcome_indicator -> number of rounds played
+    difference:  estimated TWO win rate minus ONE win rate
+    half_width:  half the width of the confidence interval of difference
+    stop_reason: 'tolerance', 'time budget' or 'max rounds'
+    '''
+    tally:       dict
+    difference:  float
+    half_width:  float
+    stop_reason: str
+
+def run_adaptive_simulation(seed:int, tolerance:float, max_rounds:int, time_budget:float = None,
+                            workers:int = None, chunk_rounds:int = CHUNK_ROUNDS, keep_function = None) -> Estimate:
+    '''
+    Play bot_test rounds chunk by chunk until the confidence interval of the
+        win rate difference is narrower than tolerance, the time budget runs
+        out or max_rounds have been played
+
+    Chunks are added to the tally in chunk order and the stopping rule is
+        checked after each one, so a run stopped by tolerance or max_rounds
+        plays the same rounds for a seed whatever the number of workers
+
+    Parameters:
+        seed: seed of the whole simulation
+
+        tolerance: stop once the half width of the interval is at most this
+
+        max_rounds: most rounds to play, at least 1
+
+        time_budget: most seconds to play for, no limit when not given
+
+        workers: number of worker processes, os.cpu_count() when not given,
+            1 plays every chunk in this process
+
+        chunk_rounds: rounds played between checks of the stopping rule
+
+        keep_function: bot strategy used by hand two, bot_functions.calculate_keep
+            when not given
+
+    Returns:
+        estimate: Estimate
+
+    Examples/Doctests:
+    >>> estimate = run_adaptive_simulation(seed=5, tolerance=0.1, max_rounds=1000, workers=1, chunk_rounds=100)
+    >>> sum(estimate.tally.values()), estimate.half_width <= 0.1, estimate.stop_reason
+    (400, True, 'tolerance')
+    >>> run_adaptive_simulation(seed=5, tolerance=0.1, max_rounds=1000, workers=2, chunk_rounds=100) == estimate
+    True
+    >>> run_adaptive_simulation(seed=5, tolerance=0.0, max_rounds=250, workers=1, chunk_rounds=100).stop_reason
+    'max rounds'
+    >>> run_adaptive_simulation(seed=5, tolerance=0.1, max_rounds=0)
+    Traceback (most recent call last):
+    ...
+    ValueError: max_rounds must be at least 1, got 0
+    '''
+    if max_rounds < 1:
+        raise ValueError('max_rounds must be at least 1, got {}'.format(max_rounds))
+
+    deadline    = None if time_budget is None else time.perf_counter() + time_budget
+    chunk_sizes = split_rounds(max_rounds, chunk_rounds)
+    tally       = new_tally()
+
+    def stop_reason() -> str:
+        difference, half_width = win_rate_difference(tally)
+        if half_width <= tolerance:
+            return 'tolerance'
+        if deadline is not None and time.perf_counter() >= deadline:
+            return 'time budget'
+        return None
+
+    def finish(reason:str) -> Estimate:
+        return Estimate(tally, *win_rate_difference(tally), reason)
+
+    if workers == 1:
+        for chunk_index, rounds in enumerate(chunk_sizes):
+            tally  = merge_tallies([tally, run_chunk(seed, chunk_index, rounds, keep_function)])
+            reason = stop_reason()
+            if reason is not None:
+                return finish(reason)
+
+        return finish('max rounds')
+
+    #Keep every worker busy with a couple of chunks queued past the one being checked
+    workers = os.cpu_count() if workers is None else workers
+    with worker_pool(workers) as executor:
+        pending    = collections.deque()
+        next_chunk = 0
+        for chunk_index in range(len(chunk_sizes)):
+            while next_chunk < len(chunk_sizes) and len(pending) < 2 * workers:
+                pending.append(executor.submit(run_chunk, seed, next_chunk, chunk_sizes[next_chunk], keep_function))
+                next_chunk += 1
+
+            tally  = merge_tallies([tally, pending.popleft().result()])
+            reason = stop_reason()
+            if reason is not None:
+                for future in pending:
+                    future.cancel()
+                return finish(reason)
+
+    return finish('max rounds')
+
+############################### Table Simulation ###############################
+def play_table_round(deck:poker_functions.Deck, keep_functions:list) -> list:
+    '''
+    Play one round at a full table: deal every seat, let each seat draw with
+        its own strategy and settle the showdown in one pass
+
+    Parameters:
+        deck: Deck to play the round with
+
+        keep_functions: bot strategy of each seat, one per seat
+
+    Returns:
+        winners: list of the seat indexes sharing the pot
+    '''
+    hands = poker_game.start_new_game(deck, len(keep_functions))
+    hands = poker_game.modify_table_hands(hands, deck, keep_functions)
+
+    return poker_functions.table_showdown(hands).winners
+
+def new_table_tally(seat_count:int) -> dict:
+    '''
+    Create an empty table tally
+
+    Returns:
+        tally: dictionary holding the outright wins of each seat, the pots
+            shared by each seat and the number of split pots
+
+    Examples/Doctests:
+    >>> new_table_tally(3)
+    {'wins': [0, 0, 0], 'shared': [0, 0, 0], 'split_pots': 0}
+    '''
+    return {'wins': [0] * seat_count, 'shared': [0] * seat_count, 'split_pots': 0}
+
+def merge_table_tallies(tallies:list) -> dict:
+    '''
+    Add several table tallies together
+
+    Examples/Doctests:
+    >>> merge_table_tallies([{'wins': [2, 1], 'shared': [0, 1], 'split_pots': 1}, {'wins': [0, 3], 'shared': [0, 0], 'split_pots': 0}])
+    {'wins': [2, 4], 'shared': [0, 1], 'split_pots': 1}
+    '''
+    tally = None
+    for chunk_tally in tallies:
+        if tally is None:
+            tally = new_table_tally(len(chunk_tally['wins']))
+        for seat in range(len(tally['wins'])):
+            tally['wins'][seat]   += chunk_tally['wins'][seat]
+            tally['shared'][seat] += chunk_tally['shared'][seat]
+        tally['split_pots'] += chunk_tally['split_pots']
+
+    return tally
+
+def run_table_chunk(seed:int, chunk_index:int, rounds:int, keep_functions:list) -> dict:
+    '''
+    Play the table rounds of one chunk on a deck of its own
+
+    Parameters:
+        seed: seed of the whole simulation
+
+        chunk_index: number of the chunk within the simulation
+
+        rounds: number of rounds to play
+
+        keep_functions: bot strategy of each seat, one per seat
+
+    Returns:
+        tally: table tally, see new_table_tally
+    '''
+    deck  = poker_functions.Deck(chunk_seed(seed, chunk_index))
+    tally = new_table_tally(len(keep_functions))
+
+    for round_count in range(rounds):
+        winners = play_table_round(deck, keep_functions)
+        if len(winners) == 1:
+            tally['wins'][winners[0]] += 1
+            continue
+
+        tally['split_pots'] += 1
+        for seat in winners:
+            tally['shared'][seat] += 1
+
+    return tally
+
+def run_table_simulation(rounds:int, seed:int, keep_functions:list, workers:int = None,
+                         chunk_rounds:int = CHUNK_ROUNDS) -> dict:
+    '''
+    Play full table rounds across a pool of worker processes and add up the outcomes
+
+    Parameters:
+        rounds: total number of rounds
+
+        seed: seed of the whole simulation, the same seed always gives the same tally
+
+        keep_functions: bot strategy of each seat, 2-10 module level functions
+
+        workers: number of worker processes, os.cpu_count() when not given,
+            1 plays every chunk in this process
+
+        chunk_rounds: most rounds in one chunk
+
+    Returns:
+        tally: table tally, see new_table_tally
+
+    Examples/Doctests:
+    >>> import bot_functions
+    >>> seats = [bot_functions.keep_all] + [bot_functions.calculate_keep] * 9
+    >>> tally = run_table_simulation(200, seed=5, keep_functions=seats, workers=1, chunk_rounds=100)
+    >>> sum(tally['wins']) + tally['split_pots']
+    200
+    >>> run_table_simulation(200, seed=5, keep_functions=seats, workers=2, chunk_rounds=100) == tally
+    True
+    '''
+    chunk_sizes   = split_rounds(rounds, chunk_rounds)
+    chunk_indexes = range(len(chunk_sizes))
+    seeds         = [seed] * len(chunk_sizes)
+    strategies    = [keep_functions] * len(chunk_sizes)
+
+    if workers == 1:
+        return merge_table_tallies(map(run_table_chunk, seeds, chunk_indexes, chunk_sizes, strategies))
+
+    with worker_pool(workers) as executor:
+        return merge_table_tallies(executor.map(run_table_chunk, seeds, chunk_indexes, chunk_sizes, strategies))
@@ -0,0 +1,239 @@
+import array
+import glob
+import hashlib
+import mmap
+import os
+import sys
+import time
+
+################################# Table Cache ##################################
+#Lookup tables that take a while to build are built once and written to disk.
+#  Later processes map the file instead of building the table, so only the
+#  pages a lookup touches are ever read and a new worker starts in
+#  milliseconds. Only the standard library is used here, importing numpy
+#  alone would cost more than most tables take to load
+#
+#A table file is named after the table and a fingerprint of its version and
+#  the source files it is built from. Editing any of those sources, or bumping
+#  the version, gives a new fingerprint, so a stale file is never opened and
+#  the table is rebuilt on first use
+#
+#The cache directory is shared by every checkout of a user, and checkouts on
+#  different branches need different versions of a table side by side. So
+#  opening a table marks its file as used, and a build only deletes the other
+#  versions left unused for STALE_SECONDS
+
+#Directory of the table files, POKER_TABLE_CACHE overrides it. The default
+#  follows XDG_CACHE_HOME, so nothing is written next to the sources
+CACHE_DIR = os.environ.get('POKER_TABLE_CACHE',
+                           os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')), 'poker_game'))
+
+MAGIC       = b'PKTC'
+HEADER_SIZE = 16
+
+#Versions of a table unused for this long are deleted by the next build of the table
+STALE_SECONDS = 30 * 24 * 60 * 60
+
+def fingerprint(name:str, typecode:str, version:int, sources:list) -> str:
+    '''
+    Hash everything a table depends on into a short hex string
+
+    Parameters:
+        name: name of the table
+
+        typecode: array typecode of the table values
+
+        version: version of the table layout, bump it when the build changes
+            in a way the sources do not show
+
+        sources: list of paths of the source files the table is built from
+
+    Returns:
+        fingerprint: 16 hex characters
+
+    Examples/Doctests:
+    >>> fingerprint('rank_spread', 'Q', 1, []) == fingerprint('rank_spread', 'Q', 2, [])
+    False
+    '''
+    digest = hashlib.sha256('{}:{}:{}:{}'.format(name, typecode, version, sys.byteorder).encode())
+    for source in sources:
+        with open(source, 'rb') as source_file:
+            digest.update(source_file.read())
+
+    return digest.hexdigest()[:16]
+
+def table_path(name:str, table_fingerprint:str) -> str:
+    '''
+    Path of the file holding one version of a table
+    '''
+    return os.path.join(CACHE_DIR, '{}-{}.tbl'.format(name, table_fingerprint))
+
+def write_table(path:str, typecode:str, values) -> None:
+    '''
+    Write a table file. The file is written under a temporary name and moved
+        into place, so a process opening the table never sees half a file
+
+    Parameters:
+        path: path of the table file
+
+        typecode: array typecode of the values
+
+        values: iterable of the table values
+    '''
+    table  = array.array(typecode, values)
+    header = MAGIC + typecode.encode() + bytes(3) + len(table).to_bytes(8, 'little')
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temporary_path, 'wb') as table_file:
+        table_file.write(header)
+        table.tofile(table_file)
+    os.replace(temporary_path, path)
+
+def open_table(path:str, typecode:str, mapped:bool = True) -> memoryview:
+    '''
+    Map a table file into memory, or read it in whole
+
+    Parameters:
+        path: path of the table file
+
+        typecode: array typecode of the values
+
+        mapped: map the file so only the pages a lookup touches are read.
+            A small table turned into other objects straight away is read in
+            whole instead, mapping it would gain nothing
+
+    Returns:
+        table: memoryview of the values, None when the file is missing or
+            does not hold a whole table of typecode values
+    '''
+    try:
+        with open(path, 'rb') as table_file:
+            if mapped:
+                contents = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                contents = table_file.read()
+    except (OSError, ValueError):
+        return None
+
+    header = contents[:HEADER_SIZE]
+    length = int.from_bytes(header[8:16], 'little')
+    if header[:5] != MAGIC + typecode.encode() or len(contents) != HEADER_SIZE + length * array.array(typecode).itemsize:
+        if mapped:
+            contents.close()
+        return None
+
+    #The modification time marks when the table was last used, see remove_stale_tables
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+    return memoryview(contents)[HEADER_SIZE:].cast(typecode)
+
+def remove_stale_tables(name:str, keep_path:str) -> None:
+    '''
+    Delete the files of the other versions of a table that no process has
+        opened for STALE_SECONDS
+    '''
+    stale_before = time.time() - STALE_SECONDS
+    for path in glob.glob(os.path.join(CACHE_DIR, '{}-*.tbl'.format(name))):
+        try:
+            if path != keep_path and os.path.getmtime(path) < stale_before:
+                os.remove(path)
+        except OSError:
+            pass
+
+def open_cached_table(name:str, typecode:str, version:int = 1, sources:list = (), mapped:bool = True) -> memoryview:
+    '''
+    Open a table from the cache without ever building it
+
+    Parameters:
+        see cached_table
+
+    Returns:
+        table: memoryview of the values, None when the cache does not hold
+            this version of the table
+    '''
+    return open_table(table_path(name, fingerprint(name, typecode, version, sources)), typecode, mapped)
+
+def cached_table(name:str, typecode:str, build, version:int = 1, sources:list = (), mapped:bool = True) -> memoryview:
+    '''
+    Open a table from the cache, building and writing it first when it is
+        missing or stale. When the cache cannot be written the freshly built
+        table is returned from memory
+
+    Parameters:
+        name: name of the table
+
+        typecode: array typecode of the table values, 'Q' for hand integers
+
+        build: function taking no arguments and returning the table values
+
+        version: version of the table layout
+
+        sources: list of paths of the source files the table is built from
+
+        mapped: map the table file, see open_table
+
+    Returns:
+        table: memoryview of the values, indexes and slices like a list
+
+    Examples/Doctests:
+    >>> import tempfile
+    >>> module = sys.modules[__name__]
+    >>> saved_dir, module.CACHE_DIR = module.CACHE_DIR, tempfile.mkdtemp()
+    >>> builds = []
+    >>> def build_squares():
+    ...     builds.append(1)
+    ...     return [value * value for value in range(10)]
+    >>> cached_table('squares', 'Q', build_squares)[9], cached_table('squares', 'Q', build_squares)[3]
+    (81, 9)
+    >>> len(builds), open_cached_table('squares', 'Q')[9], open_cached_table('cubes', 'Q')
+    (1, 81, None)
+    >>> cached_table('squares', 'Q', build_squares, version=2).tolist()[:4], len(builds)
+    ([0, 1, 4, 9], 2)
+    >>> len(os.listdir(module.CACHE_DIR)), cached_table('squares', 'Q', build_squares, version=2, mapped=False)[9]
+    (2, 81)
+    >>> #Version 1 left unused for longer than STALE_SECONDS goes with the next build
+    >>> os.utime(table_path('squares', fingerprint('squares', 'Q', 1, [])), (0, 0))
+    >>> len(cached_table('squares', 'Q', build_squares, version=3)), len(os.listdir(module.CACHE_DIR))
+    (10, 2)
+    >>> module.CACHE_DIR = saved_dir
+    '''
+    path  = table_path(name, fingerprint(name, typecode, version, sources))
+    table = open_table(path, typecode, mapped)
+    if table is not None:
+        return table
+
+    values = build()
+    try:
+        write_table(path, typecode, values)
+    except OSError:
+        return memoryview(array.array(typecode, values))
+
+    remove_stale_tables(name, path)
+
+    return open_table(path, typecode, mapped)
+
+if __name__ == "__main__":
+    import poker_functions
+    import hand_isomorphism
+    import discard_table
+    import draw_table
+    import percentile_index
+
+    #Every cached table, opening each one builds it when it is missing or stale
+    tables = [
+        ('strength tables',  lambda: poker_functions.strength_table),
+        ('class ids',        lambda: [hand_isomorphism.get_class_ids(card_count) for card_count in range(6)]),
+        ('draw table',       draw_table.get_draw_table),
+        ('discard table',    discard_table.get_discard_table),
+        ('percentile index', percentile_index.get_percentile_index),
+    ]
+
+    print('Table cache: {}'.format(CACHE_DIR))
+    for label, open_function in tables:
+        start = time.perf_counter()
+        open_function()
+        print('{:<16}{:>10.1f} ms'.format(label, (time.perf_counter() - start) * 1e3))
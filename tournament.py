@@ -0,0 +1,235 @@
+import argparse
+import itertools
+import random
+
+import poker_functions
+import poker_game
+import bot_functions
+import discard_table
+import simulation
+
+############################ Strategy Tournament ###############################
+#Every round deals one pair of hands, then every pair of strategies plays that
+#  same deal twice, once from each seat, drawing the same cards from the same
+#  deck. The luck of the deal is shared by every matchup (common random
+#  numbers), so the gap between two strategies is measured with far less noise
+#  than separate runs would give
+#
+#Draws come off the deck in seat order, so the seat drawing first alternates
+#  from one deal to the next: over a tournament each strategy draws first and
+#  second equally often from both seats
+
+def new_tournament_tally(strategy_count:int) -> dict:
+    '''
+    Create an empty tournament tally
+
+    Returns:
+        tally: dictionary of square matrices (lists of lists) indexed
+            [strategy][opponent]: games played, games won and games split
+
+    Examples/Doctests:
+    >>> new_tournament_tally(2)
+    {'games': [[0, 0], [0, 0]], 'wins': [[0, 0], [0, 0]], 'splits': [[0, 0], [0, 0]]}
+    '''
+    return {key: [[0] * strategy_count for index in range(strategy_count)] for key in ['games', 'wins', 'splits']}
+
+def merge_tournament_tallies(tallies:list) -> dict:
+    '''
+    Add several tournament tallies together
+
+    Examples/Doctests:
+    >>> merge_tournament_tallies([{'games': [[0, 2], [2, 0]], 'wins': [[0, 1], [1, 0]], 'splits': [[0, 0], [0, 0]]},
+    ...                           {'games': [[0, 2], [2, 0]], 'wins': [[0, 0], [1, 0]], 'splits': [[0, 1], [1, 0]]}])
+    {'games': [[0, 4], [4, 0]], 'wins': [[0, 1], [2, 0]], 'splits': [[0, 1], [1, 0]]}
+    '''
+    tally = None
+    for chunk_tally in tallies:
+        if tally is None:
+            tally = new_tournament_tally(len(chunk_tally['games']))
+        for key in tally:
+            for row, chunk_row in zip(tally[key], chunk_tally[key]):
+                for column, count in enumerate(chunk_row):
+                    row[column] += count
+
+    return tally
+
+def play_deal(deck:poker_functions.Deck, position:int, keep_one:list, keep_two:list, two_first:bool = False) -> str:
+    '''
+    Play one seating of a deal, both seats drawing from the undealt cards
+        left by the deal
+
+    Parameters:
+        deck: Deck the hands were dealt from
+
+        position: Deck.mark right after the deal
+
+        keep_one: keep list of seat one
+
+        keep_two: keep list of seat two
+
+        two_first: seat two draws before seat one
+
+    Returns:
+        outcome_indicator: ONE, TWO, SPLIT
+    '''
+    deck.rewind(position)
+
+    if two_first:
+        hand_two = poker_game.modify_hand(list(keep_two), deck)
+        hand_one = poker_game.modify_hand(list(keep_one), deck)
+    else:
+        hand_one = poker_game.modify_hand(list(keep_one), deck)
+        hand_two = poker_game.modify_hand(list(keep_two), deck)
+
+    return poker_functions.showdown(hand_one, hand_two).winner
+
+def run_tournament_chunk(seed:int, chunk_index:int, rounds:int, keep_functions:list) -> dict:
+    '''
+    Play the tournament rounds of one chunk on a deck of its own
+
+    Parameters:
+        seed: seed of the whole tournament
+
+        chunk_index: number of the chunk within the tournament
+
+        rounds: number of deals to play
+
+        keep_functions: list of discard strategies
+
+    Returns:
+        tally: tournament tally, see new_tournament_tally
+    '''
+    deck  = poker_functions.Deck(simulation.chunk_seed(seed, chunk_index))
+    tally = new_tournament_tally(len(keep_functions))
+
+    for round_count in range(rounds):
+        hands    = poker_game.start_new_game(deck)
+        position = deck.mark()
+
+        #Each strategy decides once per hand, every matchup reuses the decision
+        keeps = [[keep_function(hand) for hand in hands] for keep_function in keep_functions]
+
+        for first, second in itertools.combinations(range(len(keep_functions)), 2):
+            for seat_one, seat_two in [(first, second), (second, first)]:
+                winner = play_deal(deck, position, keeps[seat_one][0], keeps[seat_two][1], round_count % 2 == 1)
+
+                tally['games'][seat_one][seat_two] += 1
+                tally['games'][seat_two][seat_one] += 1
+                if winner == 'SPLIT':
+                    tally['splits'][seat_one][seat_two] += 1
+                    tally['splits'][seat_two][seat_one] += 1
+                elif winner == 'ONE':
+                    tally['wins'][seat_one][seat_two] += 1
+                else:
+                    tally['wins'][seat_two][seat_one] += 1
+
+    return tally
+
+def run_tournament(rounds:int, seed:int, keep_functions:list, workers:int = None,
+                   chunk_rounds:int = simulation.CHUNK_ROUNDS) -> dict:
+    '''
+    Play every pair of strategies against each other on the same deals,
+        across a pool of worker processes
+
+    Parameters:
+        rounds: number of deals, each deal is played from both seats by every pair
+
+        seed: seed of the whole tournament, the same seed always gives the same tally
+
+        keep_functions: list of discard strategies, module level functions
+
+        workers: number of worker processes, os.cpu_count() when not given,
+            1 plays every chunk in this process
+
+        chunk_rounds: most deals in one chunk
+
+    Returns:
+        tally: tournament tally, see new_tournament_tally
+
+    Examples/Doctests:
+    >>> players = [bot_functions.keep_all, bot_functions.calculate_keep]
+    >>> tally = run_tournament(300, seed=5, keep_functions=players, workers=1, chunk_rounds=100)
+    >>> tally['games']
+    [[0, 600], [600, 0]]
+    >>> tally['wins'][1][0] > tally['wins'][0][1]
+    True
+    >>> run_tournament(300, seed=5, keep_functions=players, workers=2, chunk_rounds=100) == tally
+    True
+    '''
+    chunk_sizes   = simulation.split_rounds(rounds, chunk_rounds)
+    chunk_indexes = range(len(chunk_sizes))
+    seeds         = [seed] * len(chunk_sizes)
+    strategies    = [keep_functions] * len(chunk_sizes)
+
+    if workers == 1:
+        return merge_tournament_tallies(map(run_tournament_chunk, seeds, chunk_indexes, chunk_sizes, strategies))
+
+    with simulation.worker_pool(workers) as executor:
+        return merge_tournament_tallies(executor.map(run_tournament_chunk, seeds, chunk_indexes, chunk_sizes, strategies))
+
+def win_rate_matrix(tally:dict) -> list:
+    '''
+    Work out how often each strategy beats each opponent, a split pot counts
+        as half a win
+
+    Returns:
+        rates: list of lists, rates[strategy][opponent], None on the diagonal
+
+    Examples/Doctests:
+    >>> win_rate_matrix({'games': [[0, 4], [4, 0]], 'wins': [[0, 1], [2, 0]], 'splits': [[0, 1], [1, 0]]})
+    [[None, 0.375], [0.625, None]]
+    '''
+    rates = []
+    for strategy, games_row in enumerate(tally['games']):
+        row = []
+        for opponent, games in enumerate(games_row):
+            if strategy == opponent or games == 0:
+                row.append(None)
+                continue
+
+            row.append((tally['wins'][strategy][opponent] + tally['splits'][strategy][opponent] / 2) / games)
+        rates.append(row)
+
+    return rates
+
+def format_win_rate_matrix(names:list, rates:list) -> list:
+    '''
+    Create the lines of a table of win rates, one row per strategy
+
+    Examples/Doctests:
+    >>> for line in format_win_rate_matrix(['keep_all', 'strategic'], [[None, 0.375], [0.625, None]]):
+    ...     print(line)
+                    keep_all   strategic
+    keep_all               -      0.3750
+    strategic         0.6250           -
+    '''
+    width = max(12, max(len(name) for name in names) + 2)
+    lines = [' ' * 12 + ''.join('{:>{}}'.format(name, width) for name in names)]
+    for name, row in zip(names, rates):
+        cells = ['{:>{}}'.format('-' if rate is None else '{:.4f}'.format(rate), width) for rate in row]
+        lines.append('{:<12}'.format(name) + ''.join(cells))
+
+    return lines
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Play discard strategies against each other on the same deals')
+    parser.add_argument('strategies',  nargs='*', default=['keep_all', 'strategic'], help='names of the strategies to play: ' + ', '.join(bot_functions.strategies))
+    parser.add_argument('--rounds',    type=int, default=100000, help='number of deals')
+    parser.add_argument('--seed',      type=int, default=None,   help='seed for a reproducible run')
+    parser.add_argument('--workers',   type=int, default=None,   help='worker processes (default: one per core)')
+    arguments = parser.parse_args()
+
+    if 'optimal' in arguments.strategies:
+        #Build the table once here so forked workers share it instead of each building their own
+        discard_table.get_discard_table()
+
+    keep_functions = [bot_functions.get_strategy(name) for name in arguments.strategies]
+    seed           = random.randrange(2 ** 32) if arguments.seed is None else arguments.seed
+
+    tally = run_tournament(arguments.rounds, seed, keep_functions, arguments.workers)
+
+    print('Seed: {}'.format(seed))
+    print('Win rate of each row against each column, split pots count half')
+    for line in format_win_rate_matrix(arguments.strategies, win_rate_matrix(tally)):
+        print(line)
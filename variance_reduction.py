@@ -0,0 +1,427 @@
+import collections
+import math
+
+from typing import NamedTuple
+
+import numpy as np
+
+import poker_functions
+import poker_game
+import simulation
+
+############################# Variance Reduction ###############################
+#Plain dealing needs about a million rounds to pin the win rate gap down to a
+#  fraction of a percent. The modes below spend the same rounds but squeeze
+#  more out of them:
+#
+#  plain       every round on its own, the baseline
+#  stratified  rounds grouped by the category of hand one as dealt, each group
+#                weighted by the exact share of hands in that category. The
+#                categories from a straight up are one group, and the plain
+#                estimate stands in until every group holds 2 rounds
+#  control     the categories of both dealt hands as control variates, their
+#                exact means remove the luck of the deal from the estimate
+#  antithetic  every deal is played twice with the hands swapped, the luck of
+#                the deal then favours each side once
+#
+#Each mode reports its effective sample size: the number of plain rounds that
+#  would give the same confidence interval
+SAMPLING_MODES = simulation.SAMPLING_MODES
+
+#Value of a round in the win rate gap, see simulation.win_rate_difference
+OUTCOME_VALUES = {'ONE': -1, 'TWO': 1, 'SPLIT': 0}
+VALUE_OUTCOMES = {value: outcome for outcome, value in OUTCOME_VALUES.items()}
+
+#Share of the 2,598,960 five card hands in each score category, built the first time it is needed
+category_probabilities = None
+
+#Categories of hand one grouped by the stratified estimate. A straight or
+#  better is dealt under 1% of the time, a straight flush about once in 70000
+#  rounds, so those categories share one group rather than leave one empty
+STRATA = ((0,), (1,), (2,), (3,), (4, 5, 6, 7, 8))
+
+#Fewest rounds in every group before the stratified estimate is used, one
+#  round has no spread to measure
+STRATUM_MIN_ROUNDS = 2
+
+def get_category_probabilities() -> list:
+    '''
+    Return the exact share of five card hands in each score category
+
+    Returns:
+        probabilities: list of 9 floats indexed by score
+
+    Examples/Doctests:
+    >>> probabilities = get_category_probabilities()
+    >>> round(probabilities[0], 6), round(probabilities[1], 6), round(sum(probabilities), 12)
+    (0.50157, 0.422569, 1.0)
+    '''
+    global category_probabilities
+
+    if category_probabilities is None:
+        totals = [0] * 9
+        for strength, count in poker_functions.strength_counts().items():
+            totals[strength >> poker_functions.strength_shift] += count
+        category_probabilities = [total / sum(totals) for total in totals]
+
+    return category_probabilities
+
+################################ Sampled Rounds ################################
+def play_sample_round(deck:poker_functions.Deck, keep_function = None) -> tuple:
+    '''
+    Play one bot_test round, the same round simulation.play_round plays, and
+        keep what the estimators need from it
+
+    Parameters:
+        deck: Deck to play the round with
+
+        keep_function: bot strategy used by hand two, bot_functions.calculate_keep when not given
+
+    Returns:
+        cell: (score of hand one, score of hand two as dealt, round value)
+    '''
+    static_hand, bot_hand = poker_game.start_new_game(deck)
+    final_hand            = poker_game.modify_bot_hand(bot_hand, deck, keep_function)
+    winner                = poker_functions.showdown(static_hand, final_hand).winner
+
+    return poker_functions.score_hand(static_hand), poker_functions.score_hand(bot_hand), OUTCOME_VALUES[winner]
+
+def play_antithetic_pair(deck:poker_functions.Deck, keep_function = None) -> tuple:
+    '''
+    Deal once and play the deal twice: as dealt, then with the two hands
+        swapped. Both plays draw the same undealt cards
+
+    Parameters:
+        deck: Deck to play the rounds with
+
+        keep_function: bot strategy used by hand two, bot_functions.calculate_keep when not given
+
+    Returns:
+        cell: (score of the first hand dealt, score of the second hand dealt,
+            value as dealt, value swapped)
+    '''
+    hands    = poker_game.start_new_game(deck)
+    position = deck.mark()
+
+    values = []
+    for static_hand, bot_hand in [(hands[0], hands[1]), (hands[1], hands[0])]:
+        deck.rewind(position)
+        final_hand = poker_game.modify_bot_hand(bot_hand, deck, keep_function)
+        values.append(OUTCOME_VALUES[poker_functions.showdown(static_hand, final_hand).winner])
+
+    return poker_functions.score_hand(hands[0]), poker_functions.score_hand(hands[1]), values[0], values[1]
+
+def run_sample_chunk(seed:int, chunk_index:int, deals:int, keep_function = None, antithetic:bool = False) -> dict:
+    '''
+    Play the deals of one chunk on a deck of its own
+
+    Parameters:
+        seed: seed of the whole simulation
+
+        chunk_index: number of the chunk within the simulation
+
+        deals: number of deals, each deal is played twice when antithetic
+
+        keep_function: bot strategy used by hand two, bot_functions.calculate_keep when not given
+
+        antithetic: play every deal as a swapped pair
+
+    Returns:
+        cells: dictionary of cell -> number of deals, see play_sample_round and
+            play_antithetic_pair. A few hundred cells hold everything the
+            estimators need, so chunks are cheap to send back
+    '''
+    deck      = poker_functions.Deck(simulation.chunk_seed(seed, chunk_index))
+    play_deal = play_antithetic_pair if antithetic else play_sample_round
+    cells     = collections.Counter()
+
+    for deal_count in range(deals):
+        cells[play_deal(deck, keep_function)] += 1
+
+    return dict(cells)
+
+def merge_cells(cell_dicts:list) -> dict:
+    '''
+    Add the cells of several chunks together
+
+    Examples/Doctests:
+    >>> merge_cells([{(0, 1, 1): 2, (1, 0, -1): 1}, {(0, 1, 1): 3}])
+    {(0, 1, 1): 5, (1, 0, -1): 1}
+    '''
+    cells = collections.Counter()
+    for chunk_cells in cell_dicts:
+        cells.update(chunk_cells)
+
+    return dict(cells)
+
+################################## Estimators ##################################
+#Every estimator takes the merged cells and returns (estimate, variance of the
+#  estimate). Variances of single rounds use the n - 1 denominator
+
+def weighted_moments(values:np.ndarray, weights:np.ndarray) -> tuple:
+    '''
+    Mean and sample variance of values repeated weights times
+
+    Examples/Doctests:
+    >>> weighted_moments(np.array([1.0, -1.0]), np.array([3, 1]))
+    (0.5, 1.0)
+    '''
+    count    = float(weights.sum())
+    mean     = float((values * weights).sum() / count)
+    variance = float((weights * (values - mean) ** 2).sum() / (count - 1)) if count > 1 else 0.0
+
+    return mean, variance
+
+def cell_arrays(cells:dict) -> tuple:
+    '''
+    Split cells into an (N, k) array of cell fields and an (N,) array of counts
+    '''
+    return np.array(list(cells), dtype=np.float64), np.array(list(cells.values()), dtype=np.float64)
+
+def plain_estimate(cells:dict) -> tuple:
+    '''
+    Mean round value over every round
+
+    Examples/Doctests:
+    >>> plain_estimate({(0, 0, 1): 3, (0, 0, -1): 1})
+    (0.5, 0.25)
+    '''
+    fields, counts = cell_arrays(cells)
+    mean, variance = weighted_moments(fields[:, 2], counts)
+
+    return mean, variance / float(counts.sum())
+
+def stratum_rows(fields:np.ndarray) -> list:
+    '''
+    Group the cells by the STRATA category group of hand one
+
+    Parameters:
+        fields: (N, k) array of cell fields, see cell_arrays
+
+    Returns:
+        strata: list of (exact share of the group, (N,) mask of its cells)
+    '''
+    probabilities = get_category_probabilities()
+
+    return [(sum(probabilities[category] for category in categories), np.isin(fields[:, 0], categories))
+            for categories in STRATA]
+
+def strata_filled(cells:dict) -> bool:
+    '''
+    Check every group of STRATA holds at least STRATUM_MIN_ROUNDS rounds
+
+    Examples/Doctests:
+    >>> strata_filled({(0, 0, 1): 2, (1, 0, 1): 2, (2, 0, 1): 2, (3, 0, 1): 2, (4, 0, 1): 1, (8, 0, -1): 1})
+    True
+    >>> strata_filled({(0, 0, 1): 2, (1, 0, 1): 2, (2, 0, 1): 2, (3, 0, 1): 2, (8, 0, -1): 1})
+    False
+    '''
+    fields, counts = cell_arrays(cells)
+
+    return all(counts[rows].sum() >= STRATUM_MIN_ROUNDS for share, rows in stratum_rows(fields))
+
+def stratified_estimate(cells:dict) -> tuple:
+    '''
+    Mean round value of each group of categories of hand one, weighted by the
+        exact share of that group. Leaving out a group never dealt would bias
+        the estimate, so the plain estimate is returned until every group holds
+        STRATUM_MIN_ROUNDS rounds, see strata_filled
+
+    Examples/Doctests:
+    >>> #Hand one loses exactly when it is dealt the highest card category
+    >>> cells = {(category, 0, -1 if category == 0 else 1): 10 * (9 - category) for category in range(9)}
+    >>> estimate, variance = stratified_estimate(cells)
+    >>> round(estimate, 6) == round(1 - 2 * get_category_probabilities()[0], 6), variance
+    (True, 0.0)
+    >>> cells = {(0, 0, 1): 50, (0, 0, -1): 50, (1, 0, -1): 100}
+    >>> stratified_estimate(cells) == plain_estimate(cells)
+    True
+    '''
+    if not strata_filled(cells):
+        return plain_estimate(cells)
+
+    fields, counts = cell_arrays(cells)
+
+    estimate = 0.0
+    variance = 0.0
+    for weight, rows in stratum_rows(fields):
+        mean, spread   = weighted_moments(fields[rows, 2], counts[rows])
+        estimate      += weight * mean
+        variance      += weight ** 2 * spread / float(counts[rows].sum())
+
+    return estimate, variance
+
+def control_estimate(cells:dict) -> tuple:
+    '''
+    Mean round value corrected by how far the dealt categories of both hands
+        strayed from their exact shares. The correction is the regression of
+        the round value on the category indicators
+
+    Examples/Doctests:
+    >>> #Hand two wins exactly when it is dealt a pair, so the correction removes all the noise
+    >>> cells = {(0, 1, 1): 40, (0, 0, -1): 60}
+    >>> estimate, variance = control_estimate(cells)
+    >>> probabilities = get_category_probabilities()
+    >>> round(estimate, 6) == round(2 * probabilities[1] - 1, 6), round(variance, 12)
+    (True, 0.0)
+    '''
+    fields, counts = cell_arrays(cells)
+    probabilities  = np.array(get_category_probabilities())
+
+    #One indicator per category of each hand, dropping the highest card category they add up to
+    controls = np.hstack([fields[:, [0]] == np.arange(1, 9), fields[:, [1]] == np.arange(1, 9)]).astype(np.float64)
+    expected = np.concatenate([probabilities[1:], probabilities[1:]])
+
+    rounds   = float(counts.sum())
+    values   = fields[:, 2]
+    means    = counts @ controls / rounds
+    centered = controls - means
+    mean     = float(counts @ values / rounds)
+
+    covariance = (centered * counts[:, None]).T @ centered
+    cross      = (centered * counts[:, None]).T @ (values - mean)
+    slopes     = np.linalg.lstsq(covariance, cross, rcond=None)[0]
+
+    residual_mean, residual_variance = weighted_moments(values - centered @ slopes, counts)
+
+    return mean - float(slopes @ (means - expected)), residual_variance / rounds
+
+def antithetic_estimate(cells:dict) -> tuple:
+    '''
+    Mean value of the swapped pairs, each pair counted as one draw
+
+    Examples/Doctests:
+    >>> antithetic_estimate({(0, 1, 1, -1): 3, (1, 1, 1, 1): 1})
+    (0.25, 0.0625)
+    '''
+    fields, counts = cell_arrays(cells)
+    mean, variance = weighted_moments((fields[:, 2] + fields[:, 3]) / 2, counts)
+
+    return mean, variance / float(counts.sum())
+
+estimators = {
+    'plain':      plain_estimate,
+    'stratified': stratified_estimate,
+    'control':    control_estimate,
+    'antithetic': antithetic_estimate,
+}
+
+def round_values(cells:dict, antithetic:bool) -> tuple:
+    '''
+    Every round value played with its count, the two plays of a pair counted
+        as two rounds
+
+    Returns:
+        values: (N,) array of round values
+
+        counts: (N,) array of the number of rounds with that value
+    '''
+    fields, counts = cell_arrays(cells)
+    if not antithetic:
+        return fields[:, 2], counts
+
+    return np.concatenate([fields[:, 2], fields[:, 3]]), np.concatenate([counts, counts])
+
+class SampledEstimate(NamedTuple):
+    '''
+    Result of a variance reduced simulation
+
+    mode:             sampling mode, see SAMPLING_MODES
+    tally:            dictionary of outcome_indicator -> number of rounds played
+    difference:       estimated TWO win rate minus ONE win rate
+    half_width:       half the width of the confidence interval of difference
+    effective_rounds: plain rounds that would give the same interval
+    '''
+    mode:             str
+    tally:            dict
+    difference:       float
+    half_width:       float
+    effective_rounds: float
+
+def summarize_cells(cells:dict, mode:str, z:float = simulation.CONFIDENCE_Z) -> SampledEstimate:
+    '''
+    Run the estimator of mode over the cells
+
+    Parameters:
+        cells: merged cells of a simulation played for mode
+
+        mode: sampling mode, see SAMPLING_MODES
+
+        z: z value of the confidence interval
+
+    Returns:
+        estimate: SampledEstimate, the mode reads 'stratified (plain fallback)'
+            when too few rounds fell in some group to stratify
+
+    Examples/Doctests:
+    >>> summarize_cells({(0, 0, 1): 50, (0, 0, -1): 50, (1, 0, -1): 100}, 'stratified').mode
+    'stratified (plain fallback)'
+    '''
+    antithetic     = mode == 'antithetic'
+    values, counts = round_values(cells, antithetic)
+
+    tally = simulation.new_tally()
+    for value, count in zip(values, counts):
+        tally[VALUE_OUTCOMES[int(value)]] += int(count)
+
+    difference, variance = estimators[mode](cells)
+    round_variance       = weighted_moments(values, counts)[1]
+    effective_rounds     = round_variance / variance if variance > 0 else math.inf
+
+    if mode == 'stratified' and not strata_filled(cells):
+        mode = 'stratified (plain fallback)'
+
+    return SampledEstimate(mode, tally, difference, z * math.sqrt(variance), effective_rounds)
+
+def run_sampled_simulation(rounds:int, seed:int, mode:str = 'plain', workers:int = None,
+                           chunk_rounds:int = simulation.CHUNK_ROUNDS, keep_function = None) -> SampledEstimate:
+    '''
+    Play bot_test rounds across a pool of worker processes and estimate the
+        win rate gap with a variance reduction mode
+
+    Parameters:
+        rounds: total number of rounds, antithetic mode plays rounds // 2 deals twice
+
+        seed: seed of the whole simulation, the same seed always gives the same estimate
+
+        mode: sampling mode, see SAMPLING_MODES
+
+        workers: number of worker processes, os.cpu_count() when not given,
+            1 plays every chunk in this process
+
+        chunk_rounds: most deals in one chunk
+
+        keep_function: bot strategy used by hand two, bot_functions.calculate_keep
+            when not given. A module level function so worker processes can find it
+
+    Returns:
+        estimate: SampledEstimate
+
+    Examples/Doctests:
+    >>> plain = run_sampled_simulation(2000, seed=3, workers=1, chunk_rounds=500)
+    >>> plain.tally == simulation.run_simulation(2000, 3, 1, chunk_rounds=500), plain.effective_rounds == 2000
+    (True, True)
+    >>> control = run_sampled_simulation(2000, seed=3, mode='control', workers=1, chunk_rounds=500)
+    >>> control.half_width < plain.half_width, control.effective_rounds > 2000
+    (True, True)
+    >>> paired = run_sampled_simulation(2000, seed=3, mode='antithetic', workers=1, chunk_rounds=500)
+    >>> sum(paired.tally.values()), paired.effective_rounds > 2000
+    (2000, True)
+    '''
+    if mode not in SAMPLING_MODES:
+        raise ValueError('unknown sampling mode {}, pick from {}'.format(mode, ', '.join(SAMPLING_MODES)))
+
+    antithetic    = mode == 'antithetic'
+    chunk_sizes   = simulation.split_rounds(rounds // 2 if antithetic else rounds, chunk_rounds)
+    chunk_indexes = range(len(chunk_sizes))
+    seeds         = [seed] * len(chunk_sizes)
+    strategies    = [keep_function] * len(chunk_sizes)
+    pairings      = [antithetic] * len(chunk_sizes)
+
+    if workers == 1:
+        cells = merge_cells(map(run_sample_chunk, seeds, chunk_indexes, chunk_sizes, strategies, pairings))
+    else:
+        with simulation.worker_pool(workers) as executor:
+            cells = merge_cells(executor.map(run_sample_chunk, seeds, chunk_indexes, chunk_sizes, strategies, pairings))
+
+    return summarize_cells(cells, mode)